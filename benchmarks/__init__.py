@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+# This file is part of MediaFile.
+# Copyright 2016, Adrian Sampson.
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+"""Performance benchmarks for MediaFile.
+
+Each module can be run from the repository root, e.g.::
+
+    python -m benchmarks.fields
+
+To run several benchmarks (by default, all of them), save the results as
+JSON and compare them with those of an earlier run::
+
+    python -m benchmarks -o new.json --compare old.json fields formats
+"""
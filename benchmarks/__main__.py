@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+# This file is part of MediaFile.
+# Copyright 2016, Adrian Sampson.
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+"""Run several benchmarks (by default, all of them) and collect their
+results in one JSON document, together with the versions they were
+measured with, so that runs on different commits can be compared.
+"""
+import argparse
+import datetime
+import importlib
+import json
+import os
+import pkgutil
+import platform
+import subprocess
+import sys
+
+import mutagen
+
+import benchmarks
+from benchmarks import _common
+
+
+def names():
+    """Get the names of the benchmark modules, sorted.
+    """
+    return sorted(name for _, name, _ in
+                  pkgutil.iter_modules(benchmarks.__path__)
+                  if not name.startswith('_'))
+
+
+def commit():
+    """Get the hash of the checked out commit of the repository, or
+    None if it is not available.
+    """
+    try:
+        out = subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL,
+            cwd=os.path.dirname(os.path.dirname(__file__)))
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.decode('ascii').strip()
+
+
+def environment():
+    return {
+        'commit': commit(),
+        'date': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'mutagen': mutagen.version_string,
+        'platform': platform.platform(),
+    }
+
+
+def columns(rows):
+    """Get the keys of `rows` in the order they first appear.
+    """
+    keys = []
+    for row in rows:
+        keys.extend(k for k in row if k not in keys)
+    return keys
+
+
+def compare(old, new, out=None):
+    """Print the change of every number present in the results `old` and
+    `new`, matching up the rows of each benchmark by position.
+    """
+    out = out or sys.stdout
+    rows = []
+    for name, new_rows in new['benchmarks'].items():
+        old_rows = old['benchmarks'].get(name, [])
+        for old_row, new_row in zip(old_rows, new_rows):
+            label = str(list(new_row.values())[0])
+            for key, value in new_row.items():
+                before = old_row.get(key)
+                if isinstance(value, bool) or \
+                        not isinstance(value, (int, float)) or \
+                        not isinstance(before, (int, float)) or not before:
+                    continue
+                rows.append({
+                    'benchmark': name, 'row': label, 'column': key,
+                    'old': before, 'new': value,
+                    'change': u'{0:+.1f}%'.format(
+                        (value - before) * 100.0 / before),
+                })
+    out.write(u'comparing {0} with {1}\n\n'.format(
+        old['environment'].get('commit'), new['environment'].get('commit')))
+    _common.report(rows, ['benchmark', 'row', 'column', 'old', 'new',
+                          'change'], out=out)
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument('benchmarks', nargs='*', metavar='name',
+                   help='benchmarks to run (default: all of {0})'.format(
+                       ', '.join(names())))
+    p.add_argument('-o', '--output', metavar='FILE',
+                   help='write the results to FILE as JSON')
+    p.add_argument('--compare', metavar='FILE',
+                   help='compare the results with an earlier JSON output')
+    p.add_argument('--json', action='store_true',
+                   help='print the results as JSON')
+    args = p.parse_args(argv)
+
+    selected = args.benchmarks or names()
+    unknown = set(selected) - set(names())
+    if unknown:
+        p.error(u'unknown benchmark: {0}'.format(', '.join(sorted(unknown))))
+
+    results = {'environment': environment(), 'benchmarks': {}}
+    for name in selected:
+        rows = importlib.import_module('benchmarks.' + name).run()
+        results['benchmarks'][name] = rows
+        if not args.json:
+            sys.stdout.write(u'{0}\n\n'.format(name))
+            _common.report(rows, columns(rows))
+            sys.stdout.write(u'\n')
+            sys.stdout.flush()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), results)
+
+
+if __name__ == '__main__':
+    main()
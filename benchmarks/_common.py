@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+# This file is part of MediaFile.
+# Copyright 2016, Adrian Sampson.
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+"""Some common functionality for the MediaFile benchmarks."""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+
+# Test resources path.
+RSRC = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                    'test', 'rsrc')
+
+# File extensions of the formats covered by the `full.*`, `empty.*`
+# and `unparseable.*` fixtures.
+EXTENSIONS = ['mp3', 'm4a', 'alac.m4a', 'mpc', 'wma', 'ogg', 'flac',
+              'ape', 'wv', 'opus', 'aiff', 'wav', 'dsf']
+
+
+def fixture(name, extension):
+    """Get the path of a test resource, e.g., ``fixture('full', 'mp3')``.
+    """
+    return os.path.join(RSRC, '{0}.{1}'.format(name, extension))
+
+
+def measure(func, repeat=5, number=None):
+    """Time the callable `func` and return the best observed duration of
+    a single call, in seconds.
+
+    If `number` is not given, the number of calls per round is chosen
+    automatically so that each round takes at least 0.2 seconds.
+    """
+    timer = timeit.Timer(func)
+    if number is None:
+        number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def parser(description):
+    """Create an argument parser with the options shared by all
+    benchmarks.
+    """
+    p = argparse.ArgumentParser(description=description)
+    p.add_argument('--json', action='store_true',
+                   help='print the results as JSON')
+    return p
+
+
+def report(rows, columns, as_json=False, out=None):
+    """Print the results of a benchmark.
+
+    `rows` is a list of dictionaries and `columns` the keys to show, in
+    order. Float values are taken to be durations in seconds and are
+    shown in microseconds. With `as_json`, the rows are written as a
+    JSON array instead of a table.
+    """
+    out = out or sys.stdout
+    if as_json:
+        json.dump(rows, out, indent=2, sort_keys=True)
+        out.write('\n')
+        return
+
+    def fmt(value):
+        if isinstance(value, float):
+            return u'{0:.2f}'.format(value * 1e6)
+        return str(value)
+
+    cells = [[fmt(row.get(c, u'')) for c in columns] for row in rows]
+    widths = [max([len(c)] + [len(r[i]) for r in cells])
+              for i, c in enumerate(columns)]
+    for r in [list(columns)] + cells:
+        line = u'  '.join(v.ljust(w) for v, w in zip(r, widths))
+        out.write(line.rstrip() + u'\n')
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+# This file is part of MediaFile.
+# Copyright 2016, Adrian Sampson.
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+"""Generating large synthetic libraries from the `empty` and `full`
+fixtures, for benchmarks of how reading scales.
+
+The files are deterministic: the same arguments always give the same
+directory tree with the same contents. Nothing is downloaded.
+"""
+import collections
+import os
+import shutil
+
+import mutagen.apev2
+import mutagen.asf
+import mutagen.id3
+import mutagen.mp4
+
+from benchmarks import _common
+
+import mediafile
+
+
+# How heavily the generated files are tagged: the fixture family they
+# are cloned from, the number of extra custom tags (TXXX frames in ID3),
+# the length of the lyrics in characters, the number and size in bytes
+# of the embedded images, and the number of artists.
+Density = collections.namedtuple('Density', [
+    'base', 'custom', 'lyrics', 'images', 'image_size', 'artists',
+])
+
+DENSITIES = {
+    'sparse': Density('empty', 0, 0, 0, 0, 1),
+    'typical': Density('full', 10, 2000, 1, 64 * 1024, 2),
+    'dense': Density('full', 200, 50000, 4, 128 * 1024, 50),
+}
+
+# Tracks per generated album directory.
+ALBUM_TRACKS = 10
+
+
+def _lyrics(length):
+    line = u'Line {0} of the lyrics, la la la.\n'
+    text = []
+    size = 0
+    while size < length:
+        text.append(line.format(len(text) + 1))
+        size += len(text[-1])
+    return u''.join(text)[:length]
+
+
+def _images(count, size):
+    with open(os.path.join(_common.RSRC, 'image-2x3.jpg'), 'rb') as f:
+        data = f.read()
+    # Distinct types, since APEv2 tags hold one image per type.
+    types = list(mediafile.ImageType)
+    return [
+        mediafile.Image(data + bytes([i % 256]) * max(size - len(data), 0),
+                        desc=u'image {0}'.format(i),
+                        type=types[i % len(types)])
+        for i in range(count)
+    ]
+
+
+def _add_custom_tags(tags, count):
+    """Add `count` custom tags, unknown to MediaFile, to the Mutagen
+    `tags` in the way the format stores them.
+    """
+    for i in range(count):
+        key = u'Custom Tag {0}'.format(i)
+        value = u'custom value {0}'.format(i)
+        if isinstance(tags, mutagen.id3.ID3):
+            tags.add(mutagen.id3.TXXX(encoding=3, desc=key, text=[value]))
+        elif isinstance(tags, mutagen.mp4.MP4Tags):
+            tags['----:com.apple.iTunes:' + key] = [value.encode('utf-8')]
+        elif isinstance(tags, (mutagen.apev2.APEv2, mutagen.asf.ASFTags)):
+            tags[key] = [value]
+        else:
+            tags[key.replace(u' ', u'_').upper()] = [value]
+
+
+def make_template(directory, ext, density):
+    """Create the file of the format `ext` that all generated files of
+    that format are copied from, in `directory`, and return its path.
+    """
+    path = os.path.join(directory, 'template.' + ext)
+    shutil.copy(_common.fixture(density.base, ext), path)
+    mf = mediafile.MediaFile(path)
+    _add_custom_tags(mf.mgfile.tags, density.custom)
+    artists = [u'Artist {0}'.format(i) for i in range(density.artists)]
+    mf.update({
+        'artist': u', '.join(artists),
+        'artists': artists,
+        'lyrics': _lyrics(density.lyrics) or None,
+        'images': _images(density.images, density.image_size) or None,
+    })
+    mf.save(force=True)
+    return path
+
+
+def generate(directory, count, density=DENSITIES['typical'],
+             extensions=None):
+    """Create `count` files tagged with the given `Density` in
+    `directory`, in one directory per album, and return their paths.
+
+    The formats in `extensions` (by default, all those of the fixtures)
+    take turns. Every file has its own title, album and track number.
+    """
+    extensions = extensions or [
+        ext for ext in _common.EXTENSIONS
+        if os.path.exists(_common.fixture(density.base, ext))
+    ]
+    templates = os.path.join(directory, 'templates')
+    os.makedirs(templates)
+    try:
+        sources = [make_template(templates, ext, density)
+                   for ext in extensions]
+        paths = []
+        for i in range(count):
+            album, track = divmod(i, ALBUM_TRACKS)
+            ext = extensions[i % len(extensions)]
+            album_dir = os.path.join(directory, 'album {0:05d}'.format(album))
+            if track == 0:
+                os.makedirs(album_dir)
+            path = os.path.join(album_dir,
+                                '{0:02d}.{1}'.format(track + 1, ext))
+            shutil.copy(sources[i % len(sources)], path)
+            mf = mediafile.MediaFile(path)
+            mf.update({
+                'title': u'Track {0}'.format(i),
+                'album': u'Album {0}'.format(album),
+                'track': track + 1,
+                'tracktotal': ALBUM_TRACKS,
+            })
+            mf.save()
+            paths.append(path)
+    finally:
+        shutil.rmtree(templates)
+    return paths
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# This file is part of MediaFile.
+# Copyright 2016, Adrian Sampson.
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+"""Opening files from a path, a memory map and an in-memory buffer, and
+editing the tags of a file held in memory either by spilling it to a
+temporary file or by saving into the buffer.
+"""
+import os
+import shutil
+import tempfile
+
+from benchmarks import _common
+
+import mediafile
+
+
+def _spill_and_edit(data, directory, ext):
+    """Edit the tags of `data` through a temporary file and return the
+    new contents.
+    """
+    fd, path = tempfile.mkstemp('.' + ext, dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        mf = mediafile.MediaFile(path)
+        mf.title = u'edited'
+        mf.save()
+        with open(path, 'rb') as f:
+            return f.read()
+    finally:
+        os.remove(path)
+
+
+def _buffer_edit(data):
+    mf = mediafile.MediaFile.from_buffer(data)
+    mf.title = u'edited'
+    mf.save()
+    return mf.buffer
+
+
+def run():
+    tmpdir = tempfile.mkdtemp()
+    rows = []
+    try:
+        for ext in _common.EXTENSIONS:
+            path = _common.fixture('full', ext)
+            with open(path, 'rb') as f:
+                data = f.read()
+            rows.append({
+                'format': ext,
+                'path': _common.measure(
+                    lambda: mediafile.MediaFile(path).title),
+                'mmap': _common.measure(
+                    lambda: mediafile.MediaFile.from_mmap(path).title),
+                'buffer': _common.measure(
+                    lambda: mediafile.MediaFile.from_buffer(data).title),
+                'temp file edit': _common.measure(
+                    lambda: _spill_and_edit(data, tmpdir, ext)),
+                'buffer edit': _common.measure(lambda: _buffer_edit(data)),
+            })
+    finally:
+        shutil.rmtree(tmpdir)
+    return rows
+
+
+def main(argv=None):
+    args = _common.parser(__doc__).parse_args(argv)
+    _common.report(run(), ['format', 'path', 'mmap', 'buffer',
+                           'temp file edit', 'buffer edit'], args.json)
+
+
+if __name__ == '__main__':
+    main()
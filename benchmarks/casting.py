@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+# This file is part of MediaFile.
+# Copyright 2016, Adrian Sampson.
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+"""Converting realistic tag strings to field values, with the regular
+expressions given as strings on every call (`before`) versus the
+precompiled patterns and the plain-number fast path (`after`). Times
+are per value.
+"""
+import re
+
+from benchmarks import _common
+
+import mediafile
+
+
+INTS = [u'5', u'05', u'12', u' 7 ', u'3/12', u'120 bpm', u'2001', b'9']
+FLOATS = [u'-6.50 dB', u'0.988831', u'+1.25 dB', u'-0.000046',
+          u'89.0 dB', u'1.000000', b'-7.21 dB']
+ARTISTS = [u'Artist {0}'.format(i) for i in range(50)]
+DATES = [u'2001-04-03', u'2001', u'2001-04-03T12:00:00', u'1999/05/06',
+         u'2010-11']
+
+
+def _regex_cast(out_type, val):
+    """The conversion of tag values before the fast paths.
+    """
+    if val is None:
+        return None
+
+    if out_type == int:
+        if isinstance(val, int) or isinstance(val, float):
+            # Just a number.
+            return int(val)
+        else:
+            # Process any other type as a string.
+            if isinstance(val, bytes):
+                val = val.decode('utf-8', 'ignore')
+            elif not isinstance(val, str):
+                val = str(val)
+            # Get a number from the front of the string.
+            match = re.match(r'[\+-]?[0-9]+', val.strip())
+            return int(match.group(0)) if match else 0
+
+    elif out_type == bool:
+        try:
+            # Should work for strings, bools, ints:
+            return bool(int(val))
+        except ValueError:
+            return False
+
+    elif out_type == str:
+        if isinstance(val, bytes):
+            return val.decode('utf-8', 'ignore')
+        elif isinstance(val, str):
+            return val
+        else:
+            return str(val)
+
+    elif out_type == float:
+        if isinstance(val, int) or isinstance(val, float):
+            return float(val)
+        else:
+            if isinstance(val, bytes):
+                val = val.decode('utf-8', 'ignore')
+            else:
+                val = str(val)
+            match = re.match(r'[\+-]?([0-9]+\.?[0-9]*|[0-9]*\.[0-9]+)',
+                             val.strip())
+            if match:
+                val = match.group(0)
+                if val:
+                    return float(val)
+            return 0.0
+
+    else:
+        return val
+
+
+def _regex_date(datestring):
+    datestring = re.sub(r'[Tt ].*$', '', str(datestring))
+    return re.split('[-/]', str(datestring))
+
+
+def _date(datestring):
+    return mediafile._DATE_SEPARATOR.split(
+        mediafile._DATE_TIME.sub('', datestring))
+
+
+def _regex_sort_name(name):
+    if isinstance(mediafile.MediaFile.__dict__[name],
+                  mediafile.DateItemField):
+        name = re.sub('year', 'date0', name)
+        name = re.sub('month', 'date1', name)
+        name = re.sub('day', 'date2', name)
+    return name
+
+
+def run():
+    fields = list(mediafile.MediaFile.fields())
+    cases = [
+        ('int', INTS,
+         lambda: [_regex_cast(int, v) for v in INTS],
+         lambda: [mediafile._safe_cast(int, v) for v in INTS]),
+        ('float', FLOATS,
+         lambda: [_regex_cast(float, v) for v in FLOATS],
+         lambda: [mediafile._safe_cast(float, v) for v in FLOATS]),
+        ('str list', ARTISTS,
+         lambda: [_regex_cast(str, v) for v in ARTISTS],
+         lambda: mediafile.cast_many(str, ARTISTS)),
+        ('date', DATES,
+         lambda: [_regex_date(v) for v in DATES],
+         lambda: [_date(v) for v in DATES]),
+        ('sort fields', fields,
+         lambda: sorted(fields, key=_regex_sort_name),
+         lambda: sorted(fields, key=mediafile.MediaFile._field_sort_name)),
+    ]
+    rows = []
+    for name, values, before, after in cases:
+        assert before() == after(), name
+        row = {
+            'operation': name,
+            'values': len(values),
+            'before': _common.measure(before) / len(values),
+            'after': _common.measure(after) / len(values),
+        }
+        row['speedup'] = u'{0:.2f}x'.format(row['before'] / row['after'])
+        rows.append(row)
+    return rows
+
+
+def main(argv=None):
+    args = _common.parser(__doc__).parse_args(argv)
+    _common.report(run(), ['operation', 'values', 'before', 'after',
+                           'speedup'], args.json)
+
+
+if __name__ == '__main__':
+    main()
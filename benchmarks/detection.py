@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+# This file is part of MediaFile.
+# Copyright 2016, Adrian Sampson.
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+"""Opening a file of each format with its type detected from the
+signature of its header, versus leaving it to `mutagen.File`, which
+scores every Mutagen type (and reads the stream information right away).
+The cold columns time the first file opened in a fresh interpreter,
+which includes importing the Mutagen modules.
+"""
+import subprocess
+import sys
+
+from benchmarks import _common
+
+import mediafile
+
+
+# Number of fresh interpreters started per format and detection; the
+# best time is reported.
+COLD_REPEAT = 3
+
+COLD_CODE = '''
+import sys, time, mediafile
+if sys.argv[2] == 'scoring':
+    mediafile._sniff_kind = lambda name, header: None
+start = time.perf_counter()
+mediafile.MediaFile(sys.argv[1])
+print(time.perf_counter() - start)
+'''
+
+
+def _no_signatures(name, header):
+    return None
+
+
+def cold(path, detection):
+    """Time opening `path` as the first file in a fresh interpreter.
+    """
+    return min(
+        float(subprocess.check_output(
+            [sys.executable, '-c', COLD_CODE, path, detection]
+        ))
+        for _ in range(COLD_REPEAT)
+    )
+
+
+def run():
+    sniff = mediafile._sniff_kind
+    rows = []
+    for ext in _common.EXTENSIONS:
+        path = _common.fixture('full', ext)
+        row = {'format': ext}
+        for label, func in (('scoring', _no_signatures),
+                            ('signature', sniff)):
+            mediafile._sniff_kind = func
+            try:
+                row[label] = _common.measure(
+                    lambda: mediafile.MediaFile(path)
+                )
+            finally:
+                mediafile._sniff_kind = sniff
+            row['cold ' + label] = cold(path, label)
+        row['speedup'] = u'{0:.2f}x'.format(row['scoring'] / row['signature'])
+        rows.append(row)
+    return rows
+
+
+def main(argv=None):
+    args = _common.parser(__doc__).parse_args(argv)
+    _common.report(run(), ['format', 'scoring', 'signature', 'speedup',
+                           'cold scoring', 'cold signature'], args.json)
+
+
+if __name__ == '__main__':
+    main()
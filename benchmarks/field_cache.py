@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+# This file is part of MediaFile.
+# Copyright 2016, Adrian Sampson.
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+"""Repeatedly reading the date fields and the cover art of a file, with
+and without the field cache.
+"""
+from benchmarks import _common
+
+import mediafile
+
+
+FIELDS = ['date', 'year', 'month', 'day', 'art', 'images']
+
+# Formats with an `image.*` fixture, which is used instead of `full.*`.
+IMAGE_EXTENSIONS = ['mp3', 'm4a', 'wma', 'ogg', 'flac', 'ape']
+
+
+def read_fields(mf):
+    for field in FIELDS:
+        getattr(mf, field)
+
+
+def run():
+    rows = []
+    for ext in _common.EXTENSIONS:
+        row = {'format': ext}
+        for label, cache in (('uncached', False), ('cached', True)):
+            name = 'image' if ext in IMAGE_EXTENSIONS else 'full'
+            mf = mediafile.MediaFile(_common.fixture(name, ext), cache=cache)
+            row[label] = _common.measure(lambda: read_fields(mf)) \
+                / len(FIELDS)
+        info = mf.cache_info()
+        row['hit rate'] = u'{0:.0%}'.format(
+            info.hits / float(info.hits + info.misses))
+        row['speedup'] = u'{0:.2f}x'.format(row['uncached'] / row['cached'])
+        rows.append(row)
+    return rows
+
+
+def main(argv=None):
+    args = _common.parser(__doc__).parse_args(argv)
+    _common.report(run(), ['format', 'uncached', 'cached', 'hit rate',
+                           'speedup'], args.json)
+
+
+if __name__ == '__main__':
+    main()
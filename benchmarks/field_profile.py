@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# This file is part of MediaFile.
+# Copyright 2016, Adrian Sampson.
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+"""Reading all fields of a file with `as_dict()` with the field profiling
+disabled and enabled (when disabled, the fields are not instrumented at
+all), followed by the fields that take the longest to read in total over
+all the fixtures, with their mean and 99th percentile times.
+"""
+from benchmarks import _common
+
+import mediafile
+
+
+# The number of most expensive fields shown.
+TOP = 10
+
+
+def run():
+    rows = []
+    for ext in _common.EXTENSIONS:
+        mf = mediafile.MediaFile(_common.fixture('full', ext))
+        row = {'read': ext, 'disabled': _common.measure(mf.as_dict)}
+        with mediafile.FieldProfile():
+            row['enabled'] = _common.measure(mf.as_dict)
+        row['overhead'] = u'{0:.2f}x'.format(row['enabled'] / row['disabled'])
+        rows.append(row)
+
+    profile = mediafile.FieldProfile()
+    with profile:
+        for ext in _common.EXTENSIONS:
+            mf = mediafile.MediaFile(_common.fixture('full', ext))
+            for _ in range(100):
+                mf.as_dict()
+    for timing in profile.timings()[:TOP]:
+        rows.append({
+            'read': u'{0} ({1})'.format(timing.field, timing.format),
+            'mean': timing.mean,
+            'p99': timing.p99,
+        })
+    return rows
+
+
+def main(argv=None):
+    args = _common.parser(__doc__).parse_args(argv)
+    _common.report(run(), ['read', 'disabled', 'enabled', 'overhead', 'mean',
+                           'p99'], args.json)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# This file is part of MediaFile.
+# Copyright 2016, Adrian Sampson.
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+"""Listing the fields of `MediaFile` by scanning the attributes of the
+class on every call (`scan`), as opposed to the registry computed once
+(`registry`), and updating a few fields of a file with `update()`,
+which goes over the fields in the order they are written.
+"""
+from benchmarks import _common
+
+import mediafile
+
+
+def _scan_fields(cls):
+    for name, descriptor in cls.__dict__.items():
+        if isinstance(descriptor, mediafile.MediaField):
+            yield name
+
+
+def _scan_sorted_fields(cls):
+    return sorted(_scan_fields(cls), key=cls._field_sort_name)
+
+
+def _scan_update(mf, values):
+    for field in _scan_sorted_fields(type(mf)):
+        if field not in values:
+            continue
+        descriptor = getattr(type(mf), field)
+        if not descriptor._holds(mf, values[field]):
+            setattr(mf, field, values[field])
+
+
+def run():
+    cls = mediafile.MediaFile
+    mf = cls(_common.fixture('full', 'mp3'))
+    values = {'title': u'the title', 'track': 2, 'year': 2001}
+    cases = [
+        ('fields', lambda: list(_scan_fields(cls)),
+         lambda: list(cls.fields())),
+        ('sorted_fields', lambda: _scan_sorted_fields(cls),
+         lambda: list(cls.sorted_fields())),
+        ('update', lambda: _scan_update(mf, values),
+         lambda: mf.update(values)),
+    ]
+    rows = []
+    for name, scan, registry in cases:
+        row = {
+            'operation': name,
+            'scan': _common.measure(scan),
+            'registry': _common.measure(registry),
+        }
+        row['speedup'] = u'{0:.2f}x'.format(row['scan'] / row['registry'])
+        rows.append(row)
+    return rows
+
+
+def main(argv=None):
+    args = _common.parser(__doc__).parse_args(argv)
+    _common.report(run(), ['operation', 'scan', 'registry', 'speedup'],
+                   args.json)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# This file is part of MediaFile.
+# Copyright 2016, Adrian Sampson.
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+"""Per-field read latency, comparing the cached style dispatch of
+`MediaField.styles` with a linear scan over all storage styles.
+"""
+from benchmarks import _common
+
+import mediafile
+
+
+def _scan_styles(self, mutagen_file):
+    """The uncached style lookup: check every style on every access.
+    """
+    for style in self._styles:
+        if mutagen_file.__class__.__name__ in style.formats:
+            yield style
+
+
+def read_fields(mf):
+    for field in mf.fields():
+        getattr(mf, field)
+
+
+def run():
+    fields = list(mediafile.MediaFile.fields())
+    cached = mediafile.MediaField.styles
+    rows = []
+    for ext in _common.EXTENSIONS:
+        mf = mediafile.MediaFile(_common.fixture('full', ext))
+        row = {'format': ext}
+        for label, styles in (('scan', _scan_styles), ('cached', cached)):
+            mediafile.MediaField.styles = styles
+            try:
+                row[label] = _common.measure(lambda: read_fields(mf)) \
+                    / len(fields)
+            finally:
+                mediafile.MediaField.styles = cached
+        row['speedup'] = u'{0:.2f}x'.format(row['scan'] / row['cached'])
+        rows.append(row)
+    return rows
+
+
+def main(argv=None):
+    args = _common.parser(__doc__).parse_args(argv)
+    _common.report(run(), ['format', 'scan', 'cached', 'speedup'],
+                   args.json)
+
+
+if __name__ == '__main__':
+    main()
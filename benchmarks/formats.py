@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+# This file is part of MediaFile.
+# Copyright 2016, Adrian Sampson.
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+"""Opening, reading, writing and saving every `full`, `image` and
+`empty` fixture, and saving embedded images of several sizes.
+
+Each row covers one fixture: `open` is the `MediaFile()` constructor,
+`as_dict` reads every field, `update` sets every field with `update()`
+(without saving), `save` writes the tags back to the file, and the
+`embed` columns replace the images with one of the given size and save.
+"""
+import datetime
+import os
+import shutil
+import tempfile
+
+from benchmarks import _common
+
+import mediafile
+
+
+# Fixture families measured for every format they exist in.
+FIXTURES = ['full', 'image', 'empty']
+
+# Sizes of the embedded images, in bytes, by column name.
+IMAGE_SIZES = [
+    ('embed 16K', 16 * 1024),
+    ('embed 256K', 256 * 1024),
+    ('embed 2M', 2 * 1024 * 1024),
+]
+
+
+def fixtures():
+    """Get the `(name, extension)` pairs of the fixtures that exist.
+    """
+    return [(name, ext) for name in FIXTURES for ext in _common.EXTENSIONS
+            if os.path.exists(_common.fixture(name, ext))]
+
+
+def field_values(variant):
+    """Get a value for every field except the images, as accepted by
+    `MediaFile.update()`. Different `variant` numbers give different
+    values for every field.
+    """
+    date = datetime.date(2000 + variant, 1 + variant, 1 + variant)
+    items = {'year': date.year, 'month': date.month, 'day': date.day}
+    values = {}
+    for name in mediafile.MediaFile.fields():
+        field = getattr(mediafile.MediaFile, name)
+        if isinstance(field, (mediafile.CoverArtField,
+                              mediafile.ImageListField)):
+            continue
+        elif isinstance(field, mediafile.DateField):
+            values[name] = date
+        elif isinstance(field, mediafile.DateItemField):
+            values[name] = items[name.rsplit('_', 1)[-1]]
+        elif isinstance(field, mediafile.ListMediaField):
+            values[name] = [u'{0} {1}'.format(name, i + variant)
+                            for i in range(2)]
+        elif field.out_type is bool:
+            values[name] = bool(variant % 2)
+        elif field.out_type is int:
+            values[name] = 1 + variant
+        elif field.out_type is float:
+            values[name] = 0.5 + variant
+        else:
+            values[name] = u'{0} {1}'.format(name, variant)
+    return values
+
+
+def make_images(size):
+    """Get two distinct JPEG images of `size` bytes each.
+    """
+    with open(os.path.join(_common.RSRC, 'image-2x3.jpg'), 'rb') as f:
+        data = f.read()
+    return [
+        mediafile.Image(data + bytes([i]) * (size - len(data)),
+                        type=mediafile.ImageType.front)
+        for i in range(2)
+    ]
+
+
+def alternate(func, *choices):
+    """Get a function that calls `func` with each of `choices` in turn,
+    so that consecutive calls always change the file.
+    """
+    state = {'index': 0}
+
+    def call():
+        state['index'] ^= 1
+        return func(choices[state['index']])
+    return call
+
+
+def measure_fixture(path):
+    mf = mediafile.MediaFile(path)
+    row = {
+        'open': _common.measure(lambda: mediafile.MediaFile(path)),
+        'as_dict': _common.measure(mf.as_dict),
+        'update': _common.measure(
+            alternate(mf.update, field_values(0), field_values(1))),
+        'save': _common.measure(lambda: mf.save(force=True)),
+    }
+
+    def embed(image):
+        mf.images = [image]
+        mf.save()
+
+    for label, size in IMAGE_SIZES:
+        row[label] = _common.measure(
+            alternate(embed, *make_images(size)), repeat=3)
+    return row
+
+
+def run():
+    tmpdir = tempfile.mkdtemp()
+    rows = []
+    try:
+        for name, ext in fixtures():
+            path = os.path.join(tmpdir, '{0}.{1}'.format(name, ext))
+            shutil.copy(_common.fixture(name, ext), path)
+            row = {'fixture': os.path.basename(path)}
+            row.update(measure_fixture(path))
+            rows.append(row)
+    finally:
+        shutil.rmtree(tmpdir)
+    return rows
+
+
+def main(argv=None):
+    args = _common.parser(__doc__).parse_args(argv)
+    columns = ['fixture', 'open', 'as_dict', 'update', 'save']
+    columns += [label for label, _ in IMAGE_SIZES]
+    _common.report(run(), columns, args.json)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# This file is part of MediaFile.
+# Copyright 2016, Adrian Sampson.
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+"""Reading and writing the TXXX-backed fields of an MP3 file carrying
+many TXXX frames, comparing the indexed frame lookup with a scan over
+all frames of the type.
+"""
+import os
+import shutil
+import tempfile
+
+import mutagen.id3
+
+from benchmarks import _common
+
+import mediafile
+
+
+# Number of unrelated TXXX frames in the synthetic file.
+FRAMES = 500
+
+
+def _scan_desc_frames(tags, key, desc):
+    """The unindexed frame lookup: check the description of every frame
+    of the type on every access.
+    """
+    desc = desc.lower()
+    return [frame for frame in tags.getall(key)
+            if frame.desc.lower() == desc]
+
+
+def _desc_fields():
+    """Get the names of the fields stored in TXXX frames in MP3 files.
+    """
+    names = []
+    for name in mediafile.MediaFile.fields():
+        field = mediafile.MediaFile.__dict__[name]
+        for style in getattr(field, '_styles', ()):
+            if isinstance(style, mediafile.MP3DescStorageStyle) and \
+                    style.key == 'TXXX':
+                names.append(name)
+                break
+    return names
+
+
+def make_file(directory, frames=FRAMES):
+    """Create an MP3 file with `frames` extra TXXX frames in `directory`
+    and return its path.
+    """
+    path = os.path.join(directory, 'txxx.mp3')
+    shutil.copy(_common.fixture('full', 'mp3'), path)
+    tags = mutagen.id3.ID3(path)
+    for i in range(frames):
+        tags.add(mutagen.id3.TXXX(desc=u'Custom Tag {0}'.format(i),
+                                  text=[u'value {0}'.format(i)]))
+    tags.save(path)
+    return path
+
+
+def run():
+    names = _desc_fields()
+    indexed = mediafile._desc_frames
+    tmpdir = tempfile.mkdtemp()
+    rows = []
+    try:
+        mf = mediafile.MediaFile(make_file(tmpdir))
+
+        def read():
+            for name in names:
+                getattr(mf, name)
+
+        # Write back the values present in the file.
+        values = dict((name, getattr(mf, name)) for name in names)
+        values = dict((k, v) for k, v in values.items() if v is not None)
+
+        def write():
+            for name, value in values.items():
+                setattr(mf, name, value)
+
+        for op, func in (('read', read), ('write', write)):
+            count = len(values) if func is write else len(names)
+            row = {'operation': op, 'fields': count}
+            for label, lookup in (('scan', _scan_desc_frames),
+                                  ('indexed', indexed)):
+                mediafile._desc_frames = lookup
+                try:
+                    row[label] = _common.measure(func) / count
+                finally:
+                    mediafile._desc_frames = indexed
+            row['speedup'] = u'{0:.2f}x'.format(row['scan'] / row['indexed'])
+            rows.append(row)
+    finally:
+        shutil.rmtree(tmpdir)
+    return rows
+
+
+def main(argv=None):
+    args = _common.parser(__doc__).parse_args(argv)
+    _common.report(run(), ['operation', 'fields', 'scan', 'indexed',
+                           'speedup'], args.json)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# This file is part of MediaFile.
+# Copyright 2016, Adrian Sampson.
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+"""Listing the types and descriptions of large embedded images, which
+leaves the image data in the tags, and describing them with
+`images_info()`, versus also reading the data of every image.
+"""
+import os
+import shutil
+import tempfile
+
+from benchmarks import _common
+
+import mediafile
+
+
+# Size of the synthetic cover images, in bytes.
+IMAGE_SIZE = 5 * 1024 * 1024
+
+# Formats whose image styles differ in how the data is stored.
+EXTENSIONS = ['mp3', 'm4a', 'wma', 'ogg', 'flac', 'ape']
+
+
+def make_file(directory, ext, size=IMAGE_SIZE):
+    """Create a copy of the `full` fixture with two large JPEG images in
+    `directory` and return its path.
+    """
+    path = os.path.join(directory, 'images.' + ext)
+    shutil.copy(_common.fixture('full', ext), path)
+    with open(os.path.join(_common.RSRC, 'image-2x3.jpg'), 'rb') as f:
+        data = f.read()
+    data += b'\x00' * (size - len(data))
+    mf = mediafile.MediaFile(path)
+    mf.images = [
+        mediafile.Image(data, desc=u'front', type=mediafile.ImageType.front),
+        mediafile.Image(data, desc=u'back', type=mediafile.ImageType.back),
+    ]
+    mf.save()
+    return path
+
+
+def list_images(mf):
+    return [(image.type, image.desc) for image in mf.images]
+
+
+def read_images(mf):
+    return [(image.type, image.desc, image.data) for image in mf.images]
+
+
+def run():
+    tmpdir = tempfile.mkdtemp()
+    rows = []
+    try:
+        for ext in EXTENSIONS:
+            mf = mediafile.MediaFile(make_file(tmpdir, ext))
+            row = {
+                'format': ext,
+                'list': _common.measure(lambda: list_images(mf)),
+                'info': _common.measure(mf.images_info),
+                'data': _common.measure(lambda: read_images(mf)),
+            }
+            row['speedup'] = u'{0:.2f}x'.format(row['data'] / row['list'])
+            rows.append(row)
+    finally:
+        shutil.rmtree(tmpdir)
+    return rows
+
+
+def main(argv=None):
+    args = _common.parser(__doc__).parse_args(argv)
+    _common.report(run(), ['format', 'list', 'info', 'data', 'speedup'],
+                   args.json)
+
+
+if __name__ == '__main__':
+    main()
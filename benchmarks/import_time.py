@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# This file is part of MediaFile.
+# Copyright 2016, Adrian Sampson.
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+"""The time taken by ``import mediafile`` in a fresh interpreter, as
+reported by ``python -X importtime``, and by the modules it imports
+directly. Also shows which Mutagen modules opening a file pulls in.
+"""
+import os
+import subprocess
+import sys
+
+from benchmarks import _common
+
+
+# Number of fresh interpreters started; the best time of each module is
+# reported.
+REPEAT = 7
+
+
+def import_times(code='import mediafile'):
+    """Run `code` in a fresh interpreter with ``-X importtime`` and get
+    a list of ``(name, depth, cumulative)`` tuples, one per imported
+    module, with times in seconds.
+    """
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    output = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        stderr=subprocess.PIPE, env=env, universal_newlines=True,
+        check=True,
+    ).stderr
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not cumulative.strip().isdigit():
+            continue  # The header line.
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), depth, int(cumulative) / 1e6))
+    return entries
+
+
+def run():
+    import_times()  # Warm up the bytecode cache.
+    best = {}
+    order = []
+    for _ in range(REPEAT):
+        # Modules are listed after the modules they import, so the
+        # direct imports of `mediafile` are the entries one level deeper
+        # since the previous top-level entry.
+        children = []
+        for name, depth, cumulative in import_times():
+            if depth == 0 and name != 'mediafile':
+                children = []
+            elif depth == 1:
+                children.append((name, cumulative))
+            elif depth == 0:
+                children.append((name, cumulative))
+                break
+        for name, cumulative in children:
+            if name not in best:
+                order.append(name)
+            best[name] = min(best.get(name, cumulative), cumulative)
+    rows = [{'module': name, 'cumulative': best[name]}
+            for name in order if name != 'mediafile']
+    rows.sort(key=lambda row: -row['cumulative'])
+    rows.insert(0, {'module': 'mediafile', 'cumulative': best['mediafile']})
+
+    path = _common.fixture('full', 'flac').replace('\\', '\\\\')
+    code = ('import sys, mediafile; mediafile.MediaFile({0!r}); '
+            'print(" ".join(sorted(m for m in sys.modules '
+            'if m.startswith("mutagen."))))').format(path)
+    loaded = subprocess.check_output([sys.executable, '-c', code],
+                                     universal_newlines=True).split()
+    rows.append({'module': 'mutagen modules after opening a FLAC file',
+                 'cumulative': len(loaded)})
+    return rows
+
+
+def main(argv=None):
+    args = _common.parser(__doc__).parse_args(argv)
+    _common.report(run(), ['module', 'cumulative'], args.json)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# This file is part of MediaFile.
+# Copyright 2016, Adrian Sampson.
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+"""The I/O done by Mutagen for each format, as counted with
+``io_stats=True``: bytes read when opening, and bytes written when
+saving a small change and a change that grows the tags by 256 KB
+(which may force the audio data to be moved). Also the time taken to
+open the file with and without the counting.
+"""
+import os
+import shutil
+import tempfile
+
+from benchmarks import _common
+
+import mediafile
+
+
+def _written(path, ext, value, tmpdir):
+    """Save `value` as the title of a copy of `path` and get the number
+    of bytes written.
+    """
+    copy = os.path.join(tmpdir, 'copy.' + ext)
+    shutil.copy(path, copy)
+    mf = mediafile.MediaFile(copy, io_stats=True)
+    mf.title = value
+    mf.save()
+    return mf.io_stats['save'].written_bytes
+
+
+def run():
+    tmpdir = tempfile.mkdtemp()
+    rows = []
+    try:
+        for ext in _common.EXTENSIONS:
+            path = _common.fixture('full', ext)
+            opened = mediafile.MediaFile(path, io_stats=True)
+            rows.append({
+                'format': ext,
+                'size': os.path.getsize(path),
+                'open read': opened.io_stats['open'].read_bytes,
+                'small save': _written(path, ext, u'edited', tmpdir),
+                'growing save': _written(path, ext, u'x' * (256 << 10),
+                                         tmpdir),
+                'open': _common.measure(lambda: mediafile.MediaFile(path)),
+                'counted open': _common.measure(
+                    lambda: mediafile.MediaFile(path, io_stats=True)),
+            })
+    finally:
+        shutil.rmtree(tmpdir)
+    return rows
+
+
+def main(argv=None):
+    args = _common.parser(__doc__).parse_args(argv)
+    _common.report(run(), ['format', 'size', 'open read', 'small save',
+                           'growing save', 'open', 'counted open'],
+                   args.json)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+# This file is part of MediaFile.
+# Copyright 2016, Adrian Sampson.
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+"""Memory used by importing the module (which builds `MediaFile`'s
+table of fields and storage styles) and per storage style, field,
+`Image` and `MediaFile` object. Sizes are in bytes.
+"""
+import subprocess
+import sys
+import tracemalloc
+
+from benchmarks import _common
+
+import mediafile
+
+
+# Number of objects created to measure the size of one.
+COUNT = 1000
+
+
+def import_size():
+    """Get the memory allocated by importing the module in a fresh
+    interpreter.
+    """
+    code = ('import tracemalloc; tracemalloc.start(); import mediafile; '
+            'print(tracemalloc.get_traced_memory()[0])')
+    return int(subprocess.check_output([sys.executable, '-c', code]))
+
+
+def allocated(func, count=COUNT):
+    """Get the memory allocated per call when calling `func` `count`
+    times and keeping the results.
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objects = [func() for _ in range(count)]
+        size = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del objects
+    return size // count
+
+
+def run():
+    path = _common.fixture('full', 'mp3')
+    objects = [
+        ('StorageStyle', lambda: mediafile.StorageStyle('TITLE')),
+        ('MP3DescStorageStyle',
+         lambda: mediafile.MP3DescStorageStyle(u'Description')),
+        ('MediaField', lambda: mediafile.MediaField(
+            mediafile.MP3StorageStyle('TIT2'),
+            mediafile.StorageStyle('TITLE'),
+        )),
+        ('Image', lambda: mediafile.Image(b'data', u'desc', 3)),
+    ]
+    rows = [{'object': 'import', 'size': import_size()}]
+    for name, func in objects:
+        rows.append({'object': name, 'size': allocated(func)})
+    rows.append({'object': 'MediaFile (mp3)',
+                 'size': allocated(lambda: mediafile.MediaFile(path), 100)})
+    return rows
+
+
+def main(argv=None):
+    args = _common.parser(__doc__).parse_args(argv)
+    _common.report(run(), ['object', 'size'], args.json)
+
+
+if __name__ == '__main__':
+    main()
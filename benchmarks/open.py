@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# This file is part of MediaFile.
+# Copyright 2016, Adrian Sampson.
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+"""Opening every readable file in a directory (by default, the test
+resources) and reading its title, with the stream information loaded
+eagerly (`info=True`) and deferred until first use (the default).
+"""
+import os
+
+from benchmarks import _common
+
+import mediafile
+
+
+def readable_files(directory):
+    """Get the paths of the files in `directory` that MediaFile can open,
+    sorted by name.
+    """
+    paths = []
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        try:
+            mediafile.MediaFile(path)
+        except (mediafile.UnreadableFileError, IOError):
+            continue
+        paths.append(path)
+    return paths
+
+
+def open_files(paths, info):
+    for path in paths:
+        mediafile.MediaFile(path, info=info).title
+
+
+def run(directory=_common.RSRC):
+    groups = {}
+    for path in readable_files(directory):
+        ext = os.path.splitext(path)[1].lstrip('.')
+        groups.setdefault(ext, []).append(path)
+    groups['(all)'] = sum(groups.values(), [])
+
+    rows = []
+    for ext, paths in sorted(groups.items()):
+        row = {'format': ext, 'files': len(paths)}
+        for label, info in (('eager', True), ('deferred', False)):
+            row[label] = _common.measure(lambda: open_files(paths, info)) \
+                / len(paths)
+        row['speedup'] = u'{0:.2f}x'.format(row['eager'] / row['deferred'])
+        rows.append(row)
+    return rows
+
+
+def main(argv=None):
+    p = _common.parser(__doc__)
+    p.add_argument('directory', nargs='?', default=_common.RSRC,
+                   help='directory of audio files')
+    args = p.parse_args(argv)
+    _common.report(run(args.directory),
+                   ['format', 'files', 'eager', 'deferred', 'speedup'],
+                   args.json)
+
+
+if __name__ == '__main__':
+    main()
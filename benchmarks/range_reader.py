@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# This file is part of MediaFile.
+# Copyright 2016, Adrian Sampson.
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+"""Reading all the tags of a file through a range reader, as for files
+in object storage: the number of requests made and the bytes fetched,
+with the block cache versus one request per read made by Mutagen. The
+large files are fixtures followed by 16 MB of (ignored) data.
+"""
+from benchmarks import _common
+
+import mediafile
+
+
+# Data appended to the fixtures for the large files.
+PADDING = 16 << 20
+
+
+def _open(data, name, **kwargs):
+    """Read everything from `data` through a range reader and return
+    the `_RangeFile` used.
+    """
+    def read_range(offset, length):
+        return data[offset:offset + length]
+    fileobj = mediafile._RangeFile(read_range, len(data), name, **kwargs)
+    mf = mediafile.MediaFile(fileobj)
+    mf.read_all()
+    return fileobj
+
+
+def run():
+    files = [('full.' + ext, ext, 0) for ext in _common.EXTENSIONS]
+    files += [('large.mp3', 'mp3', PADDING), ('large.flac', 'flac', PADDING)]
+    rows = []
+    for name, ext, padding in files:
+        with open(_common.fixture('full', ext), 'rb') as f:
+            data = f.read() + bytes(padding)
+        uncached = _open(data, name, block_size=1, cache_blocks=0)
+        cached = _open(data, name)
+        rows.append({
+            'file': name,
+            'size': len(data),
+            'reads': uncached.requests,
+            'read bytes': uncached.fetched,
+            'requests': cached.requests,
+            'fetched': cached.fetched,
+        })
+    return rows
+
+
+def main(argv=None):
+    args = _common.parser(__doc__).parse_args(argv)
+    _common.report(run(), ['file', 'size', 'reads', 'read bytes',
+                           'requests', 'fetched'], args.json)
+
+
+if __name__ == '__main__':
+    main()
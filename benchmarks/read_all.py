@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+# This file is part of MediaFile.
+# Copyright 2016, Adrian Sampson.
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+"""Reading all fields of a file with `as_dict()`, one field at a time,
+versus the indexed bulk read of `read_all()`.
+"""
+from benchmarks import _common
+
+import mediafile
+
+
+def run():
+    rows = []
+    for ext in _common.EXTENSIONS:
+        mf = mediafile.MediaFile(_common.fixture('full', ext))
+        row = {
+            'format': ext,
+            'as_dict': _common.measure(mf.as_dict),
+            'read_all': _common.measure(mf.read_all),
+        }
+        row['speedup'] = u'{0:.2f}x'.format(row['as_dict'] / row['read_all'])
+        rows.append(row)
+    return rows
+
+
+def main(argv=None):
+    args = _common.parser(__doc__).parse_args(argv)
+    _common.report(run(), ['format', 'as_dict', 'read_all', 'speedup'],
+                   args.json)
+
+
+if __name__ == '__main__':
+    main()
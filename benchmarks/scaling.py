@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+# This file is part of MediaFile.
+# Copyright 2016, Adrian Sampson.
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+"""Reading every field of every file in generated libraries of several
+sizes one file after the other and with `mediafile.scan` (threads and
+processes), reporting the throughput in files per second and the peak
+resident memory in KB.
+
+The libraries are cloned from the `empty` or `full` fixtures with the
+chosen tag density, without network access. Each measurement runs in a
+fresh interpreter, so that the peak memory is its own; `worker rss` is
+that of the largest worker process. Memory is measured with the
+`resource` module, which is only available on Unix.
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks import _common
+from benchmarks import _library
+
+import mediafile
+
+
+# Numbers of files in the measured libraries.
+SIZES = [100, 1000]
+
+METHODS = ['serial', 'thread', 'process']
+
+
+def read_library(directory, method, workers):
+    """Read all fields of all files in `directory` with `method` and
+    return the number of files.
+    """
+    if method == 'serial':
+        files = 0
+        for path in mediafile._iter_files([directory]):
+            mediafile.MediaFile(path).as_dict()
+            files += 1
+        return files
+    return sum(1 for _ in mediafile.scan([directory], workers=workers,
+                                         executor=method))
+
+
+def child(directory, method, workers):
+    """Read a library in the current process and print the number of
+    files, the time taken and the peak memory as JSON.
+    """
+    import resource
+    start = time.perf_counter()
+    files = read_library(directory, method, workers)
+    elapsed = time.perf_counter() - start
+    # The maximum resident set size is in bytes on macOS, KB elsewhere.
+    scale = 1024 if sys.platform == 'darwin' else 1
+    json.dump({
+        'files': files,
+        'time': elapsed,
+        'rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // scale,
+        'worker rss': resource.getrusage(
+            resource.RUSAGE_CHILDREN).ru_maxrss // scale,
+    }, sys.stdout)
+
+
+def measure(directory, method, workers):
+    code = 'from benchmarks import scaling; scaling.child({0!r}, {1!r}, ' \
+        '{2!r})'.format(directory, method, workers)
+    out = subprocess.check_output(
+        [sys.executable, '-c', code],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return json.loads(out.decode('utf-8'))
+
+
+def library(directory, size, density):
+    """Get the path of a generated library of `size` files in
+    `directory`, generating it unless it already exists.
+    """
+    name = u'{0}-{1}'.format(u'-'.join(str(v) for v in density), size)
+    path = os.path.join(directory, name)
+    if not os.path.isdir(path):
+        partial = path + '.partial'
+        shutil.rmtree(partial, ignore_errors=True)
+        os.makedirs(partial)
+        _library.generate(partial, size, density)
+        os.rename(partial, path)
+    # Have the files in the page cache before any measurement.
+    for filename in mediafile._iter_files([path]):
+        with open(filename, 'rb') as f:
+            while f.read(1 << 20):
+                pass
+    return path
+
+
+def run(sizes=SIZES, density=_library.DENSITIES['typical'], workers=None,
+        directory=None, repeat=3):
+    workers = workers or os.cpu_count() or 1
+    tmpdir = None
+    if directory is None:
+        directory = tmpdir = tempfile.mkdtemp()
+    rows = []
+    try:
+        for size in sizes:
+            path = library(directory, size, density)
+            for method in METHODS:
+                results = [measure(path, method, workers)
+                           for _ in range(repeat)]
+                best = min(results, key=lambda r: r['time'])
+                row = {
+                    'files': best['files'],
+                    'method': method,
+                    'workers': 1 if method == 'serial' else workers,
+                    'files/s': int(best['files'] / best['time']),
+                    'rss': max(r['rss'] for r in results),
+                }
+                if method == 'process':
+                    row['worker rss'] = max(r['worker rss'] for r in results)
+                rows.append(row)
+    finally:
+        if tmpdir:
+            shutil.rmtree(tmpdir)
+    return rows
+
+
+def main(argv=None):
+    p = _common.parser(__doc__)
+    p.add_argument('--files', type=int, action='append', metavar='N',
+                   help='number of files in a library (repeatable; '
+                        'default: {0})'.format(
+                            ', '.join(str(s) for s in SIZES)))
+    p.add_argument('--density', choices=sorted(_library.DENSITIES),
+                   default='typical', help='how heavily the files are '
+                   'tagged (default: typical)')
+    for field in _library.Density._fields[1:]:
+        p.add_argument('--' + field.replace('_', '-'), type=int,
+                       help='override the {0} of the density'.format(
+                           field.replace('_', ' ')))
+    p.add_argument('--workers', type=int, default=None,
+                   help='number of workers (default: one per CPU)')
+    p.add_argument('--directory',
+                   help='generate the libraries in (and reuse them from) '
+                        'this directory instead of a temporary one')
+    p.add_argument('--repeat', type=int, default=3,
+                   help='measurements per library and method (default: 3)')
+    args = p.parse_args(argv)
+
+    density = _library.DENSITIES[args.density]
+    density = density._replace(**dict(
+        (field, getattr(args, field)) for field in density._fields[1:]
+        if getattr(args, field) is not None
+    ))
+    rows = run(args.files or SIZES, density, args.workers, args.directory,
+               args.repeat)
+    _common.report(rows, ['files', 'method', 'workers', 'files/s', 'rss',
+                          'worker rss'], args.json)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+# This file is part of MediaFile.
+# Copyright 2016, Adrian Sampson.
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+"""Reading all the files in a directory (by default, the test
+resources) one after the other and with `mediafile.scan`, using threads
+and processes.
+"""
+import os
+
+from benchmarks import _common
+
+import mediafile
+
+
+def read_sequentially(directory):
+    for path in mediafile._iter_files([directory]):
+        try:
+            mediafile.MediaFile(path).as_dict()
+        except mediafile.UnreadableFileError:
+            pass
+
+
+def run(directory=_common.RSRC, workers=None):
+    workers = workers or os.cpu_count() or 1
+    files = len(list(mediafile._iter_files([directory])))
+    rows = [{'method': 'sequential', 'workers': 1, 'files': files,
+             'time': _common.measure(lambda: read_sequentially(directory),
+                                     repeat=3) / files}]
+    for executor in ('thread', 'process'):
+        def func():
+            for _ in mediafile.scan([directory], workers=workers,
+                                    executor=executor):
+                pass
+        rows.append({'method': executor, 'workers': workers,
+                     'files': files,
+                     'time': _common.measure(func, repeat=3) / files})
+    for row in rows:
+        row['speedup'] = u'{0:.2f}x'.format(rows[0]['time'] / row['time'])
+    return rows
+
+
+def main(argv=None):
+    p = _common.parser(__doc__)
+    p.add_argument('directory', nargs='?', default=_common.RSRC,
+                   help='directory of audio files')
+    p.add_argument('--workers', type=int, default=None,
+                   help='number of workers (default: one per CPU)')
+    args = p.parse_args(argv)
+    _common.report(run(args.directory, args.workers),
+                   ['method', 'workers', 'files', 'time', 'speedup'],
+                   args.json)
+
+
+if __name__ == '__main__':
+    main()
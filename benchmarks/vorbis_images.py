@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# This file is part of MediaFile.
+# Copyright 2016, Adrian Sampson.
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+"""Peak memory use (measured with `tracemalloc`) and time of encoding a
+large image for embedding into Ogg Vorbis and Opus files and of decoding
+it when reading it back, with the base64 coding of the picture blocks
+done through Mutagen's `Picture` objects and with MediaFile's own
+streamlined coding. Saving and opening the files are not included.
+"""
+import base64
+import os
+import shutil
+import tempfile
+import tracemalloc
+
+import mutagen.flac
+
+from benchmarks import _common
+
+import mediafile
+
+
+# Size of the synthetic image, in bytes.
+IMAGE_SIZE = 10 * 1024 * 1024
+
+EXTENSIONS = ['ogg', 'opus']
+
+
+def _picture_serialize(self, image):
+    """Encode an image by way of a complete FLAC picture block."""
+    pic = mutagen.flac.Picture()
+    pic.data = image.data
+    pic.type = image.type_index
+    pic.mime = image.mime_type
+    pic.desc = image.desc or u''
+    return base64.b64encode(pic.write()).decode('ascii')
+
+
+def _picture_load(data, pos, length):
+    """Decode an image by parsing the whole FLAC picture block."""
+    return mutagen.flac.Picture(base64.b64decode(data)).data
+
+
+CODINGS = [
+    ('picture', _picture_serialize, _picture_load),
+    ('streamlined', mediafile.VorbisImageStorageStyle.serialize,
+     mediafile._load_picture),
+]
+
+
+def make_image(size=IMAGE_SIZE):
+    with open(os.path.join(_common.RSRC, 'image-2x3.jpg'), 'rb') as f:
+        data = f.read()
+    return data + b'\x00' * (size - len(data))
+
+
+def peak(func):
+    """Call `func` and get the peak size, in MB, of the memory allocated
+    during the call.
+    """
+    tracemalloc.start()
+    try:
+        func()
+        size = tracemalloc.get_traced_memory()[1]
+        return u'{0:.1f}'.format(size / 2.0 ** 20)
+    finally:
+        tracemalloc.stop()
+
+
+def run():
+    data = make_image()
+    tmpdir = tempfile.mkdtemp()
+    rows = []
+    try:
+        for ext in EXTENSIONS:
+            path = os.path.join(tmpdir, 'image.' + ext)
+            shutil.copy(_common.fixture('full', ext), path)
+            mf = mediafile.MediaFile(path)
+
+            def encode():
+                mf.images = [mediafile.Image(data, mime_type=u'image/jpeg')]
+            encode()
+            mf.save()
+
+            def decode():
+                return mediafile.MediaFile(path).images[0].data
+
+            for label, serialize, load in CODINGS:
+                style = mediafile.VorbisImageStorageStyle
+                original = style.serialize, mediafile._load_picture
+                style.serialize, mediafile._load_picture = serialize, load
+                try:
+                    image = mediafile.MediaFile(path).images[0]
+                    rows.append({
+                        'format': ext,
+                        'coding': label,
+                        'encode MB': peak(encode),
+                        'decode MB': peak(lambda: image.data),
+                        'encode': _common.measure(encode, number=3),
+                        'decode': _common.measure(decode, number=3),
+                    })
+                finally:
+                    style.serialize, mediafile._load_picture = original
+    finally:
+        shutil.rmtree(tmpdir)
+    return rows
+
+
+def main(argv=None):
+    args = _common.parser(__doc__).parse_args(argv)
+    _common.report(run(), ['format', 'coding', 'encode MB', 'decode MB',
+                           'encode', 'decode'], args.json)
+
+
+if __name__ == '__main__':
+    main()
@@ -34,30 +34,40 @@ data from the tags. In turn ``MediaField`` uses a number of
 ``StorageStyle`` strategies to handle format specific logic.
 """
 import mutagen
-import mutagen.id3
-import mutagen.mp3
-import mutagen.mp4
-import mutagen.flac
-import mutagen.asf
 import mutagen._util
 
+import array
 import base64
 import binascii
 import codecs
+import collections
+import copy
 import datetime
 import enum
-import filetype
 import functools
+import importlib
 import logging
+import io
 import math
+import mmap
 import os
 import re
 import struct
+import sys
+import time
 import traceback
 
+# The format-specific Mutagen modules (`mutagen.id3`, `mutagen.mp4`,
+# etc.) are not imported here, which keeps importing this module cheap.
+# Mutagen imports them when it opens a file of the format, and the code
+# for a format (e.g., its storage styles) only runs on such files. Code
+# that runs for any format uses `_mutagen_type` or imports what it
+# needs.
+
 
 __version__ = '0.13.0'
-__all__ = ['UnreadableFileError', 'FileTypeError', 'MediaFile']
+__all__ = ['UnreadableFileError', 'FileTypeError', 'MediaFile',
+           'AsyncMediaFile', 'scan', 'cast_many']
 
 log = logging.getLogger(__name__)
 
@@ -87,6 +97,18 @@ class UnreadableFileError(Exception):
     def __init__(self, filename, msg):
         Exception.__init__(self, msg if msg else repr(filename))
 
+    def __reduce__(self):
+        # The constructors of the error classes take different arguments
+        # than they keep in `args`, so rebuild the error from those
+        # directly (e.g., when it is sent back from another process).
+        return (_rebuild_error, (type(self), self.args))
+
+
+def _rebuild_error(cls, args):
+    exc = cls.__new__(cls)
+    exc.args = args
+    return exc
+
 
 class FileTypeError(UnreadableFileError):
     """Reading this type of file is not supported.
@@ -162,22 +184,945 @@ def loadfile(method=True, writable=False, create=False):
     return decorator
 
 
+def _mutagen_type(module, name):
+    """Get the class `name` from the Mutagen module `module` if the
+    module has been imported, or None otherwise.
+
+    There can be no instances of the class before its module has been
+    imported, so this allows for type checks that do not import it.
+    """
+    return getattr(sys.modules.get(module), name, None)
+
+
+# Accounting for the I/O done by Mutagen.
+
+class IOStats(object):
+    """Counts of the file operations done by Mutagen for an action
+    (e.g., ``'open'`` or ``'save'``): the number of `calls`, the number
+    of `reads` and `writes` and the bytes read and written
+    (`read_bytes` and `written_bytes`), the number of `seeks`, and the
+    wall-clock `time` in seconds, including the time spent parsing.
+
+    Stats can be added together with ``+`` and ``+=``.
+    """
+    __slots__ = ('calls', 'reads', 'read_bytes', 'writes', 'written_bytes',
+                 'seeks', 'time')
+
+    def __init__(self, calls=0, reads=0, read_bytes=0, writes=0,
+                 written_bytes=0, seeks=0, time=0.0):
+        self.calls = calls
+        self.reads = reads
+        self.read_bytes = read_bytes
+        self.writes = writes
+        self.written_bytes = written_bytes
+        self.seeks = seeks
+        self.time = time
+
+    def as_dict(self):
+        """Get the counts as a dictionary."""
+        return dict((name, getattr(self, name)) for name in self.__slots__)
+
+    def __iadd__(self, other):
+        for name in self.__slots__:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        return self
+
+    def __add__(self, other):
+        result = IOStats(**self.as_dict())
+        result += other
+        return result
+
+    def __eq__(self, other):
+        if not isinstance(other, IOStats):
+            return NotImplemented
+        return self.as_dict() == other.as_dict()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return 'IOStats({0})'.format(', '.join(
+            '{0}={1!r}'.format(name, getattr(self, name))
+            for name in self.__slots__
+        ))
+
+
+class _CountingFile(object):
+    """A wrapper around a file object that counts the reads, writes and
+    seeks made on it into an `IOStats`.
+    """
+    def __init__(self, fileobj, stats):
+        self._fileobj = fileobj
+        self._stats = stats
+
+    def read(self, *args):
+        data = self._fileobj.read(*args)
+        self._stats.reads += 1
+        self._stats.read_bytes += len(data)
+        return data
+
+    def readinto(self, b):
+        size = self._fileobj.readinto(b)
+        self._stats.reads += 1
+        self._stats.read_bytes += size or 0
+        return size
+
+    def write(self, data):
+        size = self._fileobj.write(data)
+        self._stats.writes += 1
+        self._stats.written_bytes += len(data)
+        return size
+
+    def seek(self, *args):
+        self._stats.seeks += 1
+        return self._fileobj.seek(*args)
+
+    def __getattr__(self, name):
+        return getattr(self._fileobj, name)
+
+
+def _counted_call(stats, action, filename, func, filething, writable=False,
+                  **kwargs):
+    """Call the Mutagen function `func` with `filething` like
+    `mutagen_call` does and, if `stats` is not None, count the I/O and
+    time of the call into it.
+
+    A filething without a file object is opened here, for writing if
+    `writable` is set, so that its I/O can be counted.
+    """
+    if stats is None:
+        return mutagen_call(action, filename, func, filething, **kwargs)
+
+    def call():
+        if filething.fileobj is not None:
+            return func(mutagen._util.FileThing(
+                _CountingFile(filething.fileobj, stats),
+                filething.filename, filething.name,
+            ), **kwargs)
+        try:
+            fileobj = open(filething.filename, 'rb+' if writable else 'rb')
+        except IOError as exc:
+            raise mutagen.MutagenError(exc)
+        with fileobj:
+            return func(mutagen._util.FileThing(
+                _CountingFile(fileobj, stats),
+                filething.filename, filething.name,
+            ), **kwargs)
+
+    start = time.perf_counter()
+    try:
+        return mutagen_call(action, filename, call)
+    finally:
+        stats.calls += 1
+        stats.time += time.perf_counter() - start
+
+
+# Format detection.
+
+_Signature = collections.namedtuple('_Signature',
+                                    ['module', 'name', 'match', 'extensions'])
+
+
+def _starts_with(*prefixes):
+    """Make a header test that checks for any of the given prefixes.
+    """
+    return lambda header: header.startswith(prefixes)
+
+
+def _ogg_stream(marker):
+    """Make a header test for an Ogg stream whose header packet contains
+    `marker`. Mutagen prefers Theora for Ogg files that also carry a
+    video stream, so those are left to it.
+    """
+    def match(header):
+        return header.startswith(b'OggS') and marker in header and \
+            b'theora' not in header
+    return match
+
+
+def _riff_form(form):
+    """Make a header test for a RIFF file of the given form type.
+    """
+    return lambda header: header[:4] == b'RIFF' and header[8:12] == form
+
+
+# The Mutagen file types that can be recognized from the first bytes of
+# a file alone: the module and name of the type, a test of the file's
+# header and the file name extensions used for it. A file matching
+# exactly one of these tests, and with one of its extensions (or no
+# extension at all), is given that type; any other file is opened by
+# `mutagen.File`. The tests agree with the scores `mutagen.File` gives
+# the Mutagen types, so both ways choose the same type.
+_SIGNATURES = [
+    _Signature('mutagen.mp3', 'MP3',
+               _starts_with(b'ID3', b'\xff\xf2', b'\xff\xf3', b'\xff\xfa',
+                            b'\xff\xfb'),
+               ('.mp3', '.mp2', '.mpg', '.mpeg')),
+    _Signature('mutagen.mp4', 'MP4',
+               lambda header: header[4:8] == b'ftyp',
+               ('.m4a', '.m4b', '.m4p', '.m4v', '.mp4')),
+    _Signature('mutagen.flac', 'FLAC', _starts_with(b'fLaC'), ('.flac',)),
+    _Signature('mutagen.oggvorbis', 'OggVorbis', _ogg_stream(b'\x01vorbis'),
+               ('.ogg', '.oga')),
+    _Signature('mutagen.oggopus', 'OggOpus', _ogg_stream(b'OpusHead'),
+               ('.opus', '.ogg', '.oga')),
+    _Signature('mutagen.monkeysaudio', 'MonkeysAudio', _starts_with(b'MAC '),
+               ('.ape',)),
+    _Signature('mutagen.wavpack', 'WavPack', _starts_with(b'wvpk'),
+               ('.wv',)),
+    _Signature('mutagen.musepack', 'Musepack', _starts_with(b'MP+', b'MPCK'),
+               ('.mpc',)),
+    _Signature('mutagen.asf', 'ASF',
+               _starts_with(b'0&\xb2u\x8ef\xcf\x11\xa6\xd9\x00\xaa\x00b\xcel'),
+               ('.wma', '.asf', '.wmv')),
+    _Signature('mutagen.aiff', 'AIFF', _starts_with(b'FORM'),
+               ('.aif', '.aiff', '.aifc')),
+    _Signature('mutagen.dsf', 'DSF', _starts_with(b'DSD '), ('.dsf',)),
+    _Signature('mutagen.wave', 'WAVE', _riff_form(b'WAVE'),
+               ('.wav', '.wave')),
+]
+
+
+# The `MediaFile.type` of each supported Mutagen file type, by class
+# name. MP4 files using the ALAC codec are 'alac' rather than 'aac'.
+_TYPES = {
+    'M4A': 'aac',
+    'MP4': 'aac',
+    'ID3': 'mp3',
+    'MP3': 'mp3',
+    'FLAC': 'flac',
+    'OggOpus': 'opus',
+    'OggVorbis': 'ogg',
+    'MonkeysAudio': 'ape',
+    'WavPack': 'wv',
+    'Musepack': 'mpc',
+    'ASF': 'asf',
+    'AIFF': 'aiff',
+    'DSF': 'dsf',
+    'WAVE': 'wav',
+}
+
+
+def _sniff_kind(name, header):
+    """Get the Mutagen file type of a file from its `name` and `header`
+    using the signatures in `_SIGNATURES`, importing only the module of
+    that type. Return None if the signatures are not conclusive.
+    """
+    matches = [sig for sig in _SIGNATURES if sig.match(header)]
+    if len(matches) != 1:
+        return None
+    signature = matches[0]
+
+    if not isinstance(name, (bytes, str)):
+        name = ''  # File objects may have a descriptor or nothing here.
+    extension = os.path.splitext(os.fsdecode(name))[1].lower()
+    if extension and extension not in signature.extensions:
+        # Another type may score higher for this extension.
+        return None
+
+    module = importlib.import_module(signature.module)
+    return getattr(module, signature.name)
+
+
+def _guess_kind(filething):
+    """Get the Mutagen file type for a file from the signature of its
+    header, or None if the signatures are not conclusive.
+    """
+    fileobj = filething.fileobj
+    try:
+        header = fileobj.read(128)
+    except IOError:
+        header = b''
+    kind = _sniff_kind(filething.name, header)
+    try:
+        fileobj.seek(0, 0)
+    except IOError:
+        pass
+    return kind
+
+
+def _open_any(filething):
+    """Open a file whose type the signatures did not tell with
+    `mutagen.File`, which scores every type it knows. Return None if no
+    type matches.
+    """
+    return mutagen.File(filething)
+
+
+def _open_file(filething):
+    """Open a file like `mutagen.File` does, reading the tags and the
+    stream information, but detect its type with `_guess_kind` first.
+    """
+    kind = _guess_kind(filething)
+    if kind is None:
+        return _open_any(filething)
+    return kind(filething.fileobj, filename=filething.filename)
+
+
+class _LazyInfo(object):
+    """A stand-in for the stream information (the ``info`` attribute) of
+    a Mutagen file that was opened without it.
+
+    The information is loaded from the file, using the `load` function,
+    the first time any of its attributes is used. The stand-in then
+    replaces itself with the real object on `mgfile` and forwards
+    everything to it.
+
+    If `_record` is set, the I/O done to load the information is counted
+    and passed to it as ``_record('load info', stats)``.
+    """
+    def __init__(self, mgfile, filething, load):
+        self._mgfile = mgfile
+        self._filething = filething
+        self._load = load
+        self._info = None
+        self._record = None
+
+    def _resolve(self):
+        if self._info is None:
+            filething = self._filething
+            if not isinstance(filething.fileobj, _MappedFile):
+                filething = mutagen_call('load info', filething.name,
+                                         _update_filething, filething)
+            stats = None if self._record is None else IOStats()
+            self._info = _counted_call(
+                stats, 'load info', filething.name, _load_info, filething,
+                load=self._load
+            )
+            self._mgfile.info = self._info
+            if stats is not None:
+                self._record('load info', stats)
+        return self._info
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name, value):
+        if name.startswith('_'):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._resolve(), name, value)
+
+    def __delattr__(self, name):
+        delattr(self._resolve(), name)
+
+
+@loadfile(method=False)
+def _load_info(filething, load):
+    return load(filething.fileobj)
+
+
+def _open_tags(filething):
+    """Open a file like `mutagen.File` does, but only read its tags.
+
+    For MP3, Ogg and APEv2-tagged formats, finding the stream
+    information takes extra reads (and, for MP3, possibly a scan over
+    the audio frames), so it is left to a `_LazyInfo` to do on demand.
+    The other formats keep their stream information in headers that
+    have to be parsed anyway to find the tags, so they are loaded in
+    full.
+    """
+    kind = _guess_kind(filething)
+    if kind is None:
+        return _open_any(filething)
+    fileobj = filething.fileobj
+
+    id3_file_type = _mutagen_type('mutagen.id3', 'ID3FileType')
+    ogg_file_type = _mutagen_type('mutagen.ogg', 'OggFileType')
+    ape_file_type = _mutagen_type('mutagen.apev2', 'APEv2File')
+
+    if id3_file_type and issubclass(kind, id3_file_type):
+        mgfile = kind.__new__(kind)
+        try:
+            mgfile.tags = kind.ID3(fileobj)
+        except mutagen.id3.ID3NoHeaderError:
+            mgfile.tags = None
+        offset = getattr(mgfile.tags, 'size', None)
+
+        def load(fileobj):
+            return kind._Info(fileobj, offset)
+
+    elif ogg_file_type and issubclass(kind, ogg_file_type):
+        mgfile = kind.__new__(kind)
+        try:
+            info = kind._Info(fileobj)
+            mgfile.tags = kind._Tags(fileobj, info)
+            # Some formats measure the audio from the end of the tags.
+            position = fileobj.tell()
+        except (mutagen.ogg.error, IOError) as exc:
+            raise kind._Error(exc)
+        except EOFError:
+            raise kind._Error('no appropriate stream found')
+
+        def load(fileobj):
+            # Finding the length means reading the last page.
+            try:
+                fileobj.seek(position, 0)
+                info._post_tags(fileobj)
+            except (mutagen.ogg.error, IOError) as exc:
+                raise kind._Error(exc)
+            return info
+
+    elif ape_file_type and issubclass(kind, ape_file_type):
+        mgfile = kind.__new__(kind)
+        try:
+            mgfile.tags = mutagen.apev2.APEv2(fileobj)
+        except mutagen.apev2.APENoHeaderError:
+            mgfile.tags = None
+
+        def load(fileobj):
+            fileobj.seek(0, 0)
+            return kind._Info(fileobj)
+
+    else:
+        return kind(fileobj, filename=filething.filename)
+
+    mgfile.filename = filething.filename
+    if mgfile.tags is None:
+        # Without tags, only the stream information can tell us that
+        # this is an audio file at all.
+        mgfile.info = load(fileobj)
+    else:
+        mgfile.info = _LazyInfo(mgfile, filething, load)
+    return mgfile
+
+
 # Utility.
 
 def _update_filething(filething):
     """Reopen a `filething` if it's a local file.
 
-    A filething that is *not* an actual file is left unchanged; a
-    filething with a filename is reopened and a new object is returned.
+    A filething that is *not* an actual file is rewound to its start,
+    where a freshly opened file would be, and returned; a filething with
+    a filename is reopened and a new object is returned.
     """
     if filething.filename:
         return mutagen._util.FileThing(
             None, filething.filename, filething.name
         )
     else:
+        try:
+            filething.fileobj.seek(0, 0)
+        except (IOError, ValueError) as exc:
+            # E.g., the file object was closed.
+            raise mutagen.MutagenError(exc)
         return filething
 
 
+class _BufferFile(io.RawIOBase):
+    """A seekable binary file object over an in-memory buffer.
+
+    A `bytearray` is read and written in place, growing or shrinking
+    as the file does. Other bytes-like objects (`bytes`, `memoryview`,
+    `mmap`) are read without being copied and are copied into a new
+    `bytearray` the first time the file is written to.
+    """
+    name = ''
+
+    def __init__(self, buf):
+        super(_BufferFile, self).__init__()
+        if isinstance(buf, bytearray):
+            self._data = buf
+        else:
+            self._data = memoryview(buf).cast('B')
+        self._pos = 0
+
+    @property
+    def buffer(self):
+        """The buffer holding the file's current contents."""
+        if isinstance(self._data, memoryview):
+            return self._data.obj
+        return self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def readable(self):
+        return True
+
+    def writable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._data)
+        if offset < 0:
+            raise ValueError('negative seek position {0}'.format(offset))
+        self._pos = offset
+        return offset
+
+    def tell(self):
+        return self._pos
+
+    def read(self, size=-1):
+        length = len(self._data)
+        start = min(self._pos, length)
+        end = length if size is None or size < 0 else min(start + size, length)
+        self._pos = max(self._pos, end)
+        if isinstance(self._data, memoryview):
+            return self._data[start:end].tobytes()
+        # Slicing a memoryview copies only once, but a bytearray can't
+        # be resized while one is alive.
+        with memoryview(self._data) as view:
+            return view[start:end].tobytes()
+
+    def readinto(self, b):
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+    def _writable_data(self):
+        if isinstance(self._data, memoryview):
+            self._data = bytearray(self._data)
+        return self._data
+
+    def write(self, b):
+        data = self._writable_data()
+        size = len(b)
+        if self._pos > len(data):
+            data.extend(bytes(self._pos - len(data)))
+        data[self._pos:self._pos + size] = b
+        self._pos += size
+        return size
+
+    def truncate(self, size=None):
+        if size is None:
+            size = self._pos
+        data = self._writable_data()
+        if size < len(data):
+            del data[size:]
+        else:
+            data.extend(bytes(size - len(data)))
+        return size
+
+
+class _MappedFile(_BufferFile):
+    """A read-only file object over a memory map of a local file.
+
+    The file itself is written through its path (see
+    `_update_filething`), so the map is closed around saves with
+    `unmap` and recreated with `remap`.
+    """
+    def __init__(self, path):
+        self.name = path
+        # Set first: the file object is closed (and unmapped) when it is
+        # collected, even if mapping the file fails.
+        self._mmap = None
+        self._mmap = self._map(path)
+        super(_MappedFile, self).__init__(self._mmap)
+
+    @staticmethod
+    def _map(path):
+        with open(path, 'rb') as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def writable(self):
+        return False
+
+    def _writable_data(self):
+        raise io.UnsupportedOperation('memory-mapped files are read-only')
+
+    def unmap(self):
+        """Close the memory map, if it is open."""
+        if self._mmap is not None:
+            self._data.release()
+            self._data = memoryview(b'')
+            self._mmap.close()
+            self._mmap = None
+
+    def remap(self):
+        """Map the file again, e.g., after it has been changed."""
+        self.unmap()
+        self._mmap = self._map(self.name)
+        self._data = memoryview(self._mmap)
+
+    def close(self):
+        self.unmap()
+        super(_MappedFile, self).close()
+
+
+# The default size of the blocks fetched by a `_RangeFile` and the
+# number of blocks it keeps.
+_RANGE_BLOCK_SIZE = 1 << 16
+_RANGE_CACHE_BLOCKS = 16
+
+
+class _RangeFile(io.RawIOBase):
+    """A read-only file object whose data is fetched in byte ranges by
+    calling ``read_range(offset, length)``, e.g., from object storage.
+
+    Data is fetched in blocks of `block_size` bytes. Adjacent blocks
+    missing from a read are fetched with a single call, and the last
+    `cache_blocks` blocks used are kept so that the small reads of
+    Mutagen's parsers are answered from memory. `requests` and
+    `fetched` count the calls made and the bytes they returned.
+    """
+    name = ''
+
+    def __init__(self, read_range, size, name=None,
+                 block_size=_RANGE_BLOCK_SIZE,
+                 cache_blocks=_RANGE_CACHE_BLOCKS):
+        super(_RangeFile, self).__init__()
+        if name:
+            self.name = name
+        self._read_range = read_range
+        self._size = size
+        self._block_size = block_size
+        self._cache_blocks = cache_blocks
+        self._blocks = collections.OrderedDict()
+        self._pos = 0
+        self.requests = 0
+        self.fetched = 0
+
+    def __len__(self):
+        return self._size
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self._size
+        if offset < 0:
+            raise ValueError('negative seek position {0}'.format(offset))
+        self._pos = offset
+        return offset
+
+    def tell(self):
+        return self._pos
+
+    def _fetch(self, first, last):
+        """Make sure that the blocks `first` to `last` (inclusive) are
+        in the cache, fetching each run of missing blocks at once.
+        """
+        blocks = self._blocks
+        size = self._block_size
+        index = first
+        while index <= last:
+            if index in blocks:
+                blocks.move_to_end(index)
+                index += 1
+                continue
+            end = index
+            while end < last and end + 1 not in blocks:
+                end += 1
+            offset = index * size
+            length = min((end + 1) * size, self._size) - offset
+            data = self._read_range(offset, length)
+            if len(data) != length:
+                raise IOError('expected {0} bytes at offset {1}, got {2}'
+                              .format(length, offset, len(data)))
+            self.requests += 1
+            self.fetched += length
+            for i in range(index, end + 1):
+                start = (i - index) * size
+                blocks[i] = data[start:start + size]
+            index = end + 1
+
+    def read(self, size=-1):
+        start = min(self._pos, self._size)
+        if size is None or size < 0:
+            end = self._size
+        else:
+            end = min(start + size, self._size)
+        self._pos = max(self._pos, end)
+        if start >= end:
+            return b''
+
+        first = start // self._block_size
+        last = (end - 1) // self._block_size
+        self._fetch(first, last)
+        offset = first * self._block_size
+        if first == last:
+            data = self._blocks[first][start - offset:end - offset]
+        else:
+            data = b''.join(self._blocks[i] for i in range(first, last + 1))
+            data = data[start - offset:end - offset]
+
+        while len(self._blocks) > self._cache_blocks:
+            self._blocks.popitem(last=False)
+        return data
+
+    def readinto(self, b):
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+
+class _IndexedTags(object):
+    """A read-only view of a Mutagen tag container that answers lookups
+    from an index built in a single pass over the tags.
+
+    Vorbis comments and ASF attributes are stored as lists of pairs,
+    so every lookup on them scans all the tags. The index groups the
+    values by key so that reading many fields does not scan the tags
+    over and over. Anything the index does not cover is delegated to
+    the underlying container. (ID3 tags have an index of their own; see
+    `_ID3Index`.)
+    """
+    def __init__(self, tags):
+        self._tags = tags
+        self._values = {}
+        # Vorbis comment keys are case-insensitive; ASF keys are not.
+        asf_tags = _mutagen_type('mutagen.asf', 'ASFTags')
+        self._fold = not (asf_tags and isinstance(tags, asf_tags))
+        for key, value in tags:
+            if self._fold:
+                key = key.lower()
+            self._values.setdefault(key, []).append(value)
+
+    @classmethod
+    def wrap(cls, tags):
+        """Get an indexed view of `tags`, or `tags` itself for the
+        containers that already support fast lookups (e.g., MP4 atoms
+        and APEv2 items).
+        """
+        types = tuple(filter(None, [
+            _mutagen_type('mutagen._vorbis', 'VCommentDict'),
+            _mutagen_type('mutagen.asf', 'ASFTags'),
+        ]))
+        if isinstance(tags, types):
+            return cls(tags)
+        return tags
+
+    def __getattr__(self, name):
+        return getattr(self._tags, name)
+
+    def __getitem__(self, key):
+        if not isinstance(key, str):
+            return self._tags[key]
+        values = self._values.get(key.lower() if self._fold else key)
+        if not values:
+            raise KeyError(key)
+        # The containers return a fresh list on every lookup.
+        return list(values)
+
+    def __contains__(self, key):
+        if not isinstance(key, str):
+            return key in self._tags
+        return (key.lower() if self._fold else key) in self._values
+
+
+class _ID3Index(object):
+    """An index of the frames in an ID3 tag by frame type and
+    lowercased identifier: the ``desc`` of TXXX, COMM and similar
+    frames, or the involvement of each entry in a people list (TIPL,
+    TMCL, ...).
+
+    Finding such a frame through Mutagen means scanning all frames of
+    the type, which gets slow on files with hundreds of TXXX frames.
+    The index for a tag is built on first use and kept on the tag
+    object itself, so it is shared by every storage style and lives as
+    long as the tag does. The storage styles keep it up to date as they
+    add and remove frames. The index is rebuilt when any other change
+    to the number of frames is noticed, when a lookup hits a frame that
+    is no longer in the tag, or when a lookup misses but Mutagen's own
+    key for it (``TXXX:desc``, or ``TIPL`` for a people list) holds a
+    frame that the index does not know. This catches most edits made
+    directly to the Mutagen object.
+    """
+    def __init__(self, tags):
+        self.size = len(tags)
+        self.entries = {}
+        # The frames by Mutagen's key.
+        self.frames = {}
+        for frame in tags.values():
+            self._add(frame)
+
+    def _keys(self, frame):
+        """Generate the index keys for `frame` along with the people
+        list entry each key refers to (or None).
+        """
+        desc = getattr(frame, 'desc', None)
+        if isinstance(desc, str):
+            yield (frame.FrameID, desc.lower()), None
+        for pair in getattr(frame, 'people', ()):
+            if pair and isinstance(pair[0], str):
+                yield (frame.FrameID, pair[0].lower()), pair
+
+    def _add(self, frame):
+        self.frames[frame.HashKey] = frame
+        for key, pair in self._keys(frame):
+            self.entries.setdefault(key, []).append((frame, pair))
+
+    def _remove(self, frame):
+        if self.frames.get(frame.HashKey) is frame:
+            del self.frames[frame.HashKey]
+        for key, _ in self._keys(frame):
+            entries = [e for e in self.entries.get(key, ())
+                       if e[0] is not frame]
+            if entries:
+                self.entries[key] = entries
+            else:
+                self.entries.pop(key, None)
+
+    @classmethod
+    def of(cls, tags, rebuild=False):
+        """Get the index for the ID3 tag `tags`, building it if it is
+        missing or out of date.
+        """
+        index = getattr(tags, '_mediafile_index', None)
+        if rebuild or index is None or index.size != len(tags):
+            index = cls(tags)
+            tags._mediafile_index = index
+        return index
+
+    @classmethod
+    def lookup(cls, tags, kind, ident, hash_key):
+        """Get a list of ``(frame, pair)`` tuples for the frames of type
+        `kind` whose identifier matches `ident`, ignoring case. `pair`
+        is the matching people list entry for people frames and None
+        otherwise. `hash_key` is Mutagen's key for such frames.
+        """
+        key = (kind, ident.lower())
+        index = cls.of(tags)
+        entries = index.entries.get(key, [])
+        stale = any(tags.get(frame.HashKey) is not frame
+                    for frame, _ in entries)
+        if stale or not entries and index._missed(tags, hash_key):
+            entries = cls.of(tags, rebuild=True).entries.get(key, [])
+        return list(entries)
+
+    def _missed(self, tags, hash_key):
+        """Check whether Mutagen's key `hash_key` holds a frame that is
+        not in the index, which a change of frames that keeps their
+        number hides.
+        """
+        return hash_key in tags and tags[hash_key] is not \
+            self.frames.get(hash_key)
+
+    @classmethod
+    def added(cls, tags, frame):
+        """Record that `frame` was just added to `tags`.
+        """
+        index = getattr(tags, '_mediafile_index', None)
+        if index is None:
+            return
+        if index.size + 1 == len(tags) and \
+                tags.get(frame.HashKey) is frame:
+            index._add(frame)
+            index.size += 1
+        else:
+            # The frame was merged into an existing one or the tag was
+            # changed behind our back.
+            cls.invalidate(tags)
+
+    @classmethod
+    def removed(cls, tags, frame):
+        """Record that `frame` was just removed from `tags`.
+        """
+        index = getattr(tags, '_mediafile_index', None)
+        if index is None:
+            return
+        if index.size - 1 == len(tags):
+            index._remove(frame)
+            index.size -= 1
+        else:
+            cls.invalidate(tags)
+
+    @staticmethod
+    def invalidate(tags):
+        """Drop the index for `tags`, if any.
+        """
+        if tags is not None:
+            vars(tags).pop('_mediafile_index', None)
+
+
+def _desc_frames(tags, key, desc):
+    """Get the ID3 frames of type `key` in `tags` whose description
+    matches `desc`, ignoring case.
+    """
+    if ':' in key:
+        # Not a plain frame type; leave the matching to Mutagen.
+        desc = desc.lower()
+        return [frame for frame in tags.getall(key)
+                if frame.desc.lower() == desc]
+    return [frame for frame, pair
+            in _ID3Index.lookup(tags, key, desc, key + ':' + desc)
+            if pair is None]
+
+
+def _people_pairs(tags, key, involvement):
+    """Get ``(frame, pair)`` tuples for the entries of the people list
+    frames of type `key` in `tags` whose involvement matches
+    `involvement`, ignoring case.
+    """
+    return [(frame, pair)
+            for frame, pair in _ID3Index.lookup(tags, key, involvement, key)
+            if pair is not None]
+
+
+# Numbers at the front of tag values, like "12" in "12/15".
+_INT_PREFIX = re.compile(r'[\+-]?[0-9]+')
+_FLOAT_PREFIX = re.compile(r'[\+-]?([0-9]+\.?[0-9]*|[0-9]*\.[0-9]+)')
+
+
+def _cast_int(val):
+    if isinstance(val, int) or isinstance(val, float):
+        # Just a number.
+        return int(val)
+    # Process any other type as a string.
+    if isinstance(val, bytes):
+        val = val.decode('utf-8', 'ignore')
+    elif not isinstance(val, str):
+        val = str(val)
+    if val.isdigit() and val.isascii():
+        # Just digits, the common case. (`isdigit` alone would also
+        # accept other scripts' digits, which the pattern does not.)
+        return int(val)
+    # Get a number from the front of the string.
+    match = _INT_PREFIX.match(val.strip())
+    return int(match.group(0)) if match else 0
+
+
+def _cast_bool(val):
+    try:
+        # Should work for strings, bools, ints:
+        return bool(int(val))
+    except ValueError:
+        return False
+
+
+def _cast_str(val):
+    if isinstance(val, str):
+        return val
+    elif isinstance(val, bytes):
+        return val.decode('utf-8', 'ignore')
+    else:
+        return str(val)
+
+
+def _cast_float(val):
+    if isinstance(val, int) or isinstance(val, float):
+        return float(val)
+    if isinstance(val, bytes):
+        val = val.decode('utf-8', 'ignore')
+    else:
+        val = str(val)
+    match = _FLOAT_PREFIX.match(val.strip())
+    if match:
+        val = match.group(0)
+        if val:
+            return float(val)
+    return 0.0
+
+
+_CASTS = {int: _cast_int, bool: _cast_bool, str: _cast_str,
+          float: _cast_float}
+
+
 def _safe_cast(out_type, val):
     """Try to covert val to out_type but never raise an exception.
 
@@ -188,54 +1133,24 @@ def _safe_cast(out_type, val):
     """
     if val is None:
         return None
+    cast = _CASTS.get(out_type)
+    return val if cast is None else cast(val)
 
-    if out_type == int:
-        if isinstance(val, int) or isinstance(val, float):
-            # Just a number.
-            return int(val)
-        else:
-            # Process any other type as a string.
-            if isinstance(val, bytes):
-                val = val.decode('utf-8', 'ignore')
-            elif not isinstance(val, str):
-                val = str(val)
-            # Get a number from the front of the string.
-            match = re.match(r'[\+-]?[0-9]+', val.strip())
-            return int(match.group(0)) if match else 0
-
-    elif out_type == bool:
-        try:
-            # Should work for strings, bools, ints:
-            return bool(int(val))
-        except ValueError:
-            return False
-
-    elif out_type == str:
-        if isinstance(val, bytes):
-            return val.decode('utf-8', 'ignore')
-        elif isinstance(val, str):
-            return val
-        else:
-            return str(val)
 
-    elif out_type == float:
-        if isinstance(val, int) or isinstance(val, float):
-            return float(val)
-        else:
-            if isinstance(val, bytes):
-                val = val.decode('utf-8', 'ignore')
-            else:
-                val = str(val)
-            match = re.match(r'[\+-]?([0-9]+\.?[0-9]*|[0-9]*\.[0-9]+)',
-                             val.strip())
-            if match:
-                val = match.group(0)
-                if val:
-                    return float(val)
-            return 0.0
+def cast_many(out_type, values):
+    """Convert each of the tag values in `values` to `out_type` (`int`,
+    `float`, `bool` or `str`) the way :class:`MediaField` converts
+    the values it reads, and return them as a list.
 
-    else:
-        return val
+    Conversion never fails: a value that cannot be converted becomes a
+    default (e.g., 0 for numbers) and None stays None. Values are passed
+    through unchanged for other types. This is faster than converting
+    the values one by one, e.g., for the lists read by custom fields.
+    """
+    cast = _CASTS.get(out_type)
+    if cast is None:
+        return list(values)
+    return [None if val is None else cast(val) for val in values]
 
 
 # Image coding for ASF/WMA.
@@ -249,6 +1164,15 @@ def _unpack_asf_image(data):
     of exceptions (out-of-bounds, etc.). We should clean this up
     sometime so that the failure modes are well-defined.
     """
+    mime, type, description, pos, size = _unpack_asf_image_header(data)
+    return mime, data[pos:pos + size], type, description
+
+
+def _unpack_asf_image_header(data):
+    """Unpack the fields of a WM/Picture tag that precede the image
+    data. Return a tuple containing the MIME type, a type indicator, the
+    image's description, and the offset and length of the image data.
+    """
     type, size = struct.unpack_from('<bi', data)
     pos = 5
     mime = b''
@@ -261,9 +1185,8 @@ def _unpack_asf_image(data):
         description += data[pos:pos + 2]
         pos += 2
     pos += 2
-    image_data = data[pos:pos + size]
-    return (mime.decode("utf-16-le"), image_data, type,
-            description.decode("utf-16-le"))
+    return (mime.decode("utf-16-le"), type, description.decode("utf-16-le"),
+            pos, size)
 
 
 def _pack_asf_image(mime, data, type=3, description=""):
@@ -348,15 +1271,158 @@ def _sc_encode(gain, peak):
 def image_mime_type(data):
     """Return the MIME type of the image data (a bytestring).
     """
+    import filetype
     return filetype.guess_mime(data)
 
 
+def _unpack_picture_header(data):
+    """Unpack the fields of a base64-encoded FLAC picture block (as
+    stored in Vorbis comments) that precede the image data, decoding no
+    more of the block than needed. Return a tuple containing the type
+    indicator, MIME type, description, and the offset and length of the
+    image data in the decoded block.
+    """
+    def decoded(size):
+        # Each 4 base64 characters encode 3 bytes.
+        try:
+            block = base64.b64decode(data[:-(-size // 3) * 4])
+        except binascii.Error:
+            # Line breaks leave the prefix incomplete.
+            block = b''
+        if len(block) < size:
+            # The encoding contains line breaks or the block is short.
+            block = binascii.a2b_base64(data)
+        return block
+
+    type, mime_length = struct.unpack('>II', decoded(8)[:8])
+    pos = 8 + mime_length
+    desc_length, = struct.unpack_from('>I', decoded(pos + 4), pos)
+    pos += 4
+    block = decoded(pos + desc_length + 20)
+    mime = block[8:8 + mime_length].decode('ascii', 'replace')
+    desc = block[pos:pos + desc_length].decode('utf-8', 'replace')
+    pos += desc_length + 16
+    length, = struct.unpack_from('>I', block, pos)
+    return type, mime, desc, pos + 4, length
+
+
+def _load_picture(data, pos, length):
+    """Decode the image data, found at offset `pos` with the given
+    `length`, of a base64-encoded FLAC picture block.
+    """
+    # Unlike `base64.b64decode`, this does not first copy the text into
+    # an ASCII bytestring.
+    return binascii.a2b_base64(data)[pos:pos + length]
+
+
+# The number of bytes of image data to base64-encode at a time (a
+# multiple of 3, so that the chunks can be encoded separately).
+_PICTURE_CHUNK_SIZE = 3 << 16
+
+
+def _pack_picture(image):
+    """Encode an `Image` as a base64-encoded FLAC picture block (as
+    stored in Vorbis comments).
+    """
+    data = image.data
+    mime = (image.mime_type or u'').encode('utf-8')
+    desc = (image.desc or u'').encode('utf-8')
+    header = struct.pack('>2I', image.type_index, len(mime)) + mime + \
+        struct.pack('>I', len(desc)) + desc + \
+        struct.pack('>5I', 0, 0, 0, 0, len(data))
+
+    # Complete the header's last group of 3 bytes with the start of the
+    # data so that the rest of the data can be encoded on its own,
+    # without building the whole (unencoded) block. The data is encoded
+    # in chunks that are appended to the text, which CPython grows in
+    # place, so no second copy of the (encoded) text is needed.
+    split = -len(header) % 3
+    text = binascii.b2a_base64(header + bytes(data[:split]),
+                               newline=False).decode('ascii')
+    view = memoryview(data)
+    for pos in range(split, len(view), _PICTURE_CHUNK_SIZE):
+        chunk = view[pos:pos + _PICTURE_CHUNK_SIZE]
+        text += binascii.b2a_base64(chunk, newline=False).decode('ascii')
+    return text
+
+
+def _peek_picture(data, pos, length, n):
+    """Decode the first `n` bytes of the image data, found at offset
+    `pos` with the given `length`, of a base64-encoded FLAC picture
+    block.
+    """
+    n = min(n, length)
+    # Decode the whole groups of 4 characters covering the bytes, which
+    # are only found this way if no line breaks come before them.
+    start = pos // 3 * 4
+    end = -(-(pos + n) // 3) * 4
+    if data.find('\n', 0, end) != -1:
+        return _load_picture(data, pos, n)
+    try:
+        head = base64.b64decode(data[start:end])[pos % 3:pos % 3 + n]
+    except binascii.Error:
+        head = b''
+    if len(head) < n:
+        # The block is short.
+        head = _load_picture(data, pos, n)
+    return head
+
+
 def image_extension(data):
+    import filetype
     ext = filetype.guess_extension(data)
     # imghdr returned "tiff", so we should keep returning it with filetype.
     return ext if ext != 'tif' else 'tiff'
 
 
+# The number of bytes at the beginning of image data that is used to
+# find the image's type and dimensions. The frame header of a JPEG image
+# may come after large metadata segments, so more data is used for them
+# when needed.
+_IMAGE_HEADER_SIZE = 8192
+_JPEG_HEADER_SIZE = 65536
+
+# JPEG start-of-frame markers, which precede the image dimensions.
+_JPEG_SOF_MARKERS = frozenset(range(0xc0, 0xd0)) - {0xc4, 0xc8, 0xcc}
+
+
+def image_dimensions(data):
+    """Get the width and height of a PNG, GIF or JPEG image from (the
+    beginning of) its data, or None if they cannot be found.
+    """
+    if data[:8] == b'\x89PNG\r\n\x1a\n' and data[12:16] == b'IHDR':
+        return struct.unpack('>II', data[16:24])
+    if data[:6] in (b'GIF87a', b'GIF89a') and len(data) >= 10:
+        return struct.unpack('<HH', data[6:10])
+    if data[:2] == b'\xff\xd8':
+        # Walk the segments up to the frame header.
+        pos = 2
+        while pos + 9 <= len(data) and data[pos] == 0xff:
+            marker = data[pos + 1]
+            if marker == 0xff:
+                # Fill byte.
+                pos += 1
+            elif marker in _JPEG_SOF_MARKERS:
+                height, width = struct.unpack('>HH', data[pos + 5:pos + 9])
+                return width, height
+            elif marker == 0x01 or 0xd0 <= marker <= 0xd8:
+                # Markers without a segment.
+                pos += 2
+            else:
+                pos += 2 + struct.unpack('>H', data[pos + 2:pos + 4])[0]
+    return None
+
+
+class ImageInfo(collections.namedtuple('ImageInfo', [
+        'type', 'desc', 'mime_type', 'size', 'width', 'height'])):
+    """A description of an image embedded in a file, as returned by
+    :meth:`MediaFile.images_info`: its `ImageType`, description, MIME
+    type, the length of its data in bytes, and its width and height in
+    pixels (None if unknown).
+    """
+    __slots__ = ()
+
+
 class ImageType(enum.Enum):
     """Indicates the kind of an `Image` stored in a file's tag.
     """
@@ -388,17 +1454,31 @@ class Image(object):
     stored and retrieved from tags.
 
     The structure has four properties.
-    * ``data``  The binary data of the image
+    * ``data``  The binary data of the image: `bytes` or another object
+                supporting the buffer protocol (`bytearray`,
+                `memoryview`)
     * ``desc``  An optional description of the image
     * ``type``  An instance of `ImageType` indicating the kind of image
     * ``mime_type`` Read-only property that contains the mime type of
                     the binary data
+
+    The MIME type is detected from the data when it is first used and
+    then remembered until ``data`` is replaced. Callers that already
+    know it can pass `mime_type` to skip the detection.
+
+    Images read from a file are lazy (see `Image.lazy`): their data is
+    only decoded or copied out of the tag when ``data`` is first used.
     """
-    def __init__(self, data, desc=None, type=None):
-        assert isinstance(data, bytes)
+    __slots__ = ('_data', '_load', '_size', '_peek', '_mime_type', 'desc',
+                 'type')
+
+    def __init__(self, data, desc=None, type=None, mime_type=None):
+        assert isinstance(data, (bytes, bytearray, memoryview))
         if desc is not None:
             assert isinstance(desc, str)
+        self._size = self._peek = None
         self.data = data
+        self._mime_type = mime_type
         self.desc = desc
         if isinstance(type, int):
             try:
@@ -408,10 +1488,72 @@ class Image(object):
                 type = ImageType.other
         self.type = type
 
+    @classmethod
+    def lazy(cls, load, desc=None, type=None, size=None, peek=None):
+        """Create an image whose data is obtained by calling `load`
+        without arguments when it is first used.
+
+        If they can be had without loading the data, `size` should be
+        the length of the data and `peek` a function returning its
+        first `n` bytes (as a bytes-like object) when called with `n`.
+        """
+        image = cls(b'', desc, type)
+        image._load = load
+        image._size = size
+        image._peek = peek
+        return image
+
+    def _head(self, n):
+        """Get the first `n` bytes of the data, loading it only if
+        necessary.
+        """
+        if self._load is not None and self._peek is not None:
+            return self._peek(n)
+        return memoryview(self.data)[:n]
+
+    def info(self):
+        """Describe the image as an `ImageInfo`, reading no more than
+        the beginning of the data of a lazy image.
+        """
+        if self._load is not None and self._size is not None:
+            size = self._size
+        else:
+            size = len(self.data)
+        head = bytes(self._head(_IMAGE_HEADER_SIZE))
+        self._sniff(head)
+        dimensions = image_dimensions(head)
+        if dimensions is None and head[:2] == b'\xff\xd8' and \
+                size > len(head):
+            dimensions = image_dimensions(self._head(_JPEG_HEADER_SIZE))
+        width, height = dimensions or (None, None)
+        return ImageInfo(self.type, self.desc, self._mime_type, size,
+                         width, height)
+
+    @property
+    def data(self):
+        if self._load is not None:
+            self._data = self._load()
+            self._load = None
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        self._data = data
+        self._load = None
+        self._mime_type = None
+
     @property
     def mime_type(self):
-        if self.data:
-            return image_mime_type(self.data)
+        if self._mime_type is None:
+            self._sniff(self._head(_IMAGE_HEADER_SIZE))
+        return self._mime_type
+
+    def _sniff(self, head):
+        """Detect the MIME type from the first bytes of the data, unless
+        it is already known.
+        """
+        if self._mime_type is None and len(head):
+            self._mime_type = image_mime_type(bytes(head))
 
     @property
     def type_index(self):
@@ -421,6 +1563,15 @@ class Image(object):
             return 0
         return self.type.value
 
+    def __reduce__(self):
+        # Lazy images keep functions reading the tag, which need not be
+        # picklable (e.g., to send them from another process), so
+        # pickle the data instead.
+        data = self.data
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return (Image, (data, self.desc, self.type, self._mime_type))
+
 
 # StorageStyle classes describe strategies for accessing values in
 # Mutagen file objects.
@@ -449,6 +1600,7 @@ class StorageStyle(object):
     MediaFile only uses StorageStyles that apply to the correct type for
     a given audio file.
     """
+    __slots__ = ('key', 'as_type', 'suffix', 'float_places', 'read_only')
 
     formats = ['FLAC', 'OggOpus', 'OggTheora', 'OggSpeex', 'OggVorbis',
                'OggFlac', 'APEv2File', 'WavPack', 'Musepack', 'MonkeysAudio']
@@ -551,6 +1703,19 @@ class StorageStyle(object):
         if self.key in mutagen_file:
             del mutagen_file[self.key]
 
+    def location(self):
+        """Get a hashable value identifying where this style keeps its
+        data. Styles that access the same data (for the same file
+        format) have equal locations.
+        """
+        return self.key.lower()
+
+    def outdated(self, mutagen_file):
+        """Check whether the value is stored in a form (such as a legacy
+        tag) that storing it again would replace.
+        """
+        return False
+
 
 class ListStorageStyle(StorageStyle):
     """Abstract storage style that provides access to lists.
@@ -567,6 +1732,8 @@ class ListStorageStyle(StorageStyle):
     `StorageStyle`) are still called with individual values. This class
     handles packing and unpacking the values into lists.
     """
+    __slots__ = ()
+
     def get(self, mutagen_file):
         """Get the first value in the field's value list.
         """
@@ -628,6 +1795,8 @@ class SoundCheckStorageStyleMixin(object):
     indicates which half of the gain/peak pair---0 or 1---the field
     represents.
     """
+    __slots__ = ()
+
     def get(self, mutagen_file):
         data = self.fetch(mutagen_file)
         if data is not None:
@@ -647,6 +1816,8 @@ class SoundCheckStorageStyleMixin(object):
 class ASFStorageStyle(ListStorageStyle):
     """A general storage style for Windows Media/ASF files.
     """
+    __slots__ = ()
+
     formats = ['ASF']
 
     def deserialize(self, data):
@@ -658,6 +1829,8 @@ class ASFStorageStyle(ListStorageStyle):
 class MP4StorageStyle(StorageStyle):
     """A general storage style for MPEG-4 tags.
     """
+    __slots__ = ()
+
     formats = ['MP4']
 
     def serialize(self, value):
@@ -671,6 +1844,8 @@ class MP4TupleStorageStyle(MP4StorageStyle):
     """A style for storing values as part of a pair of numbers in an
     MPEG-4 file.
     """
+    __slots__ = ('index',)
+
     def __init__(self, key, index=0, **kwargs):
         super(MP4TupleStorageStyle, self).__init__(key, **kwargs)
         self.index = index
@@ -704,10 +1879,14 @@ class MP4TupleStorageStyle(MP4StorageStyle):
 
 
 class MP4ListStorageStyle(ListStorageStyle, MP4StorageStyle):
+    __slots__ = ()
+
     pass
 
 
 class MP4SoundCheckStorageStyle(SoundCheckStorageStyleMixin, MP4StorageStyle):
+    __slots__ = ('index',)
+
     def __init__(self, key, index=0, **kwargs):
         super(MP4SoundCheckStorageStyle, self).__init__(key, **kwargs)
         self.index = index
@@ -717,6 +1896,8 @@ class MP4BoolStorageStyle(MP4StorageStyle):
     """A style for booleans in MPEG-4 files. (MPEG-4 has an atom type
     specifically for representing booleans.)
     """
+    __slots__ = ()
+
     def get(self, mutagen_file):
         try:
             return mutagen_file[self.key]
@@ -736,6 +1917,8 @@ class MP4BoolStorageStyle(MP4StorageStyle):
 class MP4ImageStorageStyle(MP4ListStorageStyle):
     """Store images as MPEG-4 image atoms. Values are `Image` objects.
     """
+    __slots__ = ()
+
     def __init__(self, **kwargs):
         super(MP4ImageStorageStyle, self).__init__(key='covr', **kwargs)
 
@@ -755,6 +1938,8 @@ class MP4ImageStorageStyle(MP4ListStorageStyle):
 class MP3StorageStyle(StorageStyle):
     """Store data in ID3 frames.
     """
+    __slots__ = ('id3_lang',)
+
     formats = ['MP3', 'AIFF', 'DSF', 'WAVE']
 
     def __init__(self, key, id3_lang=None, **kwargs):
@@ -778,21 +1963,21 @@ class MP3StorageStyle(StorageStyle):
 class MP3PeopleStorageStyle(MP3StorageStyle):
     """Store list of people in ID3 frames.
     """
+    __slots__ = ('involvement',)
+
     def __init__(self, key, involvement='', **kwargs):
         self.involvement = involvement
         super(MP3PeopleStorageStyle, self).__init__(key, **kwargs)
 
     def store(self, mutagen_file, value):
-        frames = mutagen_file.tags.getall(self.key)
+        pairs = _people_pairs(mutagen_file.tags, self.key, self.involvement)
 
         # Try modifying in place.
         found = False
-        for frame in frames:
+        for frame, pair in pairs:
             if frame.encoding == mutagen.id3.Encoding.UTF8:
-                for pair in frame.people:
-                    if pair[0].lower() == self.involvement.lower():
-                        pair[1] = value
-                        found = True
+                pair[1] = value
+                found = True
 
         # Try creating a new frame.
         if not found:
@@ -801,20 +1986,25 @@ class MP3PeopleStorageStyle(MP3StorageStyle):
                 people=[[self.involvement, value]]
             )
             mutagen_file.tags.add(frame)
+            _ID3Index.added(mutagen_file.tags, frame)
 
     def fetch(self, mutagen_file):
-        for frame in mutagen_file.tags.getall(self.key):
-            for pair in frame.people:
-                if pair[0].lower() == self.involvement.lower():
-                    try:
-                        return pair[1]
-                    except IndexError:
-                        return None
+        for frame, pair in _people_pairs(mutagen_file.tags, self.key,
+                                         self.involvement):
+            try:
+                return pair[1]
+            except IndexError:
+                return None
+
+    def location(self):
+        return (self.key, self.involvement.lower())
 
 
 class MP3ListStorageStyle(ListStorageStyle, MP3StorageStyle):
     """Store lists of data in multiple ID3 frames.
     """
+    __slots__ = ()
+
     def fetch(self, mutagen_file):
         try:
             return mutagen_file[self.key].text
@@ -829,6 +2019,8 @@ class MP3ListStorageStyle(ListStorageStyle, MP3StorageStyle):
 class MP3UFIDStorageStyle(MP3StorageStyle):
     """Store string data in a UFID ID3 frame with a particular owner.
     """
+    __slots__ = ('owner',)
+
     def __init__(self, owner, **kwargs):
         self.owner = owner
         super(MP3UFIDStorageStyle, self).__init__('UFID:' + owner, **kwargs)
@@ -863,6 +2055,8 @@ class MP3DescStorageStyle(MP3StorageStyle):
     ``multispec`` specifies if frame data is ``mutagen.id3.MultiSpec``
     which means that the data is being packed in the list.
     """
+    __slots__ = ('description', 'attr', 'multispec')
+
     def __init__(self, desc=u'', key='TXXX', attr='text', multispec=True,
                  **kwargs):
         assert isinstance(desc, str)
@@ -872,17 +2066,16 @@ class MP3DescStorageStyle(MP3StorageStyle):
         super(MP3DescStorageStyle, self).__init__(key=key, **kwargs)
 
     def store(self, mutagen_file, value):
-        frames = mutagen_file.tags.getall(self.key)
+        frames = _desc_frames(mutagen_file.tags, self.key, self.description)
         if self.multispec:
             value = [value]
 
         # Try modifying in place.
         found = False
         for frame in frames:
-            if frame.desc.lower() == self.description.lower():
-                setattr(frame, self.attr, value)
-                frame.encoding = mutagen.id3.Encoding.UTF8
-                found = True
+            setattr(frame, self.attr, value)
+            frame.encoding = mutagen.id3.Encoding.UTF8
+            found = True
 
         # Try creating a new frame.
         if not found:
@@ -894,28 +2087,32 @@ class MP3DescStorageStyle(MP3StorageStyle):
             if self.id3_lang:
                 frame.lang = self.id3_lang
             mutagen_file.tags.add(frame)
+            _ID3Index.added(mutagen_file.tags, frame)
 
     def fetch(self, mutagen_file):
-        for frame in mutagen_file.tags.getall(self.key):
-            if frame.desc.lower() == self.description.lower():
-                if not self.multispec:
-                    return getattr(frame, self.attr)
-                try:
-                    return getattr(frame, self.attr)[0]
-                except IndexError:
-                    return None
+        for frame in _desc_frames(mutagen_file.tags, self.key,
+                                  self.description):
+            if not self.multispec:
+                return getattr(frame, self.attr)
+            try:
+                return getattr(frame, self.attr)[0]
+            except IndexError:
+                return None
 
     def delete(self, mutagen_file):
-        found_frame = None
-        for frame in mutagen_file.tags.getall(self.key):
-            if frame.desc.lower() == self.description.lower():
-                found_frame = frame
-                break
-        if found_frame is not None:
+        for frame in _desc_frames(mutagen_file.tags, self.key,
+                                  self.description):
             del mutagen_file[frame.HashKey]
+            _ID3Index.removed(mutagen_file.tags, frame)
+            break
+
+    def location(self):
+        return (self.key, self.description.lower())
 
 
 class MP3ListDescStorageStyle(MP3DescStorageStyle, ListStorageStyle):
+    __slots__ = ('split_v23',)
+
     def __init__(self, desc=u'', key='TXXX', split_v23=False, **kwargs):
         self.split_v23 = split_v23
         super(MP3ListDescStorageStyle, self).__init__(
@@ -923,12 +2120,12 @@ class MP3ListDescStorageStyle(MP3DescStorageStyle, ListStorageStyle):
         )
 
     def fetch(self, mutagen_file):
-        for frame in mutagen_file.tags.getall(self.key):
-            if frame.desc.lower() == self.description.lower():
-                if mutagen_file.tags.version == (2, 3, 0) and self.split_v23:
-                    return sum((el.split('/') for el in frame.text), [])
-                else:
-                    return frame.text
+        for frame in _desc_frames(mutagen_file.tags, self.key,
+                                  self.description):
+            if mutagen_file.tags.version == (2, 3, 0) and self.split_v23:
+                return sum((el.split('/') for el in frame.text), [])
+            else:
+                return frame.text
         return []
 
     def store(self, mutagen_file, values):
@@ -941,12 +2138,15 @@ class MP3ListDescStorageStyle(MP3DescStorageStyle, ListStorageStyle):
         if self.id3_lang:
             frame.lang = self.id3_lang
         mutagen_file.tags.add(frame)
+        _ID3Index.added(mutagen_file.tags, frame)
 
 
 class MP3SlashPackStorageStyle(MP3StorageStyle):
     """Store value as part of pair that is serialized as a slash-
     separated string.
     """
+    __slots__ = ('pack_pos',)
+
     def __init__(self, key, pack_pos=0, **kwargs):
         super(MP3SlashPackStorageStyle, self).__init__(key, **kwargs)
         self.pack_pos = pack_pos
@@ -986,6 +2186,8 @@ class MP3ImageStorageStyle(ListStorageStyle, MP3StorageStyle):
     list of ``Image``s. Similarly, the `set_list` method accepts a
     list of ``Image``s as its ``values`` argument.
     """
+    __slots__ = ()
+
     def __init__(self):
         super(MP3ImageStorageStyle, self).__init__(key='APIC')
         self.as_type = bytes
@@ -1009,7 +2211,8 @@ class MP3ImageStorageStyle(ListStorageStyle, MP3StorageStyle):
         """
         assert isinstance(image, Image)
         frame = mutagen.id3.Frames[self.key]()
-        frame.data = image.data
+        # Mutagen only accepts `bytes` (which this does not copy).
+        frame.data = bytes(image.data)
         frame.mime = image.mime_type
         frame.desc = image.desc or u''
 
@@ -1028,6 +2231,8 @@ class MP3ImageStorageStyle(ListStorageStyle, MP3StorageStyle):
 
 class MP3SoundCheckStorageStyle(SoundCheckStorageStyleMixin,
                                 MP3DescStorageStyle):
+    __slots__ = ('index',)
+
     def __init__(self, index=0, **kwargs):
         super(MP3SoundCheckStorageStyle, self).__init__(**kwargs)
         self.index = index
@@ -1037,14 +2242,21 @@ class ASFImageStorageStyle(ListStorageStyle):
     """Store images packed into Windows Media/ASF byte array attributes.
     Values are `Image` objects.
     """
+    __slots__ = ()
+
     formats = ['ASF']
 
     def __init__(self):
         super(ASFImageStorageStyle, self).__init__(key='WM/Picture')
 
     def deserialize(self, asf_picture):
-        mime, data, type, desc = _unpack_asf_image(asf_picture.value)
-        return Image(data, desc=desc, type=type)
+        value = asf_picture.value
+        mime, type, desc, pos, size = _unpack_asf_image_header(value)
+        return Image.lazy(
+            lambda: value[pos:pos + size], desc=desc, type=type,
+            size=min(size, len(value) - pos),
+            peek=lambda n: memoryview(value)[pos:pos + min(n, size)],
+        )
 
     def serialize(self, image):
         pic = mutagen.asf.ASFByteArrayAttribute()
@@ -1059,6 +2271,8 @@ class VorbisImageStorageStyle(ListStorageStyle):
     modern METADATA_BLOCK_PICTURE tags are supported. Data is
     base64-encoded. Values are `Image` objects.
     """
+    __slots__ = ()
+
     formats = ['OggOpus', 'OggTheora', 'OggSpeex', 'OggVorbis',
                'OggFlac']
 
@@ -1074,17 +2288,26 @@ class VorbisImageStorageStyle(ListStorageStyle):
             # Try legacy COVERART tags.
             if 'coverart' in mutagen_file:
                 for data in mutagen_file['coverart']:
-                    images.append(Image(base64.b64decode(data)))
+                    images.append(Image.lazy(
+                        functools.partial(binascii.a2b_base64, data)))
             return images
         for data in mutagen_file["metadata_block_picture"]:
+            # Only decode the picture's header here; the (large) image
+            # data is decoded when it is used.
             try:
-                pic = mutagen.flac.Picture(base64.b64decode(data))
-            except (TypeError, AttributeError):
+                type, mime, desc, pos, length = _unpack_picture_header(data)
+            except (TypeError, ValueError, struct.error):
                 continue
-            images.append(Image(data=pic.data, desc=pic.desc,
-                                type=pic.type))
+            images.append(Image.lazy(
+                functools.partial(_load_picture, data, pos, length),
+                desc=desc, type=type, size=length,
+                peek=functools.partial(_peek_picture, data, pos, length),
+            ))
         return images
 
+    def outdated(self, mutagen_file):
+        return 'coverart' in mutagen_file
+
     def store(self, mutagen_file, image_data):
         # Strip all art, including legacy COVERART.
         if 'coverart' in mutagen_file:
@@ -1096,21 +2319,15 @@ class VorbisImageStorageStyle(ListStorageStyle):
     def serialize(self, image):
         """Turn a Image into a base64 encoded FLAC picture block.
         """
-        pic = mutagen.flac.Picture()
-        pic.data = image.data
-        pic.type = image.type_index
-        pic.mime = image.mime_type
-        pic.desc = image.desc or u''
-
-        # Encoding with base64 returns bytes on both Python 2 and 3.
-        # Mutagen requires the data to be a Unicode string, so we decode
-        # it before passing it along.
-        return base64.b64encode(pic.write()).decode('ascii')
+        # Mutagen requires the data to be a Unicode string.
+        return _pack_picture(image)
 
 
 class FlacImageStorageStyle(ListStorageStyle):
     """Converts between ``mutagen.flac.Picture`` and ``Image`` instances.
     """
+    __slots__ = ()
+
     formats = ['FLAC']
 
     def __init__(self):
@@ -1149,6 +2366,8 @@ class FlacImageStorageStyle(ListStorageStyle):
 class APEv2ImageStorageStyle(ListStorageStyle):
     """Store images in APEv2 tags. Values are `Image` objects.
     """
+    __slots__ = ()
+
     formats = ['APEv2File', 'WavPack', 'Musepack', 'MonkeysAudio', 'OptimFROG']
 
     TAG_NAMES = {
@@ -1189,14 +2408,27 @@ class APEv2ImageStorageStyle(ListStorageStyle):
                     comment = comment.decode('utf-8', 'replace')
                 else:
                     comment = None
-                image_data = frame.value[text_delimiter_index + 1:]
-                images.append(Image(data=image_data, type=cover_type,
-                                    desc=comment))
+                start = text_delimiter_index + 1
+                images.append(Image.lazy(
+                    self._image_loader(frame.value, start), type=cover_type,
+                    desc=comment, size=len(frame.value) - start,
+                    peek=self._image_peek(frame.value, start)))
             except KeyError:
                 pass
 
         return images
 
+    @staticmethod
+    def _image_loader(value, start):
+        """Get a function slicing the image data out of a tag value when
+        it is used.
+        """
+        return lambda: value[start:]
+
+    @staticmethod
+    def _image_peek(value, start):
+        return lambda n: memoryview(value)[start:start + n]
+
     def set_list(self, mutagen_file, values):
         self.delete(mutagen_file)
 
@@ -1217,6 +2449,189 @@ class APEv2ImageStorageStyle(ListStorageStyle):
                 pass
 
 
+class _FieldCache(object):
+    """Memoized field values for a `MediaFile`.
+
+    Each entry remembers the storage locations (see
+    `StorageStyle.location`) the value was read from, so a write can
+    drop exactly the entries that depend on the data it changes.
+    """
+    def __init__(self):
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, locations, compute):
+        """Get the value for `key`, calling `compute` to produce it if
+        it is not cached.
+        """
+        try:
+            value = self.entries[key][0]
+        except KeyError:
+            self.misses += 1
+            value = compute()
+            self.entries[key] = (value, locations | {key})
+        else:
+            self.hits += 1
+        return value
+
+    def invalidate(self, locations):
+        """Drop the entries that depend on any of `locations`.
+        """
+        stale = [key for key, (_, used) in self.entries.items()
+                 if not used.isdisjoint(locations)]
+        for key in stale:
+            del self.entries[key]
+
+    def clear(self):
+        self.entries.clear()
+
+
+class CacheInfo(collections.namedtuple('CacheInfo',
+                                       ['hits', 'misses', 'currsize'])):
+    """Statistics about the field cache of a `MediaFile`, as returned by
+    :meth:`MediaFile.cache_info`.
+    """
+    __slots__ = ()
+
+
+# Profiling the field accesses.
+
+# The enabled `FieldProfile`, if any.
+_field_profile = None
+
+
+class FieldTiming(collections.namedtuple('FieldTiming', [
+    'field', 'format', 'operation', 'count', 'total', 'mean', 'p50', 'p90',
+    'p99', 'max',
+])):
+    """Statistics about the accesses to a field, as returned by
+    :meth:`FieldProfile.timings`: the name of the `field`, the name of the
+    Mutagen file type (`format`), the `operation` (``'get'``, ``'set'``
+    or ``'delete'``), the `count` of accesses, and their `total`, `mean`,
+    percentile and `max` times in seconds.
+    """
+    __slots__ = ()
+
+
+def _profiled(method, operation):
+    """Wrap a descriptor method of `MediaField` to time it into the
+    enabled `FieldProfile`.
+    """
+    @functools.wraps(method)
+    def wrapper(field, mediafile, *args):
+        if mediafile is None:
+            # Access through the class.
+            return method(field, mediafile, *args)
+        start = time.perf_counter()
+        try:
+            return method(field, mediafile, *args)
+        finally:
+            _field_profile.add(field.name, type(mediafile.mgfile).__name__,
+                               operation, time.perf_counter() - start)
+    return wrapper
+
+
+class FieldProfile(object):
+    """Timings of the reads, writes and deletions of the fields of all
+    `MediaFile` objects, by field name and Mutagen file type.
+
+    Enable a profile with :meth:`enable` or by using it as a context
+    manager. Only one profile can be enabled at a time. The fields are
+    instrumented only while it is enabled, so profiling costs nothing
+    otherwise.
+
+    Every access is kept, in 8 bytes, so that the percentiles are exact.
+    """
+    _methods = (('__get__', 'get'), ('__set__', 'set'),
+                ('__delete__', 'delete'))
+
+    def __init__(self):
+        self.samples = collections.defaultdict(lambda: array.array('d'))
+
+    def enable(self):
+        """Start timing the field accesses into this profile."""
+        global _field_profile
+        if _field_profile is not None:
+            raise RuntimeError(u'a field profile is already enabled')
+        for method, operation in self._methods:
+            setattr(MediaField, method,
+                    _profiled(MediaField.__dict__[method], operation))
+        _field_profile = self
+
+    def disable(self):
+        """Stop timing the field accesses."""
+        global _field_profile
+        if _field_profile is self:
+            for method, _ in self._methods:
+                setattr(MediaField, method,
+                        MediaField.__dict__[method].__wrapped__)
+            _field_profile = None
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.disable()
+
+    def add(self, field, format, operation, duration):
+        """Record an access to a field that took `duration` seconds."""
+        self.samples[field, format, operation].append(duration)
+
+    def clear(self):
+        """Forget all the recorded accesses."""
+        self.samples.clear()
+
+    def timings(self):
+        """Get a :class:`FieldTiming` for each field, format and
+        operation seen, the most expensive in total first.
+        """
+        timings = []
+        for (field, format, operation), samples in self.samples.items():
+            ordered = sorted(samples)
+            count = len(ordered)
+            total = math.fsum(ordered)
+
+            def percentile(p):
+                return ordered[max(int(math.ceil(p * count)) - 1, 0)]
+            timings.append(FieldTiming(
+                field, format, operation, count, total, total / count,
+                percentile(0.5), percentile(0.9), percentile(0.99),
+                ordered[-1],
+            ))
+        timings.sort(key=lambda timing: timing.total, reverse=True)
+        return timings
+
+    def dump(self, out=None, as_json=False):
+        """Write the timings to the file `out` (standard output by
+        default) as a table, with times in microseconds, or as a JSON
+        array of objects, with times in seconds.
+        """
+        out = out or sys.stdout
+        timings = self.timings()
+        if as_json:
+            import json
+            json.dump([timing._asdict() for timing in timings], out,
+                      indent=2)
+            out.write(u'\n')
+            return
+
+        def fmt(value):
+            if isinstance(value, float):
+                return u'{0:.2f}'.format(value * 1e6)
+            return str(value)
+
+        rows = [FieldTiming._fields]
+        rows.extend([fmt(value) for value in timing] for timing in timings)
+        widths = [max(len(row[i]) for row in rows)
+                  for i in range(len(FieldTiming._fields))]
+        for row in rows:
+            line = u'  '.join(value.ljust(width)
+                              for value, width in zip(row, widths))
+            out.write(line.rstrip() + u'\n')
+
+
 # MediaField is a descriptor that represents a single logical field. It
 # aggregates several StorageStyles describing how to access the data for
 # each file type.
@@ -1224,7 +2639,14 @@ class APEv2ImageStorageStyle(ListStorageStyle):
 class MediaField(object):
     """A descriptor providing access to a particular (abstract) metadata
     field.
+
+    Subclasses implement the access in ``_get``, ``_set`` and
+    ``_delete``; the descriptor methods add the caching of values for
+    `MediaFile` objects that enable it.
     """
+    __slots__ = ('out_type', '_styles', '_format_styles', '_format_locations',
+                 'name')
+
     def __init__(self, *styles, **kwargs):
         """Creates a new MediaField.
 
@@ -1239,16 +2661,85 @@ class MediaField(object):
         """
         self.out_type = kwargs.get('out_type', str)
         self._styles = styles
+        self._format_styles = {}
+        self._format_locations = {}
+        # The name of the property the field is accessed through, once
+        # it is attached to a class.
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
 
     def styles(self, mutagen_file):
-        """Yields the list of storage styles of this field that can
+        """Get the sequence of storage styles of this field that can
         handle the MediaFile's format.
+
+        The applicable styles are looked up once for each Mutagen file
+        class and then reused for every access.
+        """
+        kind = mutagen_file.__class__
+        try:
+            return self._format_styles[kind]
+        except KeyError:
+            styles = tuple(style for style in self._styles
+                           if kind.__name__ in style.formats)
+            self._format_styles[kind] = styles
+            return styles
+
+    def locations(self, mediafile):
+        """Get the set of storage locations this field reads for the
+        MediaFile's format. Fields that share a location depend on each
+        other's values.
         """
-        for style in self._styles:
-            if mutagen_file.__class__.__name__ in style.formats:
-                yield style
+        kind = mediafile.mgfile.__class__
+        try:
+            return self._format_locations[kind]
+        except KeyError:
+            locations = frozenset(style.location()
+                                  for style in self.styles(mediafile.mgfile))
+            self._format_locations[kind] = locations
+            return locations
 
     def __get__(self, mediafile, owner=None):
+        if mediafile is None:
+            return self
+        cache = mediafile._field_cache
+        if cache is None:
+            return self._get(mediafile)
+        value = cache.get(self, self.locations(mediafile),
+                          lambda: self._get(mediafile))
+        if isinstance(value, list):
+            # Callers may modify the list they get.
+            value = list(value)
+        return value
+
+    def __set__(self, mediafile, value):
+        if value is not None and self._holds(mediafile, value):
+            # Nothing would change: the field is not written (or marked
+            # as modified).
+            return
+        try:
+            self._set(mediafile, value)
+        finally:
+            self._changed(mediafile)
+
+    def __delete__(self, mediafile):
+        try:
+            self._delete(mediafile)
+        finally:
+            self._changed(mediafile)
+
+    def _changed(self, mediafile):
+        """Mark the field as modified and drop the cached values that
+        depend on it. This happens after writing since the write itself
+        may read (and cache) values.
+        """
+        mediafile._dirty.add(self.name)
+        cache = mediafile._field_cache
+        if cache is not None:
+            cache.invalidate(self.locations(mediafile) | {self})
+
+    def _get(self, mediafile):
         out = None
         for style in self.styles(mediafile.mgfile):
             out = style.get(mediafile.mgfile)
@@ -1256,17 +2747,24 @@ class MediaField(object):
                 break
         return _safe_cast(self.out_type, out)
 
-    def __set__(self, mediafile, value):
+    def _set(self, mediafile, value):
         if value is None:
             value = self._none_value()
         for style in self.styles(mediafile.mgfile):
             if not style.read_only:
                 style.set(mediafile.mgfile, value)
 
-    def __delete__(self, mediafile):
+    def _delete(self, mediafile):
         for style in self.styles(mediafile.mgfile):
             style.delete(mediafile.mgfile)
 
+    def _holds(self, mediafile, value):
+        """Check whether the field already has the (non-None) value,
+        converted the way the getter converts stored values, so that
+        setting it would not change anything.
+        """
+        return _safe_cast(self.out_type, value) == self.__get__(mediafile)
+
     def _none_value(self):
         """Get an appropriate "null" value for this field's type. This
         is used internally when setting the field to None.
@@ -1288,18 +2786,24 @@ class ListMediaField(MediaField):
     Uses ``get_list`` and set_list`` methods of its ``StorageStyle``
     strategies to do the actual work.
     """
-    def __get__(self, mediafile, _=None):
+    __slots__ = ()
+
+    def _get(self, mediafile):
         for style in self.styles(mediafile.mgfile):
             values = style.get_list(mediafile.mgfile)
             if values:
-                return [_safe_cast(self.out_type, value) for value in values]
+                return cast_many(self.out_type, values)
         return None
 
-    def __set__(self, mediafile, values):
+    def _set(self, mediafile, values):
         for style in self.styles(mediafile.mgfile):
             if not style.read_only:
                 style.set_list(mediafile.mgfile, values)
 
+    def _holds(self, mediafile, values):
+        values = cast_many(self.out_type, values)
+        return (values or None) == self.__get__(mediafile)
+
     def single_field(self):
         """Returns a ``MediaField`` descriptor that gets and sets the
         first item.
@@ -1308,6 +2812,11 @@ class ListMediaField(MediaField):
         return MediaField(*self._styles, **options)
 
 
+# The time after a date, and the separators between its items.
+_DATE_TIME = re.compile(r'[Tt ].*$')
+_DATE_SEPARATOR = re.compile('[-/]')
+
+
 class DateField(MediaField):
     """Descriptor that handles serializing and deserializing dates
 
@@ -1317,6 +2826,8 @@ class DateField(MediaField):
     For granular access to year, month, and day, use the ``*_field``
     methods to create corresponding `DateItemField`s.
     """
+    __slots__ = ('_year_field',)
+
     def __init__(self, *date_styles, **kwargs):
         """``date_styles`` is a list of ``StorageStyle``s to store and
         retrieve the whole date from. The ``year`` option is an
@@ -1329,7 +2840,13 @@ class DateField(MediaField):
         if year_style:
             self._year_field = MediaField(*year_style)
 
-    def __get__(self, mediafile, owner=None):
+    def locations(self, mediafile):
+        locations = super(DateField, self).locations(mediafile)
+        if hasattr(self, '_year_field'):
+            locations |= self._year_field.locations(mediafile)
+        return locations
+
+    def _get(self, mediafile):
         year, month, day = self._get_date_tuple(mediafile)
         if not year:
             return None
@@ -1342,27 +2859,41 @@ class DateField(MediaField):
         except ValueError:  # Out of range values.
             return None
 
-    def __set__(self, mediafile, date):
+    def _set(self, mediafile, date):
         if date is None:
             self._set_date_tuple(mediafile, None, None, None)
         else:
             self._set_date_tuple(mediafile, date.year, date.month, date.day)
 
-    def __delete__(self, mediafile):
-        super(DateField, self).__delete__(mediafile)
+    def _holds(self, mediafile, date):
+        # Compare with the stored items: the getter fills a missing
+        # month or day with 1, which writing the date would store.
+        return [date.year, date.month, date.day] == \
+            self._get_date_tuple(mediafile)
+
+    def _delete(self, mediafile):
+        super(DateField, self)._delete(mediafile)
         if hasattr(self, '_year_field'):
-            self._year_field.__delete__(mediafile)
+            self._year_field._delete(mediafile)
 
     def _get_date_tuple(self, mediafile):
         """Get a 3-item sequence representing the date consisting of a
         year, month, and day number. Each number is either an integer or
         None.
         """
+        cache = mediafile._field_cache
+        if cache is None:
+            return self._parse_date_tuple(mediafile)
+        # The parsed date is shared by the date field and its items.
+        return list(cache.get((self, 'tuple'), self.locations(mediafile),
+                              lambda: self._parse_date_tuple(mediafile)))
+
+    def _parse_date_tuple(self, mediafile):
         # Get the underlying data and split on hyphens and slashes.
-        datestring = super(DateField, self).__get__(mediafile, None)
+        datestring = super(DateField, self)._get(mediafile)
         if isinstance(datestring, str):
-            datestring = re.sub(r'[Tt ].*$', '', str(datestring))
-            items = re.split('[-/]', str(datestring))
+            datestring = _DATE_TIME.sub('', datestring)
+            items = _DATE_SEPARATOR.split(datestring)
         else:
             items = []
 
@@ -1374,7 +2905,7 @@ class DateField(MediaField):
 
         # Use year field if year is missing.
         if not items[0] and hasattr(self, '_year_field'):
-            items[0] = self._year_field.__get__(mediafile)
+            items[0] = self._year_field._get(mediafile)
 
         # Convert each component to an integer if possible.
         items_ = []
@@ -1391,7 +2922,7 @@ class DateField(MediaField):
         unset component.
         """
         if year is None:
-            self.__delete__(mediafile)
+            self._delete(mediafile)
             return
 
         date = [u'{0:04d}'.format(int(year))]
@@ -1400,10 +2931,10 @@ class DateField(MediaField):
         if month and day:
             date.append(u'{0:02d}'.format(int(day)))
         date = map(str, date)
-        super(DateField, self).__set__(mediafile, u'-'.join(date))
+        super(DateField, self)._set(mediafile, u'-'.join(date))
 
         if hasattr(self, '_year_field'):
-            self._year_field.__set__(mediafile, year)
+            self._year_field._set(mediafile, year)
 
     def year_field(self):
         return DateItemField(self, 0)
@@ -1419,20 +2950,29 @@ class DateItemField(MediaField):
     """Descriptor that gets and sets constituent parts of a `DateField`:
     the month, day, or year.
     """
+    __slots__ = ('date_field', 'item_pos')
+
     def __init__(self, date_field, item_pos):
+        super(DateItemField, self).__init__()
         self.date_field = date_field
         self.item_pos = item_pos
 
-    def __get__(self, mediafile, _):
+    def locations(self, mediafile):
+        return self.date_field.locations(mediafile)
+
+    def _get(self, mediafile):
         return self.date_field._get_date_tuple(mediafile)[self.item_pos]
 
-    def __set__(self, mediafile, value):
+    def _set(self, mediafile, value):
         items = self.date_field._get_date_tuple(mediafile)
         items[self.item_pos] = value
         self.date_field._set_date_tuple(mediafile, *items)
 
-    def __delete__(self, mediafile):
-        self.__set__(mediafile, None)
+    def _holds(self, mediafile, value):
+        return _safe_cast(int, value) == self.__get__(mediafile)
+
+    def _delete(self, mediafile):
+        self._set(mediafile, None)
 
 
 class CoverArtField(MediaField):
@@ -1443,10 +2983,15 @@ class CoverArtField(MediaField):
     When there are multiple images we try to pick the most likely to be a front
     cover.
     """
+    __slots__ = ()
+
     def __init__(self):
-        pass
+        super(CoverArtField, self).__init__()
 
-    def __get__(self, mediafile, _):
+    def locations(self, mediafile):
+        return type(mediafile).images.locations(mediafile)
+
+    def _get(self, mediafile):
         candidates = mediafile.images
         if candidates:
             return self.guess_cover_image(candidates).data
@@ -1462,13 +3007,18 @@ class CoverArtField(MediaField):
         except StopIteration:
             return candidates[0]
 
-    def __set__(self, mediafile, data):
+    def _set(self, mediafile, data):
         if data:
             mediafile.images = [Image(data=data)]
         else:
             mediafile.images = []
 
-    def __delete__(self, mediafile):
+    def _holds(self, mediafile, data):
+        images = type(mediafile).images
+        return (data or None) == self.__get__(mediafile) and \
+            not images._outdated(mediafile)
+
+    def _delete(self, mediafile):
         delattr(mediafile, 'images')
 
 
@@ -1479,20 +3029,27 @@ class QNumberField(MediaField):
     `fraction_bits` binary digits to the left and then rounded, yielding a
     simple integer.
     """
+    __slots__ = ('__fraction_bits',)
+
     def __init__(self, fraction_bits, *args, **kwargs):
         super(QNumberField, self).__init__(out_type=int, *args, **kwargs)
         self.__fraction_bits = fraction_bits
 
-    def __get__(self, mediafile, owner=None):
-        q_num = super(QNumberField, self).__get__(mediafile, owner)
+    def _get(self, mediafile):
+        q_num = super(QNumberField, self)._get(mediafile)
         if q_num is None:
             return None
         return q_num / pow(2, self.__fraction_bits)
 
-    def __set__(self, mediafile, value):
+    def _set(self, mediafile, value):
         q_num = round(value * pow(2, self.__fraction_bits))
         q_num = int(q_num)  # needed for py2.7
-        super(QNumberField, self).__set__(mediafile, q_num)
+        super(QNumberField, self)._set(mediafile, q_num)
+
+    def _holds(self, mediafile, value):
+        q_num = round(value * pow(2, self.__fraction_bits))
+        return q_num / pow(2, self.__fraction_bits) == \
+            self.__get__(mediafile)
 
 
 class ImageListField(ListMediaField):
@@ -1502,6 +3059,8 @@ class ImageListField(ListMediaField):
     the tags. The setter accepts a list of `Image` instances to be
     written to the tags.
     """
+    __slots__ = ()
+
     def __init__(self):
         # The storage styles used here must implement the
         # `ListStorageStyle` interface and get and set lists of
@@ -1516,15 +3075,90 @@ class ImageListField(ListMediaField):
             out_type=Image,
         )
 
+    def _holds(self, mediafile, images):
+        # `Image` objects do not compare equal; compare what is stored.
+        # A missing description reads back as an empty string.
+        def key(image):
+            return image.data, image.desc or u'', image.type
+        current = self.__get__(mediafile) or []
+        return list(map(key, images)) == list(map(key, current)) and \
+            not self._outdated(mediafile)
+
+    def _outdated(self, mediafile):
+        return any(style.outdated(mediafile.mgfile)
+                   for style in self.styles(mediafile.mgfile))
+
 
 # MediaFile is a collection of fields.
 
+class _FieldRegistry(object):
+    """The fields of a `MediaFile` class, including those inherited,
+    found once instead of on every call to `MediaFile.fields` and the
+    like.
+
+    `fields` are the names of the fields and `descriptors` the
+    `MediaField` objects, in the same order; `sorted_fields` are
+    ``(name, descriptor)`` pairs in the order fields are written and
+    `readable_fields` also includes the audio properties.
+    """
+    __slots__ = ('generation', 'fields', 'descriptors', 'sorted_fields',
+                 'readable_fields')
+
+    # Incremented by `MediaFile.add_field` and `MediaFile.remove_field`,
+    # which makes every registry stale.
+    current = 0
+
+    # The audio properties of `MediaFile`, which are readable fields.
+    PROPERTIES = ('length', 'samplerate', 'bitdepth', 'bitrate',
+                  'bitrate_mode', 'channels', 'encoder_info',
+                  'encoder_settings', 'format')
+
+    def __init__(self, cls):
+        self.generation = _FieldRegistry.current
+        # Base classes' attributes come first, so that fields keep their
+        # place when a subclass overrides them.
+        attributes = {}
+        for base in reversed(cls.__mro__):
+            attributes.update(vars(base))
+        fields = [(name, value) for name, value in attributes.items()
+                  if isinstance(value, MediaField)]
+        self.fields = tuple(name for name, _ in fields)
+        self.descriptors = tuple(descriptor for _, descriptor in fields)
+        self.sorted_fields = tuple(
+            sorted(fields, key=lambda pair: cls._field_sort_name(pair[0]))
+        )
+        self.readable_fields = self.fields + self.PROPERTIES
+
+    @classmethod
+    def get(cls, media_class):
+        """Get the up-to-date registry of the class `media_class`.
+        """
+        registry = media_class.__dict__.get('_field_registry')
+        if registry is None or registry.generation != cls.current:
+            registry = cls(media_class)
+            media_class._field_registry = registry
+        return registry
+
+
 class MediaFile(object):
     """Represents a multimedia file on disk and provides access to its
     metadata.
     """
+    _field_cache = None
+    _filesize = None
+    _io_stats = None
+
+    io_hook = None
+    """A function called as ``io_hook(mediafile, action, stats)`` after
+    every action on a file (``'open'``, ``'load info'``, ``'save'`` or
+    ``'delete'``) with the :class:`IOStats` of that action, or None.
+    Setting it counts the I/O of all files, as with ``io_stats=True``,
+    and allows aggregating the counts, e.g., by ``mediafile.type``.
+    """
+
     @loadfile()
-    def __init__(self, filething, id3v23=False):
+    def __init__(self, filething, id3v23=False, cache=False, info=None,
+                 io_stats=False):
         """Constructs a new `MediaFile` reflecting the provided file.
 
         `filething` can be a path to a file (i.e., a string) or a
@@ -1534,46 +3168,55 @@ class MediaFile(object):
 
         By default, MP3 files are saved with ID3v2.4 tags. You can use
         the older ID3v2.3 standard by specifying the `id3v23` option.
+
+        With `cache`, field values are remembered after they are first
+        read, and writing a field only forgets the values that depend on
+        it. Changes made directly to the underlying Mutagen object are
+        not noticed; call :meth:`cache_clear` after making any.
+
+        When a path is given, only the tags are read when the file is
+        opened, where the format allows it. The audio properties
+        (`length`, `bitrate`, etc.) are then read from the file when one
+        of them is first used, which may raise `UnreadableFileError` if
+        the audio data is broken. Pass ``info=True`` to read them right
+        away instead. File objects are read in full by default, since
+        they may have been closed or moved by the time the properties
+        are used; pass ``info=False`` to defer reading them anyway (the
+        file object must then stay open and is rewound to read them).
+
+        With `io_stats` (or when :attr:`io_hook` is set), the reads,
+        writes and seeks Mutagen makes in the file are counted for each
+        action and are available as :attr:`io_stats`.
         """
         self.filething = filething
-
-        self.mgfile = mutagen_call(
-            'open', self.filename, mutagen.File, filething
+        self._dirty = set()
+        if cache:
+            self._field_cache = _FieldCache()
+        if io_stats or type(self).io_hook is not None:
+            self._io_stats = {}
+
+        if info is None:
+            # Defer the stream information only for files that we open
+            # ourselves or that are held by our own file objects.
+            info = filething.filename is None and not isinstance(
+                filething.fileobj, (_BufferFile, _RangeFile))
+
+        stats = None if self._io_stats is None else IOStats()
+        self.mgfile = _counted_call(
+            stats, 'open', self.filename,
+            _open_file if info else _open_tags, filething
         )
 
         if self.mgfile is None:
             # Mutagen couldn't guess the type
             raise FileTypeError(self.filename)
-        elif type(self.mgfile).__name__ in ['M4A', 'MP4']:
-            info = self.mgfile.info
-            if info.codec and info.codec.startswith('alac'):
-                self.type = 'alac'
-            else:
-                self.type = 'aac'
-        elif type(self.mgfile).__name__ in ['ID3', 'MP3']:
-            self.type = 'mp3'
-        elif type(self.mgfile).__name__ == 'FLAC':
-            self.type = 'flac'
-        elif type(self.mgfile).__name__ == 'OggOpus':
-            self.type = 'opus'
-        elif type(self.mgfile).__name__ == 'OggVorbis':
-            self.type = 'ogg'
-        elif type(self.mgfile).__name__ == 'MonkeysAudio':
-            self.type = 'ape'
-        elif type(self.mgfile).__name__ == 'WavPack':
-            self.type = 'wv'
-        elif type(self.mgfile).__name__ == 'Musepack':
-            self.type = 'mpc'
-        elif type(self.mgfile).__name__ == 'ASF':
-            self.type = 'asf'
-        elif type(self.mgfile).__name__ == 'AIFF':
-            self.type = 'aiff'
-        elif type(self.mgfile).__name__ == 'DSF':
-            self.type = 'dsf'
-        elif type(self.mgfile).__name__ == 'WAVE':
-            self.type = 'wav'
-        else:
+        self.type = _TYPES.get(type(self.mgfile).__name__)
+        if self.type is None:
             raise FileTypeError(self.filename, type(self.mgfile).__name__)
+        elif self.type == 'aac':
+            codec = self.mgfile.info.codec
+            if codec and codec.startswith('alac'):
+                self.type = 'alac'
 
         # Add a set of tags if it's missing.
         if self.mgfile.tags is None:
@@ -1582,6 +3225,82 @@ class MediaFile(object):
         # Set the ID3v2.3 flag only for MP3s.
         self.id3v23 = id3v23 and self.type == 'mp3'
 
+        if stats is not None:
+            self._io_record('open', stats)
+            if isinstance(self.mgfile.info, _LazyInfo):
+                self.mgfile.info._record = self._io_record
+
+    @classmethod
+    def from_buffer(cls, buf, **kwargs):
+        """Open a file held in memory.
+
+        `buf` can be a `bytearray`, which is updated in place (and
+        resized) when the file is saved, or another bytes-like object
+        such as `bytes` or an `mmap`, which is read without being copied
+        and is copied when the file is first saved. Either way, the
+        file's current contents are available as :attr:`buffer`.
+
+        The other arguments are passed on to the constructor.
+        """
+        return cls(_BufferFile(buf), **kwargs)
+
+    @classmethod
+    def from_mmap(cls, path, **kwargs):
+        """Open a local file by mapping it into memory.
+
+        The tags are then read from the memory map rather than with a
+        system call for each read. Saving changes the file in place as
+        usual and maps it again.
+
+        The other arguments are passed on to the constructor.
+        """
+        try:
+            fileobj = _MappedFile(path)
+        except (OSError, ValueError) as exc:
+            raise UnreadableFileError(path, str(exc))
+        try:
+            return cls(mutagen._util.FileThing(fileobj, path, path),
+                       **kwargs)
+        except Exception:
+            fileobj.close()
+            raise
+
+    @classmethod
+    def from_range_reader(cls, read_range, size, name=None,
+                          block_size=_RANGE_BLOCK_SIZE, **kwargs):
+        """Open a file, e.g., in object storage, by fetching just the
+        parts of it that are needed.
+
+        `read_range` is a function that takes an offset and a length and
+        returns that many bytes of the file from that offset, and `size`
+        is the size of the file. `name` is used in error messages and to
+        tell formats apart. The data is fetched in blocks of
+        `block_size` bytes, and reads of adjacent blocks are combined.
+        For most formats, reading the tags then takes a request or two
+        at the start of the file and maybe one at its end.
+
+        Files opened this way are read-only. The other arguments are
+        passed on to the constructor.
+        """
+        return cls(_RangeFile(read_range, size, name, block_size), **kwargs)
+
+    def cache_info(self):
+        """Get the hit and miss counts and the number of entries of the
+        field cache as a :class:`CacheInfo`, or None if the cache is not
+        enabled.
+        """
+        cache = self._field_cache
+        if cache is None:
+            return None
+        return CacheInfo(cache.hits, cache.misses, len(cache.entries))
+
+    def cache_clear(self):
+        """Forget all cached field values. The hit and miss counts are
+        kept.
+        """
+        if self._field_cache is not None:
+            self._field_cache.clear()
+
     @property
     def filename(self):
         """The name of the file.
@@ -1607,10 +3326,29 @@ class MediaFile(object):
         """
         return self.filething.filename
 
+    @property
+    def buffer(self):
+        """The buffer holding the contents of a file opened with
+        :meth:`from_buffer` or :meth:`from_mmap`, or None for other
+        files.
+        """
+        fileobj = self.filething.fileobj
+        if isinstance(fileobj, _BufferFile):
+            return fileobj.buffer
+        return None
+
     @property
     def filesize(self):
         """The size (in bytes) of the underlying file.
+
+        The size is looked up once and remembered until the file is
+        saved or its tags are deleted.
         """
+        if self._filesize is None:
+            self._filesize = self._get_filesize()
+        return self._filesize
+
+    def _get_filesize(self):
         if self.filething.filename:
             return os.path.getsize(self.filething.filename)
         if hasattr(self.filething.fileobj, '__len__'):
@@ -1621,12 +3359,51 @@ class MediaFile(object):
             self.filething.fileobj.seek(tell)
             return filesize
 
-    def save(self, **kwargs):
+    @property
+    def io_stats(self):
+        """The :class:`IOStats` of each action done on the file so far,
+        as a dictionary keyed by action, or None if the I/O is not being
+        counted.
+        """
+        return self._io_stats
+
+    def _io_record(self, action, stats):
+        """Add the `stats` of an action to the totals and pass them to
+        the hook.
+        """
+        if action in self._io_stats:
+            self._io_stats[action] += stats
+        else:
+            self._io_stats[action] = stats + IOStats()
+        # Look the hook up on the class so that a function is not bound
+        # as a method.
+        hook = type(self).io_hook
+        if hook is not None:
+            hook(self, action, stats)
+
+    @property
+    def dirty_fields(self):
+        """The names of the fields that have been written since the file
+        was opened or last saved, as a frozenset. Setting a field to the
+        value it already has does not write it.
+        """
+        return frozenset(self._dirty)
+
+    def save(self, force=False, **kwargs):
         """Write the object's tags back to the file.
 
+        Nothing is written if no field has been changed since the file
+        was opened or last saved. Changes made directly to the
+        underlying Mutagen object are not noticed; pass ``force=True``
+        to save regardless (e.g., to convert unchanged ID3 tags to
+        ID3v2.3).
+
         May throw `UnreadableFileError`. Accepts keyword arguments to be
         passed to Mutagen's `save` function.
         """
+        if not (self._dirty or force):
+            return
+
         # Possibly save the tags to ID3v2.3.
         if self.id3v23:
             id3 = self.mgfile
@@ -1634,17 +3411,47 @@ class MediaFile(object):
                 # In case this is an MP3 object, not an ID3 object.
                 id3 = id3.tags
             id3.update_to_v23()
+            _ID3Index.invalidate(id3)
+            self.cache_clear()
             kwargs['v2_version'] = 3
 
-        mutagen_call('save', self.filename, self.mgfile.save,
-                     _update_filething(self.filething), **kwargs)
+        self._write('save', self.mgfile.save, **kwargs)
+        self._dirty.clear()
 
     def delete(self):
         """Remove the current metadata tag from the file. May
         throw `UnreadableFileError`.
         """
-        mutagen_call('delete', self.filename, self.mgfile.delete,
-                     _update_filething(self.filething))
+        self._write('delete', self.mgfile.delete)
+        self._dirty.clear()
+        self.cache_clear()
+
+    def _write(self, action, func, **kwargs):
+        """Call the Mutagen function `func` that writes to the file.
+        """
+        fileobj = self.filething.fileobj
+        if isinstance(fileobj, _RangeFile):
+            raise UnreadableFileError(self.filename, u'file is read-only')
+        if isinstance(self.mgfile.info, _LazyInfo):
+            # The stream information is found from the positions of the
+            # tags, which the write is about to move.
+            self.mgfile.info._resolve()
+        mapped = isinstance(fileobj, _MappedFile)
+        if mapped:
+            # Don't keep the file mapped while its size changes.
+            fileobj.unmap()
+        stats = None if self._io_stats is None else IOStats()
+        try:
+            filething = mutagen_call(action, self.filename,
+                                     _update_filething, self.filething)
+            _counted_call(stats, action, self.filename, func, filething,
+                          writable=True, **kwargs)
+        finally:
+            if mapped:
+                fileobj.remap()
+            self._filesize = None
+        if stats is not None:
+            self._io_record(action, stats)
 
     # Convenient access to the set of available fields.
 
@@ -1652,16 +3459,9 @@ class MediaFile(object):
     def fields(cls):
         """Get the names of all writable properties that reflect
         metadata tags (i.e., those that are instances of
-        :class:`MediaField`).
+        :class:`MediaField`), including those of the base classes.
         """
-        for property, descriptor in cls.__dict__.items():
-            if isinstance(descriptor, MediaField):
-                if isinstance(property, bytes):
-                    # On Python 2, class field names are bytes. This method
-                    # produces text strings.
-                    yield property.decode('utf8', 'ignore')
-                else:
-                    yield property
+        return iter(_FieldRegistry.get(cls).fields)
 
     @classmethod
     def _field_sort_name(cls, name):
@@ -1673,10 +3473,10 @@ class MediaFile(object):
         are replaced by `date0`, `date1`, and `date2`, respectively, to
         make them appear in that order.
         """
-        if isinstance(cls.__dict__[name], DateItemField):
-            name = re.sub('year',  'date0', name)
-            name = re.sub('month', 'date1', name)
-            name = re.sub('day',   'date2', name)
+        if isinstance(getattr(cls, name), DateItemField):
+            name = name.replace('year', 'date0')
+            name = name.replace('month', 'date1')
+            name = name.replace('day', 'date2')
         return name
 
     @classmethod
@@ -1688,25 +3488,24 @@ class MediaFile(object):
         :class:`DateItemField`, which are sorted in year-month-day
         order.
         """
-        for property in sorted(cls.fields(), key=cls._field_sort_name):
-            yield property
+        return (name for name, _ in _FieldRegistry.get(cls).sorted_fields)
 
     @classmethod
     def readable_fields(cls):
         """Get all metadata fields: the writable ones from
         :meth:`fields` and also other audio properties.
         """
-        for property in cls.fields():
-            yield property
-        for property in ('length', 'samplerate', 'bitdepth', 'bitrate',
-                         'bitrate_mode', 'channels', 'encoder_info',
-                         'encoder_settings', 'format'):
-            yield property
+        return iter(_FieldRegistry.get(cls).readable_fields)
 
     @classmethod
     def add_field(cls, name, descriptor):
         """Add a field to store custom tags.
 
+        The fields of a class are found once and remembered, so fields
+        must be added with this method and removed with
+        :meth:`remove_field` rather than by setting or deleting class
+        attributes directly.
+
         :param name: the name of the property the field is accessed
                      through. It must not already exist on this class.
 
@@ -1719,6 +3518,21 @@ class MediaFile(object):
             raise ValueError(
                 u'property "{0}" already exists on MediaFile'.format(name))
         setattr(cls, name, descriptor)
+        descriptor.__set_name__(cls, name)
+        _FieldRegistry.current += 1
+
+    @classmethod
+    def remove_field(cls, name):
+        """Remove a field added with :meth:`add_field`.
+
+        :param name: the name of the field. It must be a field of this
+                     class (rather than of a base class).
+        """
+        if not isinstance(cls.__dict__.get(name), MediaField):
+            raise ValueError(
+                u'field "{0}" does not exist on MediaFile'.format(name))
+        delattr(cls, name)
+        _FieldRegistry.current += 1
 
     def update(self, dict):
         """Set all field values from a dictionary.
@@ -1727,13 +3541,26 @@ class MediaFile(object):
         method retrieves the corresponding value from `dict` and updates
         the `MediaFile`. If a key has the value `None`, the
         corresponding property is deleted from the `MediaFile`.
+
+        Fields that already have the value (as read back from the file)
+        are left alone. Returns the set of the names of the fields that
+        were actually written.
         """
-        for field in self.sorted_fields():
-            if field in dict:
-                if dict[field] is None:
-                    delattr(self, field)
-                else:
-                    setattr(self, field, dict[field])
+        changed = set()
+        for field, descriptor in _FieldRegistry.get(type(self)).sorted_fields:
+            if field not in dict:
+                continue
+            value = dict[field]
+            if value is None:
+                if descriptor.__get__(self) is None:
+                    continue
+                delattr(self, field)
+            else:
+                if descriptor._holds(self, value):
+                    continue
+                setattr(self, field, value)
+            changed.add(field)
+        return changed
 
     def as_dict(self):
         """Get a dictionary with all writable properties that reflect
@@ -1742,6 +3569,39 @@ class MediaFile(object):
         """
         return dict((x, getattr(self, x)) for x in self.fields())
 
+    def images_info(self):
+        """Get a list of `ImageInfo` records describing the embedded
+        images, in the order of :attr:`images`.
+
+        This is cheaper than reading the images themselves: where the
+        format allows it, only the beginning of each image's data is
+        decoded.
+        """
+        return [image.info() for image in self.images or ()]
+
+    def read_all(self, fields=None):
+        """Get a dictionary with the values of many fields at once.
+
+        `fields` is an iterable of field names and defaults to all the
+        fields from :meth:`fields`, so that the result is the same as
+        that of :meth:`as_dict`. This is faster than reading the fields
+        one by one: the tags are indexed in a single pass and each
+        field is then looked up in the index instead of searching the
+        tags again.
+        """
+        if fields is None:
+            fields = self.fields()
+        view = self
+        tags = _IndexedTags.wrap(self.mgfile.tags)
+        if tags is not self.mgfile.tags:
+            # Read through shallow copies with the index in place of the
+            # tags, so that the file itself can still be written (e.g.,
+            # from another thread) while the fields are read.
+            view = copy.copy(self)
+            view.mgfile = copy.copy(self.mgfile)
+            view.mgfile.tags = tags
+        return dict((x, getattr(view, x)) for x in fields)
+
     # Field definitions.
 
     title = MediaField(
@@ -2397,3 +4257,195 @@ class MediaFile(object):
     def format(self):
         """A string describing the file format/codec."""
         return TYPES[self.type]
+
+
+# Asynchronous access.
+
+async def _run_blocking(executor, semaphore, func, *args, **kwargs):
+    """Call `func` in `executor` from a coroutine, holding `semaphore`
+    (if any) while it runs.
+    """
+    import asyncio  # Only needed by asyncio users, who have it loaded.
+
+    loop = asyncio.get_running_loop()
+    call = functools.partial(func, *args, **kwargs)
+    if semaphore is None:
+        return await loop.run_in_executor(executor, call)
+    async with semaphore:
+        return await loop.run_in_executor(executor, call)
+
+
+def _opened(mediafile_class, filething, **kwargs):
+    """Open a file for `AsyncMediaFile` and look up its size, which the
+    audio properties may need.
+    """
+    mediafile = mediafile_class(filething, **kwargs)
+    mediafile.filesize
+    return mediafile
+
+
+def _written(mediafile, func, **kwargs):
+    """Call the writing method `func` of `mediafile` for
+    `AsyncMediaFile` and look up the new size of the file.
+    """
+    func(**kwargs)
+    mediafile.filesize
+
+
+class AsyncMediaFile(object):
+    """Wraps a `MediaFile` for use from asyncio code.
+
+    Opening, saving and deleting tags block on disk I/O and Mutagen's
+    parsing, so they are coroutines here that run in `executor` (by
+    default, the event loop's default executor). Files are opened with
+    ``info=True`` unless told otherwise, and their size is looked up in
+    the executor too, so that the audio properties (`length`,
+    `bitrate`, etc.) are then available without touching the disk.
+    Everything else, such as getting and setting fields, works on the
+    tags in memory and is passed through to the wrapped `MediaFile`,
+    available as the `mediafile` attribute. :meth:`read_all` is a
+    coroutine as well.
+
+    To limit how many files are accessed at once, share an
+    ``asyncio.Semaphore`` among the files as `semaphore`. Errors are
+    raised just as `MediaFile` raises them.
+    """
+    __slots__ = ('mediafile', 'executor', 'semaphore')
+
+    mediafile_class = MediaFile
+    """The type of the wrapped objects.
+    """
+
+    def __init__(self, mediafile, executor=None, semaphore=None):
+        self.mediafile = mediafile
+        self.executor = executor
+        self.semaphore = semaphore
+
+    @classmethod
+    async def open(cls, filething, executor=None, semaphore=None,
+                   **kwargs):
+        """Open a file like the `MediaFile` constructor, which is passed
+        `filething` and `kwargs`, without blocking the event loop.
+
+        The stream information is read right away unless ``info=False``
+        is passed, in which case using an audio property reads it
+        while blocking the event loop.
+        """
+        kwargs.setdefault('info', True)
+        mediafile = await _run_blocking(executor, semaphore, _opened,
+                                        cls.mediafile_class, filething,
+                                        **kwargs)
+        return cls(mediafile, executor, semaphore)
+
+    async def save(self, **kwargs):
+        """Write the tags back to the file, like :meth:`MediaFile.save`.
+        """
+        await _run_blocking(self.executor, self.semaphore, _written,
+                            self.mediafile, self.mediafile.save, **kwargs)
+
+    async def delete(self):
+        """Remove the tags from the file, like :meth:`MediaFile.delete`.
+        """
+        await _run_blocking(self.executor, self.semaphore, _written,
+                            self.mediafile, self.mediafile.delete)
+
+    async def read_all(self, fields=None):
+        """Get a dictionary of field values, like
+        :meth:`MediaFile.read_all`.
+        """
+        return await _run_blocking(self.executor, self.semaphore,
+                                   self.mediafile.read_all, fields)
+
+    def __getattr__(self, name):
+        if name in self.__slots__:
+            # Not initialized (yet).
+            raise AttributeError(name)
+        return getattr(self.mediafile, name)
+
+    def __setattr__(self, name, value):
+        if name in self.__slots__:
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self.mediafile, name, value)
+
+    def __delattr__(self, name):
+        delattr(self.mediafile, name)
+
+
+# Reading many files.
+
+def _iter_files(paths):
+    """Generate the paths of the files in `paths`, recursing into the
+    directories (in sorted order).
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                yield os.path.join(dirpath, filename)
+
+
+def _scan_file(path, fields):
+    """Read the fields of the file at `path` for `scan`.
+    """
+    try:
+        return MediaFile(path).read_all(fields)
+    except UnreadableFileError as exc:
+        return exc
+
+
+def scan(paths, fields=None, workers=None, executor='thread'):
+    """Read the tags of many files concurrently.
+
+    `paths` is an iterable of file and directory paths, or a single
+    path; directories are searched recursively. For each file, a
+    ``(path, result)`` pair is generated as soon as the file has been
+    read, so the order is not that of `paths`. `result` is either a
+    dictionary of the values of the `fields` (by default, all of them)
+    like :meth:`MediaFile.as_dict` returns, or the `UnreadableFileError`
+    (or `FileTypeError`, etc.) raised for the file.
+
+    The files are read by `workers` threads or, with
+    ``executor='process'``, processes, which avoids contention on the
+    GIL at the cost of sending the results between processes. By
+    default, there is one worker per CPU. At most twice as many files as
+    there are workers are read or waiting to be read at any time, so
+    the paths are consumed as the work goes on.
+    """
+    import concurrent.futures
+    if executor == 'thread':
+        executor_type = concurrent.futures.ThreadPoolExecutor
+    elif executor == 'process':
+        executor_type = concurrent.futures.ProcessPoolExecutor
+    else:
+        raise ValueError(u'unknown executor type: {0!r}'.format(executor))
+    workers = workers or os.cpu_count() or 1
+    if fields is not None:
+        fields = list(fields)
+
+    if isinstance(paths, (str, bytes, os.PathLike)):
+        # A single path, not a sequence of its characters.
+        paths = [paths]
+    files = _iter_files(paths)
+    pending = {}
+    pool = executor_type(max_workers=workers)
+    try:
+        while True:
+            for path in files:
+                pending[pool.submit(_scan_file, path, fields)] = path
+                if len(pending) >= 2 * workers:
+                    break
+            if not pending:
+                break
+            done, _ = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                yield pending.pop(future), future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+        pool.shutdown()
@@ -16,6 +16,7 @@
 """Automatically-generated blanket testing for the MediaFile metadata
 layer.
 """
+import abc
 import os
 import shutil
 import datetime
@@ -24,7 +25,8 @@ import unittest
 
 from test import _common
 from mediafile import MediaFile, Image, \
-    ImageType, CoverArtField, UnreadableFileError
+    ImageType, CoverArtField, UnreadableFileError, MediaField, \
+    StorageStyle
 import mutagen
 
 
@@ -131,6 +133,24 @@ class ImageStructureTestMixin(ArtTestMixin):
         self.assertExtendedImageAttributes(image, desc=u'album cover',
                                            type=ImageType.front)
 
+    def test_images_info(self):
+        mediafile = self._mediafile_fixture('image')
+        self.assertEqual(
+            [(i.type, i.desc, i.mime_type, i.size, i.width, i.height)
+             for i in mediafile.images_info()],
+            [(i.type, i.desc, i.mime_type, len(i.data), 2, 3)
+             for i in mediafile.images],
+        )
+
+    def test_set_image_from_memoryview(self):
+        mediafile = self._mediafile_fixture('empty')
+        mediafile.images = [Image(data=memoryview(self.png_data),
+                                  type=ImageType.front)]
+        mediafile.save()
+
+        mediafile = MediaFile(mediafile.filename)
+        self.assertEqual(mediafile.images[0].data, self.png_data)
+
     def test_add_image_structure(self):
         mediafile = self._mediafile_fixture('image')
         self.assertEqual(len(mediafile.images), 2)
@@ -206,7 +226,6 @@ class LazySaveTestMixin(object):
     """Mediafile should only write changes when tags have changed
     """
 
-    @unittest.skip(u'not yet implemented')
     def test_unmodified(self):
         mediafile = self._mediafile_fixture('full')
         mtime = self._set_past_mtime(mediafile.filename)
@@ -215,7 +234,6 @@ class LazySaveTestMixin(object):
         mediafile.save()
         self.assertEqual(os.stat(mediafile.filename).st_mtime, mtime)
 
-    @unittest.skip(u'not yet implemented')
     def test_same_tag_value(self):
         mediafile = self._mediafile_fixture('full')
         mtime = self._set_past_mtime(mediafile.filename)
@@ -234,7 +252,6 @@ class LazySaveTestMixin(object):
         mediafile.save()
         self.assertEqual(os.stat(mediafile.filename).st_mtime, mtime)
 
-    @unittest.skip(u'not yet implemented')
     def test_tag_value_change(self):
         mediafile = self._mediafile_fixture('full')
         mtime = self._set_past_mtime(mediafile.filename)
@@ -295,7 +312,7 @@ class GenreListTestMixin(object):
 
 
 class ReadWriteTestBase(ArtTestMixin, GenreListTestMixin,
-                        _common.TempDirMixin):
+                        LazySaveTestMixin, _common.TempDirMixin):
     """Test writing and reading tags. Subclasses must set ``extension``
     and ``audio_properties``.
 
@@ -441,10 +458,88 @@ class ReadWriteTestBase(ArtTestMixin, GenreListTestMixin,
             else:
                 self.assertEqual(getattr(mediafile, key), value)
 
+    def test_read_audio_properties_eager(self):
+        mediafile = self._mediafile_fixture('full')
+        eager = MediaFile(mediafile.path, info=True)
+        for key in self.audio_properties:
+            self.assertEqual(getattr(eager, key), getattr(mediafile, key))
+
+    def test_save_buffer(self):
+        with open(self._mediafile_fixture('full').path, 'rb') as f:
+            data = f.read()
+        mediafile = MediaFile.from_buffer(data)
+        self.assertTags(mediafile, self.full_initial_tags)
+        mediafile.title = u'another' * 1000
+        mediafile.save()
+
+        mediafile = MediaFile.from_buffer(mediafile.buffer)
+        self.assertEqual(mediafile.title, u'another' * 1000)
+        self.assertEqual(mediafile.album, self.full_initial_tags['album'])
+
+    def test_save_bytearray_in_place(self):
+        with open(self._mediafile_fixture('full').path, 'rb') as f:
+            data = bytearray(f.read())
+        mediafile = MediaFile.from_buffer(data)
+        mediafile.title = u'another' * 1000
+        mediafile.save()
+        self.assertIs(mediafile.buffer, data)
+        self.assertEqual(MediaFile.from_buffer(data).title,
+                         u'another' * 1000)
+
+    def test_save_mmap(self):
+        path = self._mediafile_fixture('full').path
+        mediafile = MediaFile.from_mmap(path)
+        self.assertTags(mediafile, self.full_initial_tags)
+        mediafile.title = u'another' * 1000
+        mediafile.save()
+        self.assertEqual(len(mediafile.buffer), os.path.getsize(path))
+        self.assertEqual(MediaFile(path).title, u'another' * 1000)
+
+    def test_read_range_reader(self):
+        path = self._mediafile_fixture('full').path
+        with open(path, 'rb') as f:
+            def read_range(offset, length):
+                f.seek(offset)
+                return f.read(length)
+            mediafile = MediaFile.from_range_reader(
+                read_range, os.path.getsize(path), path, block_size=1024
+            )
+            self.assertTags(mediafile, self.full_initial_tags)
+            self.assertEqual(mediafile.read_all(),
+                             MediaFile(path).read_all())
+        self.assertRaises(UnreadableFileError, mediafile.save, force=True)
+
     def test_read_full(self):
         mediafile = self._mediafile_fixture('full')
         self.assertTags(mediafile, self.full_initial_tags)
 
+    def test_read_all(self):
+        mediafile = self._mediafile_fixture('full')
+        self.assertEqual(mediafile.read_all(), mediafile.as_dict())
+
+    def test_read_all_written_tags(self):
+        mediafile = self._mediafile_fixture('empty')
+        mediafile.update(self._generate_tags())
+        fields = set(mediafile.fields()) - set(['images'])
+        self.assertEqual(mediafile.read_all(fields),
+                         dict((f, getattr(mediafile, f)) for f in fields))
+
+    def test_read_all_some_fields(self):
+        mediafile = self._mediafile_fixture('full')
+        self.assertEqual(mediafile.read_all(['title', 'track']),
+                         {'title': u'full', 'track': 2})
+
+    def test_update_returns_changed_fields(self):
+        mediafile = self._mediafile_fixture('empty')
+        tags = self._generate_tags()
+        self.assertIn('title', mediafile.update(tags))
+        mediafile.save()
+
+        mediafile = MediaFile(mediafile.filename)
+        self.assertEqual(mediafile.update(tags), set())
+        self.assertEqual(mediafile.update(mediafile.as_dict()), set())
+        self.assertEqual(mediafile.dirty_fields, frozenset())
+
     def test_read_empty(self):
         mediafile = self._mediafile_fixture('empty')
         for field in self.tag_fields:
@@ -537,6 +632,21 @@ class ReadWriteTestBase(ArtTestMixin, GenreListTestMixin,
         self.assertIsNone(mediafile.day)
         self.assertEqual(mediafile.date, datetime.date(2001, 1, 1))
 
+    def test_update_date_of_year_only_date(self):
+        mediafile = self._mediafile_fixture('empty')
+        mediafile.year = 2001
+        mediafile.save()
+
+        mediafile = MediaFile(mediafile.filename)
+        changed = mediafile.update({'date': datetime.date(2001, 1, 1),
+                                    'day': 2})
+        self.assertEqual(changed, {'date', 'day'})
+        mediafile.save()
+
+        mediafile = MediaFile(mediafile.filename)
+        self.assertEqual(mediafile.date, datetime.date(2001, 1, 2))
+        self.assertEqual(mediafile.day, 2)
+
     def test_write_dates(self):
         mediafile = self._mediafile_fixture('full')
         mediafile.date = datetime.date(2001, 1, 2)
@@ -1115,11 +1225,67 @@ class MediaFieldTest(unittest.TestCase):
         )
         self.assertCountEqual(MediaFile.fields(), fields)
 
+    def test_styles_for_format(self):
+        path = os.path.join(_common.RSRC, b'full.flac')
+        mediafile = MediaFile(path)
+        field = MediaFile.__dict__['title']
+        styles = field.styles(mediafile.mgfile)
+        self.assertEqual([style.key for style in styles], ['TITLE'])
+        self.assertIs(field.styles(mediafile.mgfile), styles)
+
     def test_fields_in_readable_fields(self):
         readable = MediaFile.readable_fields()
         for field in MediaFile.fields():
             self.assertIn(field, readable)
 
+    def test_subclass_fields(self):
+        class Subclass(MediaFile):
+            customtag = MediaField(StorageStyle('CUSTOMTAG'))
+            title = property(lambda self: u'title')
+
+        fields = list(Subclass.fields())
+        self.assertEqual(fields[-1], 'customtag')
+        self.assertNotIn('title', fields)
+        self.assertEqual(set(fields) | {'title'},
+                         set(MediaFile.fields()) | {'customtag'})
+        self.assertIn('customtag', Subclass.readable_fields())
+        self.assertIn('length', Subclass.readable_fields())
+
+    def test_subclass_with_abstract_base(self):
+        class Subclass(MediaFile, abc.ABC):
+            customtag = MediaField(StorageStyle('CUSTOMTAG'))
+
+        self.assertIn('customtag', Subclass.fields())
+        self.assertTrue(issubclass(Subclass, MediaFile))
+
+    def test_added_and_removed_fields(self):
+        class Subclass(MediaFile):
+            pass
+
+        self.assertNotIn('customtag', Subclass.fields())
+        MediaFile.add_field('customtag',
+                            MediaField(StorageStyle('CUSTOMTAG')))
+        try:
+            self.assertIn('customtag', MediaFile.fields())
+            self.assertIn('customtag', Subclass.sorted_fields())
+        finally:
+            MediaFile.remove_field('customtag')
+        self.assertNotIn('customtag', MediaFile.fields())
+        self.assertNotIn('customtag', Subclass.readable_fields())
+
+    def test_remove_missing_field(self):
+        with self.assertRaises(ValueError):
+            MediaFile.remove_field('customtag')
+        with self.assertRaises(ValueError):
+            MediaFile.remove_field('save')
+
+    def test_sorted_fields(self):
+        fields = list(MediaFile.sorted_fields())
+        self.assertEqual(sorted(fields), sorted(MediaFile.fields()))
+        self.assertLess(fields.index('date'), fields.index('year'))
+        self.assertLess(fields.index('year'), fields.index('month'))
+        self.assertLess(fields.index('month'), fields.index('day'))
+
 
 def suite():
     return unittest.TestLoader().loadTestsFromName(__name__)
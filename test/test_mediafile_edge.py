@@ -15,10 +15,25 @@
 
 """Specific, edge-case tests for the MediaFile metadata layer.
 """
+import asyncio
+import base64
+import concurrent.futures
+import datetime
+import io
+import json
 import os
+import pathlib
+import pickle
 import shutil
+import struct
+import subprocess
+import sys
+import time
 import unittest
+import mutagen
+import mutagen.flac
 import mutagen.id3
+import mutagen.mp3
 
 from test import _common
 
@@ -86,6 +101,1035 @@ class EdgeTest(unittest.TestCase):
         self.assertEqual(f.rg_track_gain, 0.0)
 
 
+class ImportTest(unittest.TestCase):
+    """Importing the module should not import the format-specific
+    Mutagen modules or the optional helpers, which are loaded on demand.
+    """
+    deferred = ['mutagen.id3', 'mutagen.mp4', 'mutagen.flac',
+                'mutagen.asf', 'mutagen.apev2', 'filetype',
+                'concurrent.futures']
+
+    def loaded(self, code=''):
+        """Run `code` after importing the module in a fresh interpreter
+        and get the deferred modules that have been imported.
+        """
+        code = 'import sys, mediafile\n{0}\nprint(" ".join(' \
+            'm for m in {1!r} if m in sys.modules))'.format(
+                code, self.deferred)
+        directory = os.path.dirname(os.path.abspath(mediafile.__file__))
+        return subprocess.check_output([sys.executable, '-c', code],
+                                       cwd=directory,
+                                       universal_newlines=True).split()
+
+    def test_import_defers_format_modules(self):
+        self.assertEqual(self.loaded(), [])
+
+    def test_open_imports_format_module(self):
+        path = os.path.join(_common.RSRC, b'full.flac')
+        loaded = self.loaded('mediafile.MediaFile({0!r}).title'.format(path))
+        self.assertIn('mutagen.flac', loaded)
+        self.assertNotIn('mutagen.mp4', loaded)
+        self.assertNotIn('mutagen.asf', loaded)
+
+
+class DetectionTest(unittest.TestCase, _common.TempDirMixin):
+    def setUp(self):
+        self.create_temp_dir()
+
+    def tearDown(self):
+        self.remove_temp_dir()
+
+    def header(self, name):
+        with open(os.path.join(_common.RSRC, name), 'rb') as f:
+            return f.read(128)
+
+    def test_signatures_agree_with_mutagen(self):
+        for name in os.listdir(_common.RSRC):
+            path = os.path.join(_common.RSRC, name)
+            with open(path, 'rb') as f:
+                header = f.read(128)
+            kind = mediafile._sniff_kind(path, header)
+            if kind is not None:
+                self.assertIs(kind, type(mutagen.File(path)))
+
+    def test_sniff_types(self):
+        sniff = mediafile._sniff_kind
+        self.assertEqual(sniff('a.flac', self.header(b'full.flac')).__name__,
+                         'FLAC')
+        self.assertEqual(sniff('a.ogg', self.header(b'full.opus')).__name__,
+                         'OggOpus')
+        self.assertEqual(sniff(b'a.M4A', self.header(b'full.m4a')).__name__,
+                         'MP4')
+
+    def test_sniff_without_extension(self):
+        kind = mediafile._sniff_kind('', self.header(b'full.mp3'))
+        self.assertEqual(kind.__name__, 'MP3')
+
+    def test_other_extension_is_not_sniffed(self):
+        self.assertIsNone(
+            mediafile._sniff_kind('a.tta', self.header(b'full.mp3'))
+        )
+
+    def test_unknown_header_is_not_sniffed(self):
+        self.assertIsNone(mediafile._sniff_kind('a.mp3', b'\x00' * 128))
+
+    def test_open_file_object(self):
+        with open(os.path.join(_common.RSRC, b'full.wv'), 'rb') as f:
+            mf = mediafile.MediaFile(io.BytesIO(f.read()))
+        self.assertEqual(mf.type, 'wv')
+        self.assertEqual(mf.title, 'full')
+
+    def test_misleading_extension_uses_scores(self):
+        # Mutagen's scores favor the extension here; the result should
+        # be the same as with `mutagen.File`.
+        path = os.path.join(self.temp_dir, b'test.ape')
+        shutil.copy(os.path.join(_common.RSRC, b'full.wv'), path)
+        with open(path, 'rb') as f:
+            header = f.read(128)
+        self.assertIsNone(mediafile._sniff_kind(path, header))
+        mf = mediafile.MediaFile(path)
+        self.assertIs(type(mf.mgfile), type(mutagen.File(path)))
+
+
+class BufferFileTest(unittest.TestCase, _common.TempDirMixin):
+    def setUp(self):
+        self.create_temp_dir()
+
+    def tearDown(self):
+        self.remove_temp_dir()
+
+    def test_read_and_seek(self):
+        f = mediafile._BufferFile(b'abcdef')
+        self.assertEqual(f.read(2), b'ab')
+        self.assertEqual(f.seek(-1, 2), 5)
+        self.assertEqual(f.read(), b'f')
+        f.seek(10)
+        self.assertEqual(f.read(), b'')
+        self.assertEqual(f.tell(), 10)
+        self.assertEqual(len(f), 6)
+
+    def test_bytes_copied_on_write(self):
+        data = b'abcdef'
+        f = mediafile._BufferFile(data)
+        f.seek(8)
+        f.write(b'gh')
+        self.assertEqual(data, b'abcdef')
+        self.assertEqual(f.buffer, bytearray(b'abcdef\x00\x00gh'))
+
+    def test_bytearray_written_in_place(self):
+        data = bytearray(b'abcdef')
+        f = mediafile._BufferFile(data)
+        f.seek(2)
+        f.write(b'XY')
+        f.truncate(5)
+        self.assertIs(f.buffer, data)
+        self.assertEqual(data, bytearray(b'abXYe'))
+
+    def test_mmap_missing_file(self):
+        path = os.path.join(self.temp_dir, b'missing.mp3')
+        with self.assertRaises(mediafile.UnreadableFileError):
+            mediafile.MediaFile.from_mmap(path)
+
+    def test_mmap_empty_file(self):
+        path = os.path.join(self.temp_dir, b'empty.mp3')
+        open(path, 'wb').close()
+        with self.assertRaises(mediafile.UnreadableFileError):
+            mediafile.MediaFile.from_mmap(path)
+
+    def test_close_unmapped_file(self):
+        # The file object is closed when it is collected, even if
+        # mapping the file failed.
+        fileobj = mediafile._MappedFile.__new__(mediafile._MappedFile)
+        with self.assertRaises(OSError):
+            fileobj.__init__(os.path.join(self.temp_dir, b'missing.mp3'))
+        fileobj.close()
+        self.assertTrue(fileobj.closed)
+
+    def test_mmap_reads_info_from_map(self):
+        path = os.path.join(self.temp_dir, b'full.mp3')
+        shutil.copy(os.path.join(_common.RSRC, b'full.mp3'), path)
+        mf = mediafile.MediaFile.from_mmap(path)
+        os.remove(path)
+        self.assertAlmostEqual(mf.length, 1.07, places=2)
+
+
+class RangeFileTest(unittest.TestCase, _common.TempDirMixin):
+    def setUp(self):
+        self.create_temp_dir()
+        self.calls = []
+
+    def tearDown(self):
+        self.remove_temp_dir()
+
+    def reader(self, data):
+        def read_range(offset, length):
+            self.calls.append((offset, length))
+            return data[offset:offset + length]
+        return read_range
+
+    def test_reads_coalesced(self):
+        data = bytes(bytearray(range(256))) * 4
+        f = mediafile._RangeFile(self.reader(data), len(data), block_size=64)
+        f.seek(100)
+        self.assertEqual(f.read(300), data[100:400])
+        self.assertEqual(self.calls, [(64, 384)])
+
+        # Only the missing blocks are fetched.
+        f.seek(0)
+        self.assertEqual(f.read(500), data[:500])
+        self.assertEqual(self.calls[1:], [(0, 64), (448, 64)])
+        self.assertEqual(f.requests, 3)
+        self.assertEqual(f.fetched, 512)
+
+    def test_cache_evicts_oldest_blocks(self):
+        data = bytes(1000)
+        f = mediafile._RangeFile(self.reader(data), len(data),
+                                 block_size=100, cache_blocks=2)
+        for offset in (0, 100, 200, 150):
+            f.seek(offset)
+            f.read(10)
+        self.assertEqual(self.calls, [(0, 100), (100, 100), (200, 100)])
+        f.seek(0)
+        f.read(10)
+        self.assertEqual(self.calls[-1], (0, 100))
+
+    def test_read_past_end(self):
+        data = b'abcdef'
+        f = mediafile._RangeFile(self.reader(data), len(data))
+        f.seek(4)
+        self.assertEqual(f.read(10), b'ef')
+        self.assertEqual(f.read(), b'')
+        self.assertEqual(self.calls, [(0, 6)])
+
+    def test_short_read_is_unreadable(self):
+        with open(os.path.join(_common.RSRC, b'full.flac'), 'rb') as f:
+            data = f.read()
+        with self.assertRaises(mediafile.UnreadableFileError):
+            mediafile.MediaFile.from_range_reader(
+                lambda offset, length: data[offset:offset + length // 2],
+                len(data),
+            )
+
+    def test_large_file_fetches_head_and_tail(self):
+        # Tags at the start of a file with lots of audio data: only the
+        # tags and the end (for an ID3v1 tag) need to be fetched.
+        with open(os.path.join(_common.RSRC, b'full.mp3'), 'rb') as f:
+            data = f.read() + bytes(4 << 20)
+        mf = mediafile.MediaFile.from_range_reader(
+            self.reader(data), len(data), 'large.mp3'
+        )
+        self.assertEqual(mf.title, u'full')
+        fileobj = mf.filething.fileobj
+        self.assertLessEqual(fileobj.fetched, 2 * mediafile._RANGE_BLOCK_SIZE)
+        self.assertEqual(mf.filesize, len(data))
+
+
+class IOStatsTest(unittest.TestCase, _common.TempDirMixin):
+    def setUp(self):
+        self.create_temp_dir()
+        self.path = os.path.join(self.temp_dir, b'test.mp3')
+        shutil.copy(os.path.join(_common.RSRC, b'full.mp3'), self.path)
+
+    def tearDown(self):
+        mediafile.MediaFile.io_hook = None
+        self.remove_temp_dir()
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(mediafile.MediaFile(self.path).io_stats)
+
+    def test_open_and_save(self):
+        mf = mediafile.MediaFile(self.path, io_stats=True)
+        opened = mf.io_stats['open']
+        self.assertEqual(opened.calls, 1)
+        self.assertGreater(opened.read_bytes, 0)
+        self.assertEqual(opened.written_bytes, 0)
+        self.assertGreater(opened.time, 0)
+
+        mf.title = u'another' * 1000
+        mf.save()
+        saved = mf.io_stats['save']
+        self.assertEqual(saved.calls, 1)
+        self.assertGreaterEqual(saved.written_bytes, 7000)
+        self.assertGreater(saved.seeks, 0)
+        self.assertEqual(mediafile.MediaFile(self.path).title,
+                         u'another' * 1000)
+
+    def test_load_info(self):
+        mf = mediafile.MediaFile(self.path, io_stats=True)
+        self.assertNotIn('load info', mf.io_stats)
+        mf.length
+        self.assertEqual(mf.io_stats['load info'].calls, 1)
+
+    def test_buffer(self):
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        mf = mediafile.MediaFile.from_buffer(data, io_stats=True)
+        mf.delete()
+        self.assertGreater(mf.io_stats['delete'].writes, 0)
+
+    def test_hook_aggregates(self):
+        totals = {}
+
+        def hook(mf, action, stats):
+            key = (mf.type, action)
+            totals[key] = totals.get(key, mediafile.IOStats()) + stats
+        mediafile.MediaFile.io_hook = hook
+
+        for _ in range(2):
+            mf = mediafile.MediaFile(self.path)
+            mf.save(force=True)
+        # Saving loads the deferred stream information first.
+        self.assertEqual(sorted(totals), [('mp3', 'load info'),
+                                          ('mp3', 'open'), ('mp3', 'save')])
+        self.assertEqual(totals['mp3', 'open'].calls, 2)
+        self.assertEqual(totals['mp3', 'load info'].calls, 2)
+        self.assertEqual(totals['mp3', 'save'].written_bytes,
+                         2 * mf.io_stats['save'].written_bytes)
+
+    def test_save_nonexisting(self):
+        mf = mediafile.MediaFile(self.path, io_stats=True)
+        os.remove(self.path)
+        with self.assertRaises(mediafile.UnreadableFileError):
+            mf.save(force=True)
+
+    def test_add(self):
+        stats = mediafile.IOStats(reads=1, read_bytes=10, time=0.5)
+        stats += mediafile.IOStats(calls=1, reads=2, seeks=3)
+        self.assertEqual(stats, mediafile.IOStats(calls=1, reads=3,
+                                                  read_bytes=10, seeks=3,
+                                                  time=0.5))
+
+
+class FieldProfileTest(unittest.TestCase):
+    def setUp(self):
+        path = os.path.join(_common.RSRC, b'full.flac')
+        with open(path, 'rb') as f:
+            self.mf = mediafile.MediaFile.from_buffer(f.read())
+
+    def test_disabled_by_default(self):
+        for method in ('__get__', '__set__', '__delete__'):
+            self.assertFalse(hasattr(mediafile.MediaField.__dict__[method],
+                                     '__wrapped__'))
+
+    def test_records_accesses(self):
+        with mediafile.FieldProfile() as profile:
+            self.mf.title
+            self.mf.title
+            self.mf.album = u'another'
+            del self.mf.album
+            self.assertIsInstance(mediafile.MediaFile.title,
+                                  mediafile.MediaField)
+        self.mf.title
+        timings = dict(((t.field, t.format, t.operation), t)
+                       for t in profile.timings())
+        self.assertEqual(timings['title', 'FLAC', 'get'].count, 2)
+        self.assertEqual(timings['album', 'FLAC', 'set'].count, 1)
+        self.assertEqual(timings['album', 'FLAC', 'delete'].count, 1)
+        timing = timings['title', 'FLAC', 'get']
+        self.assertLessEqual(timing.p50, timing.max)
+        self.assertAlmostEqual(timing.mean * 2, timing.total)
+
+    def test_disable_restores_fields(self):
+        get = mediafile.MediaField.__dict__['__get__']
+        with self.assertRaises(ValueError):
+            with mediafile.FieldProfile():
+                raise ValueError()
+        self.assertIs(mediafile.MediaField.__dict__['__get__'], get)
+
+    def test_one_profile_at_a_time(self):
+        with mediafile.FieldProfile():
+            self.assertRaises(RuntimeError, mediafile.FieldProfile().enable)
+
+    def test_dump(self):
+        with mediafile.FieldProfile() as profile:
+            self.mf.year
+        out = io.StringIO()
+        profile.dump(out)
+        lines = out.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith(u'field'))
+        self.assertEqual(len(lines), 2)
+
+        out = io.StringIO()
+        profile.dump(out, as_json=True)
+        timings = json.loads(out.getvalue())
+        self.assertEqual([t['field'] for t in timings], ['year'])
+        self.assertEqual(timings[0]['count'], 1)
+
+
+class ReadAllTest(unittest.TestCase):
+    def setUp(self):
+        path = os.path.join(_common.RSRC, b'full.mp3')
+        self.mf = mediafile.MediaFile(path)
+
+    def test_restores_tags(self):
+        tags = self.mf.mgfile.tags
+        self.mf.read_all()
+        self.assertIs(self.mf.mgfile.tags, tags)
+
+    def test_desc_is_case_insensitive(self):
+        self.mf.mgfile.tags.delall('TXXX:ASIN')
+        self.mf.mgfile.tags.add(mutagen.id3.TXXX(desc=u'asin',
+                                                 text=[u'B000002UAL']))
+        self.assertEqual(self.mf.read_all(['asin']),
+                         {'asin': u'B000002UAL'})
+
+    def test_unknown_field(self):
+        self.assertRaises(AttributeError, self.mf.read_all, ['nonexistent'])
+
+    def test_write_while_reading(self):
+        path = os.path.join(_common.RSRC, b'full.ogg')
+        mf = mediafile.MediaFile(path)
+        tags = mf.mgfile.tags
+        seen = []
+
+        class Style(mediafile.StorageStyle):
+            def get(self, mutagen_file):
+                # Another thread writing to the file meanwhile.
+                seen.append(mf.mgfile.tags)
+                mf.title = u'changed'
+                return super(Style, self).get(mutagen_file)
+
+        mediafile.MediaFile.add_field(
+            'customtag', mediafile.MediaField(Style('CUSTOMTAG')))
+        try:
+            self.assertEqual(mf.read_all(['customtag']), {'customtag': None})
+        finally:
+            mediafile.MediaFile.remove_field('customtag')
+        self.assertEqual(seen, [tags])
+        self.assertEqual(mf.title, u'changed')
+        self.assertEqual(tags['title'], [u'changed'])
+
+
+class UpdateTest(unittest.TestCase):
+    def setUp(self):
+        path = os.path.join(_common.RSRC, b'full.mp3')
+        self.mf = mediafile.MediaFile(path)
+
+    def test_compares_converted_values(self):
+        self.assertEqual(self.mf.update({'track': u'2', 'title': b'full'}),
+                         set())
+        self.assertEqual(self.mf.dirty_fields, frozenset())
+
+    def test_writes_changed_fields(self):
+        changed = self.mf.update({'title': u'full', 'album': u'another'})
+        self.assertEqual(changed, {'album'})
+        self.assertEqual(self.mf.album, u'another')
+
+    def test_delete_missing_field(self):
+        self.assertIsNone(self.mf.lyricist)
+        self.assertEqual(self.mf.update({'lyricist': None}), set())
+        self.assertEqual(self.mf.update({'title': None}), {'title'})
+
+    def test_changed_image_type(self):
+        image = mediafile.Image(data=b'image data',
+                                type=mediafile.ImageType.front)
+        self.mf.images = [image]
+        self.assertEqual(self.mf.update({'images': [image]}), set())
+        image.type = mediafile.ImageType.back
+        self.assertEqual(self.mf.update({'images': [image]}), {'images'})
+
+
+class LazyImageTest(unittest.TestCase):
+    def setUp(self):
+        path = os.path.join(_common.RSRC, b'image-2x3.png')
+        with open(path, 'rb') as f:
+            self.png_data = f.read()
+
+    def test_load_on_first_use(self):
+        calls = []
+
+        def load():
+            calls.append(None)
+            return b'image data'
+
+        image = mediafile.Image.lazy(load, desc=u'desc', type=3)
+        self.assertEqual(image.type, mediafile.ImageType.front)
+        self.assertEqual(calls, [])
+        self.assertEqual(image.data, b'image data')
+        self.assertEqual(image.data, b'image data')
+        self.assertEqual(len(calls), 1)
+
+    def test_set_data(self):
+        image = mediafile.Image.lazy(lambda: b'old')
+        image.data = b'new'
+        self.assertEqual(image.data, b'new')
+
+    def test_mime_type_is_remembered(self):
+        calls = []
+        orig = mediafile.image_mime_type
+
+        def image_mime_type(data):
+            calls.append(None)
+            return orig(data)
+
+        mediafile.image_mime_type = image_mime_type
+        try:
+            image = mediafile.Image(self.png_data)
+            self.assertEqual(image.mime_type, u'image/png')
+            self.assertEqual(image.mime_type, u'image/png')
+            self.assertEqual(len(calls), 1)
+
+            image.data = b'GIF89a\x10\x00\x20\x00'
+            self.assertEqual(image.mime_type, u'image/gif')
+            self.assertEqual(len(calls), 2)
+        finally:
+            mediafile.image_mime_type = orig
+
+    def test_known_mime_type(self):
+        image = mediafile.Image(self.png_data, mime_type=u'image/x-custom')
+        self.assertEqual(image.mime_type, u'image/x-custom')
+        self.assertEqual(image.info().mime_type, u'image/x-custom')
+
+    def test_pickle_lazy_images(self):
+        for ext in (b'ape', b'wma', b'ogg', b'mp3'):
+            path = os.path.join(_common.RSRC, b'image.' + ext)
+            images = mediafile.MediaFile(path).images
+            copies = pickle.loads(pickle.dumps(images))
+            self.assertEqual(
+                [(i.data, i.desc, i.type, i.mime_type) for i in copies],
+                [(bytes(i.data), i.desc, i.type, i.mime_type)
+                 for i in images])
+
+    def test_vorbis_picture_header(self):
+        pic = mutagen.flac.Picture()
+        pic.data = b'image data'
+        pic.type = 4
+        pic.mime = u'image/png'
+        pic.desc = u'd\xe9sc'
+        block = base64.b64encode(pic.write()).decode('ascii')
+        type, mime, desc, pos, length = \
+            mediafile._unpack_picture_header(block)
+        self.assertEqual((type, mime, desc), (4, u'image/png', u'd\xe9sc'))
+        self.assertEqual(base64.b64decode(block)[pos:pos + length],
+                         b'image data')
+
+    def test_vorbis_picture_header_with_line_breaks(self):
+        pic = mutagen.flac.Picture()
+        pic.data = b'image data'
+        pic.type = 3
+        pic.mime = u'image/png'
+        pic.desc = u'a long description ' * 5
+        block = base64.encodebytes(pic.write()).decode('ascii')
+        type, mime, desc, pos, length = \
+            mediafile._unpack_picture_header(block)
+        self.assertEqual((type, mime, desc), (3, u'image/png', pic.desc))
+        self.assertEqual(base64.b64decode(block)[pos:pos + length],
+                         b'image data')
+
+    def test_vorbis_picture_encoding(self):
+        data = self.png_data + bytes(range(256)) * 1000
+        for desc in (u'', u'a', u'ab'):
+            pic = mutagen.flac.Picture()
+            pic.data = data
+            pic.type = 3
+            pic.mime = u'image/png'
+            pic.desc = desc
+            image = mediafile.Image(data, desc=desc, type=3)
+            self.assertEqual(mediafile._pack_picture(image),
+                             base64.b64encode(pic.write()).decode('ascii'))
+
+    def test_vorbis_picture_peek(self):
+        data = bytes(range(256)) * 4
+        for prefix in (b'', b'a', b'ab'):
+            block = base64.b64encode(prefix + data).decode('ascii')
+            self.assertEqual(
+                mediafile._peek_picture(block, len(prefix), len(data), 100),
+                data[:100])
+
+    def test_vorbis_picture_peek_with_line_breaks(self):
+        data = bytes(range(256)) * 4
+        for prefix in (b'', b'a', b'ab' * 100):
+            block = base64.encodebytes(prefix + data).decode('ascii')
+            self.assertEqual(
+                mediafile._peek_picture(block, len(prefix), len(data), 100),
+                data[:100])
+
+    def test_vorbis_image_info_with_line_breaks(self):
+        pic = mutagen.flac.Picture()
+        pic.data = self.png_data
+        pic.type = 3
+        pic.mime = u'image/png'
+        pic.desc = u'a long description ' * 5
+        mf = mediafile.MediaFile(os.path.join(_common.RSRC, b'full.ogg'))
+        mf.mgfile['metadata_block_picture'] = [
+            base64.encodebytes(pic.write()).decode('ascii')]
+        image, = mf.images
+        self.assertEqual(image.mime_type, u'image/png')
+        self.assertEqual(mf.images_info()[0].mime_type, u'image/png')
+        self.assertEqual(image.data, self.png_data)
+
+    def test_info_does_not_load(self):
+        image = mediafile.Image.lazy(
+            self.fail, size=155,
+            peek=lambda n: self.png_data[:n],
+        )
+        info = image.info()
+        self.assertEqual(info.mime_type, u'image/png')
+        self.assertEqual((info.size, info.width, info.height), (155, 2, 3))
+
+    def test_dimensions(self):
+        self.assertEqual(mediafile.image_dimensions(self.png_data), (2, 3))
+        self.assertEqual(mediafile.image_dimensions(
+            b'GIF89a\x10\x00\x20\x00'), (16, 32))
+        self.assertIsNone(mediafile.image_dimensions(b'\xff\xd8\xff'))
+        self.assertIsNone(mediafile.image_dimensions(b'not an image'))
+
+    def test_jpeg_dimensions_after_metadata(self):
+        data = b'\xff\xd8\xff\xe1' + struct.pack('>H', 20002) + \
+            b'\x00' * 20000 + b'\xff\xc0\x00\x11\x08\x00\x03\x00\x02'
+        info = mediafile.Image(data).info()
+        self.assertEqual((info.width, info.height), (2, 3))
+
+    def test_vorbis_images_are_lazy(self):
+        mf = mediafile.MediaFile(os.path.join(_common.RSRC, b'image.ogg'))
+        images = mf.images
+        self.assertTrue(all(image._load for image in images))
+        self.assertEqual(images[0].desc, u'album cover')
+        self.assertTrue(images[0].data)
+
+
+class ID3IndexTest(unittest.TestCase):
+    def setUp(self):
+        path = os.path.join(_common.RSRC, b'full.mp3')
+        self.mf = mediafile.MediaFile(path)
+        self.tags = self.mf.mgfile.tags
+
+    def test_desc_is_case_insensitive(self):
+        self.tags.add(mutagen.id3.TXXX(desc=u'mY FiElD', text=[u'value']))
+        frames = mediafile._desc_frames(self.tags, 'TXXX', u'My Field')
+        self.assertEqual([f.text for f in frames], [[u'value']])
+
+    def test_index_follows_writes(self):
+        self.mf.asin = u'first'
+        self.assertEqual(self.mf.asin, u'first')
+        self.mf.asin = u'second'
+        self.assertEqual(self.mf.asin, u'second')
+        self.assertEqual(len(self.tags.getall('TXXX:ASIN')), 1)
+        del self.mf.asin
+        self.assertIsNone(self.mf.asin)
+        self.mf.asin = u'third'
+        self.assertEqual(self.mf.asin, u'third')
+
+    def test_index_follows_list_writes(self):
+        self.mf.artists = [u'a', u'b']
+        self.mf.artists = [u'c']
+        self.assertEqual(self.mf.artists, [u'c'])
+        self.assertEqual(len(self.tags.getall('TXXX:ARTISTS')), 1)
+
+    def test_index_follows_people_writes(self):
+        self.mf.arranger = u'someone'
+        self.assertEqual(self.mf.arranger, u'someone')
+        self.mf.arranger = u'someone else'
+        self.assertEqual(self.mf.arranger, u'someone else')
+
+    def test_external_addition(self):
+        self.assertIsNone(self.mf.acoustid_id)
+        self.tags.add(mutagen.id3.TXXX(desc=u'Acoustid Id',
+                                       text=[u'external']))
+        self.assertEqual(self.mf.acoustid_id, u'external')
+
+    def test_external_replacement(self):
+        self.mf.asin = u'ours'
+        self.tags.delall('TXXX:ASIN')
+        self.tags.add(mutagen.id3.TXXX(desc=u'ASIN', text=[u'theirs']))
+        self.assertEqual(self.mf.asin, u'theirs')
+
+    def test_external_removal(self):
+        self.mf.asin = u'ours'
+        self.tags.delall('TXXX:ASIN')
+        self.assertIsNone(self.mf.asin)
+
+    def test_external_swap(self):
+        # Removing one frame and adding another keeps the number of
+        # frames.
+        self.mf.asin = u'ours'
+        self.assertIsNone(self.mf.albumdisambig)
+        self.tags.delall('TXXX:ASIN')
+        self.tags.add(mutagen.id3.TXXX(desc=u'MusicBrainz Album Comment',
+                                       text=[u'theirs']))
+        self.assertEqual(self.mf.albumdisambig, u'theirs')
+        self.assertIsNone(self.mf.asin)
+
+    def test_external_people_swap(self):
+        self.tags.add(mutagen.id3.TIPL(people=[[u'mix', u'someone']]))
+        self.assertIsNone(self.mf.arranger)
+        self.tags.delall('TIPL')
+        self.tags.add(mutagen.id3.TIPL(people=[[u'arranger', u'them']]))
+        self.assertEqual(self.mf.arranger, u'them')
+
+
+class FieldCacheTest(unittest.TestCase):
+    def setUp(self):
+        path = os.path.join(_common.RSRC, b'full.mp3')
+        self.mf = mediafile.MediaFile(path, cache=True)
+
+    def test_disabled_by_default(self):
+        mf = mediafile.MediaFile(os.path.join(_common.RSRC, b'full.mp3'))
+        self.assertIsNone(mf.cache_info())
+        mf.cache_clear()
+
+    def test_repeated_read_hits(self):
+        self.assertEqual(self.mf.title, u'full')
+        self.assertEqual(self.mf.title, u'full')
+        self.assertEqual(self.mf.cache_info(), (1, 1, 1))
+
+    def test_date_items_share_parsed_date(self):
+        self.mf.year
+        info = self.mf.cache_info()
+        self.mf.month
+        self.mf.day
+        self.assertEqual(self.mf.cache_info().hits, info.hits + 2)
+
+    def test_write_invalidates_date_family(self):
+        self.assertEqual(self.mf.date, datetime.date(2001, 1, 1))
+        self.assertEqual(self.mf.year, 2001)
+        self.mf.month = 5
+        self.assertEqual(self.mf.date, datetime.date(2001, 5, 1))
+        self.assertEqual(self.mf.month, 5)
+        del self.mf.date
+        self.assertIsNone(self.mf.year)
+
+    def test_write_keeps_unrelated_fields(self):
+        self.mf.title
+        self.mf.album = u'another album'
+        info = self.mf.cache_info()
+        self.mf.title
+        self.assertEqual(self.mf.cache_info().hits, info.hits + 1)
+
+    def test_write_invalidates_shared_storage(self):
+        self.mf.rg_track_gain
+        self.mf.rg_track_peak
+        self.mf.rg_track_gain = 1.5
+        info = self.mf.cache_info()
+        self.mf.rg_track_peak
+        self.assertEqual(self.mf.cache_info().misses, info.misses + 1)
+
+    def test_write_invalidates_art(self):
+        self.mf.images
+        self.assertIsNone(self.mf.art)
+        self.mf.art = b'data'
+        self.assertEqual(self.mf.art, b'data')
+        self.assertEqual(len(self.mf.images), 1)
+
+    def test_returned_list_is_a_copy(self):
+        self.mf.genres.append(u'changed')
+        self.assertEqual(self.mf.genres, [u'the genre'])
+
+    def test_cache_clear(self):
+        self.mf.title
+        self.mf.mgfile['TIT2'].text = [u'changed']
+        self.mf.cache_clear()
+        self.assertEqual(self.mf.title, u'changed')
+        self.assertEqual(self.mf.cache_info().misses, 2)
+
+
+class DeferredInfoTest(unittest.TestCase, _common.TempDirMixin):
+    def setUp(self):
+        self.create_temp_dir()
+
+    def tearDown(self):
+        self.remove_temp_dir()
+
+    def test_info_is_deferred(self):
+        path = os.path.join(_common.RSRC, b'full.mp3')
+        mf = mediafile.MediaFile(path)
+        self.assertIsInstance(mf.mgfile.info, mediafile._LazyInfo)
+        self.assertEqual(mf.title, u'full')
+        self.assertAlmostEqual(mf.length, 1.0, delta=0.1)
+        self.assertNotIsInstance(mf.mgfile.info, mediafile._LazyInfo)
+
+    def test_info_loaded_on_request(self):
+        path = os.path.join(_common.RSRC, b'full.mp3')
+        mf = mediafile.MediaFile(path, info=True)
+        self.assertIsInstance(mf.mgfile.info, mutagen.mp3.MPEGInfo)
+
+    def test_file_object(self):
+        for ext in (b'mp3', b'ogg', b'opus', b'ape'):
+            path = os.path.join(_common.RSRC, b'full.' + ext)
+            with open(path, 'rb') as f:
+                mf = mediafile.MediaFile(f)
+                self.assertEqual(mf.title, u'full')
+            self.assertEqual(mf.length, mediafile.MediaFile(path).length)
+            if ext != b'ape':
+                # Otherwise, the bitrate is estimated from the file size,
+                # which needs the file object.
+                self.assertEqual(mf.bitrate,
+                                 mediafile.MediaFile(path).bitrate)
+
+    def test_file_object_position_is_kept(self):
+        path = os.path.join(_common.RSRC, b'full.ape')
+        with open(path, 'rb') as f:
+            f = io.BytesIO(f.read())
+        mf = mediafile.MediaFile(f)
+        position = f.tell()
+        mf.length
+        self.assertEqual(f.tell(), position)
+
+    def test_deferred_file_object_closed(self):
+        path = os.path.join(_common.RSRC, b'full.mp3')
+        with open(path, 'rb') as f:
+            mf = mediafile.MediaFile(f, info=False)
+            self.assertEqual(mf.title, u'full')
+        with self.assertRaises(mediafile.UnreadableFileError):
+            mf.length
+
+    def test_info_after_delete(self):
+        path = os.path.join(self.temp_dir, b'full.mp3')
+        shutil.copy(os.path.join(_common.RSRC, b'full.mp3'), path)
+        length = mediafile.MediaFile(path).length
+        mf = mediafile.MediaFile(path)
+        mf.delete()
+        self.assertEqual(mf.length, length)
+        self.assertEqual(mediafile.MediaFile(path).length, length)
+
+    def test_info_after_growing_save(self):
+        path = os.path.join(self.temp_dir, b'full.opus')
+        shutil.copy(os.path.join(_common.RSRC, b'full.opus'), path)
+        bitrate = mediafile.MediaFile(path).bitrate
+        mf = mediafile.MediaFile(path)
+        mf.lyrics = u'x' * 200000
+        mf.save()
+        self.assertEqual(mf.bitrate, bitrate)
+        self.assertEqual(mediafile.MediaFile(path).bitrate, bitrate)
+
+    def test_broken_audio_raises_on_access(self):
+        path = os.path.join(self.temp_dir, b'broken.mp3')
+        with open(path, 'wb') as f:
+            f.write(b'\x00' * 1024)
+        tags = mutagen.id3.ID3()
+        tags.add(mutagen.id3.TIT2(text=[u'title']))
+        tags.save(path)
+
+        self.assertRaises(mediafile.UnreadableFileError,
+                          mediafile.MediaFile, path, info=True)
+        mf = mediafile.MediaFile(path)
+        self.assertEqual(mf.title, u'title')
+        with self.assertRaises(mediafile.UnreadableFileError):
+            mf.length
+
+
+class FileSizeTest(unittest.TestCase, _common.TempDirMixin):
+    def setUp(self):
+        self.create_temp_dir()
+        self.path = os.path.join(self.temp_dir, b'full.flac')
+        shutil.copy(os.path.join(_common.RSRC, b'full.flac'), self.path)
+
+    def tearDown(self):
+        self.remove_temp_dir()
+
+    def test_size_is_remembered(self):
+        mf = mediafile.MediaFile(self.path)
+        size = mf.filesize
+        with open(self.path, 'ab') as f:
+            f.write(b'\x00' * 16)
+        self.assertEqual(mf.filesize, size)
+
+    def test_save_updates_size(self):
+        mf = mediafile.MediaFile(self.path)
+        mf.filesize
+        mf.comments = u'x' * 100000
+        mf.save()
+        self.assertEqual(mf.filesize, os.path.getsize(self.path))
+
+
+class DirtyFieldsTest(unittest.TestCase, _common.TempDirMixin):
+    def setUp(self):
+        self.create_temp_dir()
+        self.path = os.path.join(self.temp_dir, b'full.flac')
+        shutil.copy(os.path.join(_common.RSRC, b'full.flac'), self.path)
+        mtime = round(time.time() - 10000)
+        os.utime(self.path, (mtime, mtime))
+        self.mtime = mtime
+
+    def tearDown(self):
+        self.remove_temp_dir()
+
+    def test_written_fields_are_dirty(self):
+        mf = mediafile.MediaFile(self.path)
+        self.assertEqual(mf.dirty_fields, frozenset())
+        mf.title = u'another'
+        del mf.album
+        self.assertEqual(mf.dirty_fields, {'title', 'album'})
+
+    def test_same_value_is_not_dirty(self):
+        mf = mediafile.MediaFile(self.path)
+        mf.title = mf.title
+        mf.genres = mf.genres
+        mf.year = mf.year
+        self.assertEqual(mf.dirty_fields, frozenset())
+        mf.save()
+        self.assertEqual(os.stat(self.path).st_mtime, self.mtime)
+
+    def test_save_clears_dirty_fields(self):
+        mf = mediafile.MediaFile(self.path)
+        mf.title = u'another'
+        mf.save()
+        self.assertEqual(mf.dirty_fields, frozenset())
+        self.assertNotEqual(os.stat(self.path).st_mtime, self.mtime)
+
+    def test_force_save(self):
+        mf = mediafile.MediaFile(self.path)
+        mf.save(force=True)
+        self.assertNotEqual(os.stat(self.path).st_mtime, self.mtime)
+
+    def test_added_field_is_named(self):
+        field = mediafile.MediaField(
+            mediafile.StorageStyle('CUSTOMTAG'),
+        )
+        mediafile.MediaFile.add_field('customtag', field)
+        try:
+            mf = mediafile.MediaFile(self.path)
+            mf.customtag = u'value'
+            self.assertEqual(mf.dirty_fields, {'customtag'})
+        finally:
+            mediafile.MediaFile.remove_field('customtag')
+
+
+class ScanTest(unittest.TestCase, _common.TempDirMixin):
+    def setUp(self):
+        self.create_temp_dir()
+        for name in (b'full.mp3', b'full.flac'):
+            shutil.copy(os.path.join(_common.RSRC, name),
+                        os.path.join(self.temp_dir, name))
+        os.mkdir(os.path.join(self.temp_dir, b'sub'))
+        with open(os.path.join(self.temp_dir, b'sub', b'text.txt'),
+                  'w') as f:
+            f.write('not audio')
+
+    def tearDown(self):
+        self.remove_temp_dir()
+
+    def _scan(self, **kwargs):
+        return dict(mediafile.scan([self.temp_dir], **kwargs))
+
+    def test_scan_directory(self):
+        results = self._scan(workers=2)
+        self.assertEqual(sorted(results), [
+            os.path.join(self.temp_dir, b'full.flac'),
+            os.path.join(self.temp_dir, b'full.mp3'),
+            os.path.join(self.temp_dir, b'sub', b'text.txt'),
+        ])
+        result = results[os.path.join(self.temp_dir, b'full.mp3')]
+        self.assertEqual(result, mediafile.MediaFile(
+            os.path.join(self.temp_dir, b'full.mp3')).as_dict())
+        result = results[os.path.join(self.temp_dir, b'sub', b'text.txt')]
+        self.assertIsInstance(result, mediafile.FileTypeError)
+
+    def test_scan_fields(self):
+        results = self._scan(fields=['title', 'album'])
+        self.assertEqual(
+            results[os.path.join(self.temp_dir, b'full.flac')],
+            {'title': u'full', 'album': u'the album'},
+        )
+
+    def test_scan_file_paths(self):
+        path = os.path.join(self.temp_dir, b'full.mp3')
+        results = list(mediafile.scan([path], fields=['title']))
+        self.assertEqual(results, [(path, {'title': u'full'})])
+
+    def test_scan_single_path(self):
+        self.assertEqual(
+            dict(mediafile.scan(self.temp_dir, fields=['title'])).keys(),
+            self._scan(fields=['title']).keys())
+        path = os.path.join(self.temp_dir, b'full.mp3')
+        self.assertEqual(list(mediafile.scan(path, fields=['title'])),
+                         [(path, {'title': u'full'})])
+        results = dict(mediafile.scan(pathlib.Path(os.fsdecode(path)),
+                                      fields=['title']))
+        self.assertEqual(list(results.values()), [{'title': u'full'}])
+
+    def test_scan_processes(self):
+        self.assertEqual(self._scan(fields=['title'], workers=2,
+                                    executor='process').keys(),
+                         self._scan(fields=['title']).keys())
+
+    def test_unknown_executor(self):
+        with self.assertRaises(ValueError):
+            self._scan(executor='fiber')
+
+    def test_errors_can_be_pickled(self):
+        for exc in (mediafile.UnreadableFileError('file', 'message'),
+                    mediafile.FileTypeError('file', 'Kind'),
+                    mediafile.MutagenError('file', ValueError('bug'))):
+            copy = pickle.loads(pickle.dumps(exc))
+            self.assertIs(type(copy), type(exc))
+            self.assertEqual(str(copy), str(exc))
+
+
+class AsyncMediaFileTest(unittest.TestCase, _common.TempDirMixin):
+    def setUp(self):
+        self.create_temp_dir()
+        self.path = os.path.join(self.temp_dir, b'full.mp3')
+        shutil.copy(os.path.join(_common.RSRC, b'full.mp3'), self.path)
+
+    def tearDown(self):
+        self.remove_temp_dir()
+
+    def test_open_and_save(self):
+        async def tag():
+            mf = await mediafile.AsyncMediaFile.open(self.path)
+            self.assertEqual(mf.title, u'full')
+            mf.title = u'async'
+            await mf.save()
+            return mf
+        mf = asyncio.run(tag())
+        self.assertIsInstance(mf.mediafile, mediafile.MediaFile)
+        self.assertEqual(mediafile.MediaFile(self.path).title, u'async')
+
+    def test_read_all(self):
+        async def read():
+            mf = await mediafile.AsyncMediaFile.open(self.path)
+            return await mf.read_all(['title', 'length'])
+        self.assertEqual(asyncio.run(read()), mediafile.MediaFile(
+            self.path).read_all(['title', 'length']))
+
+    def test_audio_properties_are_loaded(self):
+        async def tag():
+            mf = await mediafile.AsyncMediaFile.open(self.path)
+            self.assertNotIsInstance(mf.mgfile.info, mediafile._LazyInfo)
+            self.assertIsNotNone(mf.mediafile._filesize)
+            mf.lyrics = u'x' * 10000
+            await mf.save()
+            self.assertEqual(mf.mediafile._filesize,
+                             os.path.getsize(self.path))
+            return mf
+        mf = asyncio.run(tag())
+        self.assertEqual(mf.length, mediafile.MediaFile(self.path).length)
+
+    def test_semaphore_limits_concurrency(self):
+        running = []
+        peak = []
+        mediafile_class = mediafile.MediaFile
+
+        class CountingMediaFile(mediafile_class):
+            def __init__(self, *args, **kwargs):
+                running.append(None)
+                peak.append(len(running))
+                time.sleep(0.01)
+                running.pop()
+                mediafile_class.__init__(self, *args, **kwargs)
+
+        class CountingAsyncMediaFile(mediafile.AsyncMediaFile):
+            mediafile_class = CountingMediaFile
+
+        async def open_many():
+            semaphore = asyncio.Semaphore(2)
+            with concurrent.futures.ThreadPoolExecutor(8) as executor:
+                await asyncio.gather(*[
+                    CountingAsyncMediaFile.open(self.path, executor,
+                                                semaphore)
+                    for _ in range(8)
+                ])
+        asyncio.run(open_many())
+        self.assertEqual(len(peak), 8)
+        self.assertLessEqual(max(peak), 2)
+
+    def test_errors(self):
+        path = os.path.join(_common.RSRC, b'image-2x3.png')
+        with self.assertRaises(mediafile.FileTypeError):
+            asyncio.run(mediafile.AsyncMediaFile.open(path))
+
+
 class InvalidValueToleranceTest(unittest.TestCase):
 
     def test_safe_cast_string_to_int(self):
@@ -132,6 +1176,26 @@ class InvalidValueToleranceTest(unittest.TestCase):
         v = _sc(float, u'1.0.0')
         self.assertEqual(v, 1.0)
 
+    def test_safe_cast_non_ascii_digits_to_int(self):
+        self.assertEqual(_sc(int, u'\u0661\u0662'), 0)
+        self.assertEqual(_sc(int, u'1\u00b2'), 1)
+
+    def test_safe_cast_underscores_to_int(self):
+        self.assertEqual(_sc(int, u'1_000'), 1)
+
+    def test_safe_cast_exponent_to_float(self):
+        self.assertEqual(_sc(float, u'1e5'), 1.0)
+        self.assertEqual(_sc(float, u'inf'), 0.0)
+
+    def test_cast_many(self):
+        self.assertEqual(
+            mediafile.cast_many(int, [u'1', None, b'2/3', 4.5]),
+            [1, None, 2, 4])
+        self.assertEqual(mediafile.cast_many(str, (b'a', u'b')),
+                         [u'a', u'b'])
+        images = [object()]
+        self.assertEqual(mediafile.cast_many(object, images), images)
+
 
 class SafetyTest(unittest.TestCase, _common.TempDirMixin):
     def setUp(self):
@@ -428,8 +1492,8 @@ class ReadOnlyTagTest(unittest.TestCase, _common.TempDirMixin):
     def tearDown(self):
         self.remove_temp_dir()
         try:
-            del mediafile.MediaFile.read_only_test
-        except AttributeError:
+            mediafile.MediaFile.remove_field('read_only_test')
+        except ValueError:
             pass
 
 